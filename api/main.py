@@ -5,22 +5,34 @@ Sprint 1-A: Ollama integration with LangGraph orchestration
 Production-ready API with OpenTelemetry tracing.
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Literal, Optional
 import asyncio
 import logging
 import json
 from datetime import datetime
 
 # Our custom modules
-from telemetry.otel_config import get_tracer, create_gen_ai_span, otel_config
-from graph import create_autonomes_graph
+from telemetry.otel_config import get_tracer, create_gen_ai_span, iterate_in_span, otel_config
+from telemetry.gen_ai_metrics import record_error, track_request
+from telemetry.logging_config import setup_logging
+from telemetry.loop_monitor import loop_lag_monitor
+from graph import (
+    graph_registry, get_session_checkpointer, close_session_checkpointer, create_agent_team_graph,
+    AUTONOMES_GRAPH, SESSION_GRAPH, AGENT_TEAM_GRAPH, AGENT_TEAM_MAX_PARALLEL
+)
+from prompt_registry import prompt_registry
 from integrations.ollama_client import OllamaClient
+from integrations.health_monitor import CircuitOpenError
+from integrations.scheduler import Priority, QueueFullError, iterate_scheduled, scheduling
+from integrations.pull_jobs import PullJobManager
+from api.status_snapshot import Snapshot, StatusSnapshotService
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (queued, trace-correlated)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Get tracer for this module
@@ -51,6 +63,16 @@ class ChatRequest(BaseModel):
     stream: bool = Field(default=False, description="Enable streaming response")
     temperature: float = Field(default=0.7, ge=0.0, le=2.0)
     max_tokens: int = Field(default=1000, ge=1, le=4000)
+    priority: Literal["interactive", "background"] = Field(
+        default="interactive",
+        description="Scheduling class; background work yields to interactive requests"
+    )
+    session_id: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        max_length=128,
+        description="Server-side conversation; only the new message needs to be sent"
+    )
 
 class ChatResponse(BaseModel):
     response: str
@@ -58,6 +80,52 @@ class ChatResponse(BaseModel):
     tokens_used: Optional[int] = None
     processing_time_ms: int
     trace_id: str
+    session_id: Optional[str] = None
+
+class BatchChatItem(BaseModel):
+    message: str = Field(..., min_length=1, max_length=10000)
+    model: str = Field(default="llama3.3:8b", description="Ollama model to use")
+    temperature: float = Field(default=0.7, ge=0.0, le=2.0)
+    max_tokens: int = Field(default=1000, ge=1, le=4000)
+
+class BatchChatRequest(BaseModel):
+    items: List[BatchChatItem] = Field(..., min_length=1, max_length=1000)
+    concurrency: int = Field(default=4, ge=1, le=32, description="Max items in flight")
+    stream: bool = Field(default=False, description="Stream NDJSON results as items finish")
+    priority: Literal["interactive", "background"] = Field(default="background")
+
+class BatchChatResult(BaseModel):
+    index: int
+    response: Optional[str] = None
+    model_used: str
+    tokens_used: Optional[int] = None
+    error: Optional[str] = None
+
+class BatchChatResponse(BaseModel):
+    results: List[BatchChatResult]
+    succeeded: int
+    failed: int
+    processing_time_ms: int
+    trace_id: str
+
+class AgentRunRequest(BaseModel):
+    task: str = Field(..., min_length=1, max_length=10000, description="Feature request for the planner")
+    model: str = Field(default="llama3.3:8b", description="Ollama model every agent uses")
+    max_tokens: int = Field(default=1000, ge=1, le=4000, description="Per agent call")
+    max_parallel: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=32,
+        description="Subtask branches in flight (default AUTONOMES_GRAPH_MAX_PARALLEL)"
+    )
+    priority: Literal["interactive", "background"] = Field(default="background")
+
+class AgentRunResponse(BaseModel):
+    subtasks: List[str]
+    results: List[Dict[str, Any]]
+    summary: str
+    processing_time_ms: int
+    trace_id: str
 
 class HealthResponse(BaseModel):
     status: str
@@ -68,33 +136,77 @@ class HealthResponse(BaseModel):
 # Global Ollama client instance
 ollama_client = OllamaClient()
 
+# Background model pulls, deduplicated per model
+pull_jobs = PullJobManager(ollama_client.pull_model)
+
+# In-memory /status and /models, refreshed in the background
+status_snapshots = StatusSnapshotService.from_env(ollama_client)
+
+async def _run_agent(agent: str, task: str, data: Dict[str, Any]) -> str:
+    """Agent team callback: one agent prompt on one task, via the shared client"""
+    template = prompt_registry.get(agent)
+    result = await ollama_client.generate(
+        model=data["model"],
+        prompt=task,
+        temperature=template.metadata.get("temperature", 0.2) if template else 0.2,
+        max_tokens=data["max_tokens"],
+        system_prompt=agent
+    )
+    return result["response"]
+
+# Planner -> parallel coder/reviewer branches -> merge, over the shared client
+graph_registry.register(
+    AGENT_TEAM_GRAPH,
+    lambda: create_agent_team_graph(_run_agent),
+    config={"max_concurrency": AGENT_TEAM_MAX_PARALLEL}
+)
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
     with tracer.start_as_current_span("api_startup") as span:
         logger.info("🚀 AutonomesAI v2.1 API starting up...")
         
-        # Initialize Ollama client
-        await ollama_client.initialize()
+        # Initialize Ollama client, background health probing and model preloading
+        await ollama_client.start_health_monitor()
+        
+        # Parse the prompt pack off-loop and watch it for edits; lookups stay in memory
+        await asyncio.to_thread(prompt_registry.start)
         
-        # Test LangGraph compilation
-        graph = create_autonomes_graph()
-        _ = graph.compile()  # Test compilation, result not used
+        # Serve /status and /models from background-refreshed snapshots
+        status_snapshots.start()
+        
+        # Watch for anything (e.g. a graph node) blocking the event loop
+        loop_lag_monitor.start()
+        
+        # Compile every registered graph once; requests share the result
+        graph_versions = graph_registry.warm_up()
         
         span.add_event("services_initialized", {
             "ollama_ready": ollama_client.is_ready(),
-            "langgraph_compiled": True
+            "langgraph_compiled": True,
+            "langgraph_versions": [f"{name}:{version}" for name, version in graph_versions.items()]
         })
         
         logger.info("✅ All services initialized successfully")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks and release connections"""
+    await loop_lag_monitor.stop()
+    await status_snapshots.stop()
+    prompt_registry.stop()
+    await pull_jobs.close()
+    await ollama_client.close()
+    close_session_checkpointer()
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
     with tracer.start_as_current_span("health_check") as span:
         
-        # Check Ollama connection
-        ollama_status = "healthy" if await ollama_client.health_check() else "unhealthy"
+        # Cached Ollama health from the background monitor (no upstream call)
+        ollama_status = "healthy" if ollama_client.is_healthy() else "unhealthy"
         
         health_data = HealthResponse(
             status="healthy" if ollama_status == "healthy" else "degraded",
@@ -114,8 +226,44 @@ async def health_check():
         
         return health_data
 
+def _queue_full_exception(error: QueueFullError) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(int(error.retry_after))}
+    )
+
+def _session_config(session_id: str) -> Dict[str, Any]:
+    return {"configurable": {"thread_id": session_id}}
+
+def _chunk_text(data: Dict[str, Any]) -> str:
+    return data.get("response") or data.get("message", {}).get("content", "")
+
+async def _run_graph(request: ChatRequest, initial_state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Return the conversation to send to Ollama for one turn.
+    Without a session the DAG runs here; with one, the session's history is
+    only read: nothing is checkpointed until there is a reply (`_record_turn`),
+    so a failed generation never leaves a dangling user message behind.
+    """
+    if not request.session_id:
+        await graph_registry.get(AUTONOMES_GRAPH).ainvoke(initial_state)  # Graph execution for telemetry
+        return initial_state["messages"]
+    
+    state = await graph_registry.get(SESSION_GRAPH).aget_state(_session_config(request.session_id))
+    history = state.values.get("messages", []) if state.values else []
+    return history + initial_state["messages"]
+
+async def _record_turn(session_id: str, initial_state: Dict[str, Any], reply: str) -> None:
+    """Checkpoint the user message and the assistant's reply together, as one graph run"""
+    turn = {
+        **initial_state,
+        "messages": initial_state["messages"] + [{"role": "assistant", "content": reply}]
+    }
+    await graph_registry.get(SESSION_GRAPH).ainvoke(turn, _session_config(session_id))
+
 @app.post("/chat", response_model=ChatResponse)
-async def chat_completion(request: ChatRequest):
+async def chat_completion(request: ChatRequest, x_tenant_id: Optional[str] = Header(default=None)):
     """
     Main chat completion endpoint using Ollama + LangGraph orchestration
     """
@@ -127,14 +275,11 @@ async def chat_completion(request: ChatRequest):
         request.model,
         temperature=request.temperature,
         max_tokens=request.max_tokens
-    ) as span:
+    ) as span, scheduling(Priority[request.priority.upper()], x_tenant_id or "default"), \
+            track_request("/chat", request.model):
         
         try:
-            logger.info(f"💬 Processing chat request with model: {request.model}")
-            
-            # Create and run LangGraph with Ollama integration
-            graph = create_autonomes_graph()
-            compiled_graph = graph.compile()
+            logger.info("💬 Processing chat request with model: %s", request.model)
             
             # Prepare initial state with chat request
             initial_state = {
@@ -148,48 +293,57 @@ async def chat_completion(request: ChatRequest):
                 }
             }
             
-            # Execute the graph
-            _ = await compiled_graph.ainvoke(initial_state)  # Graph execution for telemetry
+            # Execute the graph (resuming the session's state when there is one)
+            conversation = await _run_graph(request, initial_state)
             
-            # Generate response using Ollama
+            # Generate response using Ollama; session turns reuse the cached
+            # context of the earlier turns instead of re-sending the history
             ollama_response = await ollama_client.generate(
                 model=request.model,
                 prompt=request.message,
                 temperature=request.temperature,
-                max_tokens=request.max_tokens
+                max_tokens=request.max_tokens,
+                history=conversation[:-1] if request.session_id else None
             )
+            response_text = ollama_response["response"]
+            if request.session_id:
+                await _record_turn(request.session_id, initial_state, response_text)
             
             # Calculate processing time
             processing_time = (datetime.now() - start_time).total_seconds() * 1000
             
-            # Add telemetry attributes
-            otel_config.add_gen_ai_response_attributes(
-                span, 
-                "success",
-                {
-                    "prompt_tokens": len(request.message.split()),
-                    "completion_tokens": len(ollama_response["response"].split()),
-                    "total_tokens": len(request.message.split()) + len(ollama_response["response"].split())
-                }
-            )
+            # Token usage was computed once by the client (Ollama's counts when reported)
+            usage = ollama_response.get("usage", {})
+            otel_config.add_gen_ai_response_attributes(span, "success", usage)
             
             span.add_event("chat_completed", {
                 "model_used": request.model,
                 "processing_time_ms": processing_time,
-                "response_length": len(ollama_response["response"])
+                "response_length": len(response_text)
             })
             
             response = ChatResponse(
-                response=ollama_response["response"],
+                response=response_text,
                 model_used=request.model,
-                tokens_used=ollama_response.get("tokens_used"),
+                tokens_used=usage.get("total_tokens"),
                 processing_time_ms=int(processing_time),
-                trace_id=format(span.get_span_context().trace_id, '032x')
+                trace_id=format(span.get_span_context().trace_id, '032x'),
+                session_id=request.session_id
             )
             
-            logger.info(f"✅ Chat completion successful in {processing_time:.2f}ms")
+            logger.info("✅ Chat completion successful in %.2fms", processing_time)
             return response
             
+        except CircuitOpenError as e:
+            span.set_attribute("gen_ai.response.finish_reason", "unavailable")
+            raise HTTPException(
+                status_code=503,
+                detail=str(e),
+                headers={"Retry-After": str(max(1, int(ollama_client.health_monitor.retry_after())))}
+            )
+        except QueueFullError as e:
+            span.set_attribute("gen_ai.response.finish_reason", "rejected")
+            raise _queue_full_exception(e)
         except Exception as e:
             logger.error(f"❌ Chat completion failed: {str(e)}")
             
@@ -201,60 +355,333 @@ async def chat_completion(request: ChatRequest):
                 detail=f"Chat completion failed: {str(e)}"
             )
 
-@app.get("/models")
-async def list_models():
-    """List available Ollama models"""
-    with tracer.start_as_current_span("list_models") as span:
-        try:
-            models = await ollama_client.list_models()
-            
-            span.add_event("models_listed", {"count": len(models)})
+def _ndjson_line(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload) + "\n"
+
+@app.post("/chat/stream")
+async def chat_completion_stream(request: ChatRequest, x_tenant_id: Optional[str] = Header(default=None)):
+    """
+    Streaming chat completion as NDJSON (one JSON object per line).
+    
+    Chunks are forwarded as Ollama produces them. Starlette only pulls the
+    next chunk once the previous one has been sent (backpressure), and
+    cancels the generator when the client disconnects, which closes the
+    upstream Ollama request.
+    """
+    initial_state = {
+        "messages": [{"role": "user", "content": request.message}],
+        "status": "processing",
+        "data": {
+            "model": request.model,
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens,
+            "stream": True
+        }
+    }
+    
+    # Admission control up front so a full queue is a 429, not a broken stream
+    if not ollama_client.scheduler.can_admit(request.model):
+        raise _queue_full_exception(
+            QueueFullError(request.model, ollama_client.scheduler.retry_after(request.model))
+        )
+    
+    try:
+        conversation = await _run_graph(request, initial_state)
+    except Exception as e:
+        logger.error(f"❌ Chat stream setup failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Chat completion failed: {str(e)}")
+    
+    priority = Priority[request.priority.upper()]
+    tenant = x_tenant_id or "default"
+    
+    async def stream_chunks():
+        start_time = datetime.now()
+        
+        # Span and scheduling are only made current around each upstream step
+        # (never across a `yield`), so closing from another context is safe
+        with create_gen_ai_span(
+            tracer,
+            "chat_completion_stream",
+            request.model,
+            set_current=False,
+            temperature=request.temperature,
+            max_tokens=request.max_tokens
+        ) as span, track_request("/chat/stream", request.model) as timer:
+            trace_id = format(span.get_span_context().trace_id, '032x')
+            if request.session_id:
+                upstream = ollama_client.chat_stream(
+                    model=request.model,
+                    messages=conversation,
+                    temperature=request.temperature,
+                    max_tokens=request.max_tokens
+                )
+            else:
+                upstream = ollama_client.generate_stream(
+                    model=request.model,
+                    prompt=request.message,
+                    temperature=request.temperature,
+                    max_tokens=request.max_tokens
+                )
+            parts: List[str] = []
             
-            return {"models": models}
+            try:
+                async for chunk in iterate_in_span(span, iterate_scheduled(upstream, priority, tenant)):
+                    text = _chunk_text(chunk)
+                    if not chunk.get("done", False):
+                        timer.first_token()
+                        parts.append(text)
+                        yield _ndjson_line({"response": text, "done": False})
+                        continue
+                    
+                    processing_time = (datetime.now() - start_time).total_seconds() * 1000
+                    usage = chunk.get("usage", {})
+                    otel_config.add_gen_ai_response_attributes(span, "success", usage)
+                    if request.session_id:
+                        await _record_turn(request.session_id, initial_state, "".join(parts) + text)
+                    
+                    yield _ndjson_line({
+                        "response": text,
+                        "done": True,
+                        "model_used": request.model,
+                        "tokens_used": usage.get("total_tokens"),
+                        "processing_time_ms": int(processing_time),
+                        "trace_id": trace_id,
+                        "session_id": request.session_id
+                    })
+                    
+            except Exception as e:
+                record_error(e, timer.attributes)
+                logger.error(f"❌ Chat stream failed: {str(e)}")
+                span.set_attribute("gen_ai.response.finish_reason", "error")
+                span.add_event("error_occurred", {"error": str(e)})
+                yield _ndjson_line({"error": f"Chat completion failed: {str(e)}", "done": True})
+            finally:
+                # Release the upstream connection on completion or disconnect
+                await upstream.aclose()
+    
+    return StreamingResponse(
+        stream_chunks(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _batch_result(request: BatchChatRequest, outcome: Dict[str, Any]) -> BatchChatResult:
+    item = request.items[outcome["index"]]
+    result = outcome.get("result", {})
+    return BatchChatResult(
+        index=outcome["index"],
+        response=result.get("response"),
+        model_used=item.model,
+        tokens_used=result.get("usage", {}).get("total_tokens"),
+        error=outcome.get("error")
+    )
+
+@app.post("/chat/batch")
+async def chat_completion_batch(request: BatchChatRequest, x_tenant_id: Optional[str] = Header(default=None)):
+    """
+    Batched generation for offline/agent workloads.
+    
+    Items run with at most `concurrency` in flight (and still pass through the
+    Ollama scheduler, as background work by default). Per-item failures are
+    reported inline; with `stream` set, NDJSON results are sent as items finish.
+    """
+    generate_requests = [
+        {
+            "model": item.model,
+            "prompt": item.message,
+            "temperature": item.temperature,
+            "max_tokens": item.max_tokens
+        }
+        for item in request.items
+    ]
+    priority = Priority[request.priority.upper()]
+    tenant = x_tenant_id or "default"
+    
+    if request.stream:
+        async def stream_results():
+            with track_request("/chat/batch"):
+                results = iterate_scheduled(
+                    ollama_client.generate_many_iter(generate_requests, request.concurrency),
+                    priority,
+                    tenant
+                )
+                try:
+                    async for outcome in results:
+                        yield _ndjson_line(_batch_result(request, outcome).dict())
+                finally:
+                    await results.aclose()
+        
+        return StreamingResponse(
+            stream_results(),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
+    start_time = datetime.now()
+    with tracer.start_as_current_span("chat_completion_batch") as span, scheduling(priority, tenant), \
+            track_request("/chat/batch"):
+        outcomes = await ollama_client.generate_many(generate_requests, request.concurrency)
+        results = [_batch_result(request, outcome) for outcome in outcomes]
+        failed = sum(1 for result in results if result.error is not None)
+        
+        span.set_attribute("batch.size", len(results))
+        span.set_attribute("batch.failed", failed)
+        
+        return BatchChatResponse(
+            results=results,
+            succeeded=len(results) - failed,
+            failed=failed,
+            processing_time_ms=int((datetime.now() - start_time).total_seconds() * 1000),
+            trace_id=format(span.get_span_context().trace_id, '032x')
+        )
+
+@app.post("/agents/run", response_model=AgentRunResponse)
+async def run_agent_team(request: AgentRunRequest, x_tenant_id: Optional[str] = Header(default=None)):
+    """
+    Plan a feature request, then implement and review every subtask in a
+    parallel branch; the run takes as long as its slowest branch.
+    """
+    start_time = datetime.now()
+    config = {"max_concurrency": request.max_parallel} if request.max_parallel else None
+    
+    with tracer.start_as_current_span("agent_team_run") as span, \
+            scheduling(Priority[request.priority.upper()], x_tenant_id or "default"), \
+            track_request("/agents/run", request.model):
+        try:
+            state = await graph_registry.get(AGENT_TEAM_GRAPH).ainvoke({
+                "messages": [{"role": "user", "content": request.task}],
+                "status": "processing",
+                "data": {"model": request.model, "max_tokens": request.max_tokens},
+                "results": []
+            }, config)
+        except CircuitOpenError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=str(e),
+                headers={"Retry-After": str(max(1, int(ollama_client.health_monitor.retry_after())))}
+            )
+        except QueueFullError as e:
+            raise _queue_full_exception(e)
         except Exception as e:
-            logger.error(f"❌ Failed to list models: {str(e)}")
-            raise HTTPException(status_code=500, detail=str(e))
+            logger.error(f"❌ Agent team run failed: {str(e)}")
+            span.add_event("error_occurred", {"error": str(e)})
+            raise HTTPException(status_code=500, detail=f"Agent team run failed: {str(e)}")
+        
+        results = sorted(state.get("results", []), key=lambda result: result["index"])
+        span.set_attribute("agents.subtasks", len(results))
+        return AgentRunResponse(
+            subtasks=state.get("subtasks", []),
+            results=results,
+            summary=state.get("summary", ""),
+            processing_time_ms=int((datetime.now() - start_time).total_seconds() * 1000),
+            trace_id=format(span.get_span_context().trace_id, '032x')
+        )
+
+@app.get("/sessions/{session_id}")
+async def get_session(session_id: str):
+    """Conversation history of a server-side session"""
+    with tracer.start_as_current_span("get_session") as span:
+        state = await graph_registry.get(SESSION_GRAPH).aget_state(_session_config(session_id))
+        messages = state.values.get("messages") if state.values else None
+        if not messages:
+            raise HTTPException(status_code=404, detail=f"Session '{session_id}' not found")
+        
+        span.set_attribute("session.messages_count", len(messages))
+        return {"session_id": session_id, "messages": messages, "messages_count": len(messages)}
 
-@app.post("/models/{model_name}/pull")
-async def pull_model(model_name: str, background_tasks: BackgroundTasks):
-    """Pull a new model from Ollama registry"""
+@app.delete("/sessions/{session_id}", status_code=204)
+async def delete_session(session_id: str):
+    """Forget a session's checkpoints and history"""
+    with tracer.start_as_current_span("delete_session"):
+        await get_session_checkpointer().adelete_thread(session_id)
+        return Response(status_code=204)
+
+def _snapshot_response(request: Request, snapshot: Snapshot) -> Response:
+    """Serve a snapshot with ETag/If-None-Match revalidation"""
+    age = snapshot.age
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache", "Age": str(int(age))}
+    if_none_match = request.headers.get("if-none-match", "")
+    if snapshot.etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse({**snapshot.payload, "snapshot_age_seconds": round(age, 3)}, headers=headers)
+
+@app.get("/models")
+async def list_models(request: Request):
+    """List available Ollama models (from the background-refreshed snapshot)"""
+    with tracer.start_as_current_span("list_models") as span:
+        snapshot = await status_snapshots.models()
+        if snapshot is None:
+            detail = status_snapshots.models_error or "Ollama service is not available"
+            logger.error(f"❌ Failed to list models: {detail}")
+            raise HTTPException(status_code=503, detail=detail)
+        
+        span.set_attribute("status.snapshot.age_seconds", snapshot.age)
+        span.add_event("models_listed", {"count": len(snapshot.payload["models"])})
+        
+        return _snapshot_response(request, snapshot)
+
+@app.post("/models/{model_name}/pull", status_code=202)
+async def pull_model(model_name: str):
+    """
+    Pull a new model from Ollama registry as a background job.
+    A pull of a model that is already being pulled returns the running job.
+    """
     with tracer.start_as_current_span("pull_model") as span:
         span.set_attribute("model.name", model_name)
         
         try:
-            # Add to background tasks for async processing
-            background_tasks.add_task(ollama_client.pull_model, model_name)
+            job, created = pull_jobs.start(model_name)
             
-            span.add_event("model_pull_initiated", {"model": model_name})
+            span.set_attribute("ollama.pull.job_id", job.id)
+            span.add_event("model_pull_initiated", {"model": job.model, "deduplicated": not created})
             
-            return {"message": f"Model {model_name} pull initiated", "status": "processing"}
+            return {
+                "message": f"Model {job.model} pull initiated" if created else f"Model {job.model} pull already in progress",
+                "job_id": job.id,
+                "status": job.status,
+                "deduplicated": not created
+            }
         except Exception as e:
             logger.error(f"❌ Failed to initiate model pull: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/models/pulls/{job_id}")
+async def get_pull_job(job_id: str):
+    """Current state of a model pull job"""
+    job = pull_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Pull job {job_id} not found")
+    return job.to_dict()
+
+def _sse_event(event: str, payload: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+@app.get("/models/pulls/{job_id}/events")
+async def stream_pull_job(job_id: str):
+    """Server-sent events with throttled progress until the pull job finishes"""
+    if pull_jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Pull job {job_id} not found")
+    
+    async def events():
+        async for state in pull_jobs.subscribe(job_id):
+            yield _sse_event("done" if state["status"] in ("completed", "failed") else "progress", state)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/status")
-async def get_system_status():
-    """Get detailed system status and metrics"""
+async def get_system_status(request: Request):
+    """Get detailed system status and metrics (served from memory)"""
     with tracer.start_as_current_span("system_status") as span:
+        snapshot = status_snapshots.status()
         
-        status = {
-            "timestamp": datetime.now().isoformat(),
-            "version": "2.1.0",
-            "environment": otel_config.environment,
-            "telemetry": {
-                "sampling_rate": otel_config.sampling_rate,
-                "traces_enabled": True,
-                "metrics_enabled": True
-            },
-            "ollama": {
-                "connected": await ollama_client.health_check(),
-                "models_count": len(await ollama_client.list_models()) if await ollama_client.health_check() else 0
-            }
-        }
-        
-        span.add_event("status_collected", status)
+        span.set_attribute("status.snapshot.age_seconds", snapshot.age)
+        span.set_attribute("status.ollama.connected", snapshot.payload["ollama"]["connected"])
         
-        return status
+        return _snapshot_response(request, snapshot)
 
 if __name__ == "__main__":
     import uvicorn
@@ -263,5 +690,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        log_config=None  # keep the queued root handler from setup_logging
     )
\ No newline at end of file
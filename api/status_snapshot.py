@@ -0,0 +1,194 @@
+"""
+AutonomesAI v2.1 - Status Snapshot Service
+Background-refreshed /status and /models payloads
+
+Polling clients are served from memory with an ETag; Ollama is only asked
+for its model list on a fixed interval, never per request.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from telemetry.otel_config import get_tracer, otel_config
+from telemetry.loop_monitor import loop_lag_monitor
+from integrations.ollama_client import OllamaClient
+
+logger = logging.getLogger(__name__)
+tracer = get_tracer(__name__)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One rendered payload with its validator"""
+    payload: Dict[str, Any]
+    etag: str
+    built_at: float  # time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.built_at
+
+    @classmethod
+    def build(cls, payload: Dict[str, Any], identity: Any = None) -> "Snapshot":
+        """
+        The ETag hashes `identity` (default: the whole payload). Pass the
+        state that identifies the snapshot so ages and live counters, which
+        change on every rebuild, do not defeat If-None-Match.
+        """
+        stable = payload if identity is None else identity
+        body = json.dumps(stable, sort_keys=True, default=str).encode("utf-8")
+        # Weak: the served body also carries the snapshot age
+        return cls(payload, f'W/"{hashlib.sha256(body).hexdigest()[:32]}"', time.monotonic())
+
+
+class StatusSnapshotService:
+    """
+    Keeps the /status and /models payloads ready in memory.
+
+    Health comes from the client's cached health monitor (no I/O); the model
+    list is fetched every `models_interval` seconds while Ollama is healthy,
+    and the status payload is rebuilt every `interval` seconds.
+    """
+
+    def __init__(
+        self,
+        client: OllamaClient,
+        interval: float = 5.0,
+        models_interval: float = 30.0
+    ):
+        self.client = client
+        self.interval = interval
+        self.models_interval = models_interval
+
+        self._models: Optional[List[Dict[str, Any]]] = None
+        self._models_fetched_at = 0.0
+        self._models_error: Optional[str] = None
+        self._models_lock = asyncio.Lock()
+        self._status: Optional[Snapshot] = None
+        self._models_snapshot: Optional[Snapshot] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, client: OllamaClient) -> "StatusSnapshotService":
+        return cls(
+            client,
+            interval=float(os.getenv("STATUS_SNAPSHOT_INTERVAL", "5")),
+            models_interval=float(os.getenv("STATUS_MODELS_INTERVAL", "30"))
+        )
+
+    async def refresh_models(self, force: bool = False) -> None:
+        """Re-fetch the model list if it is due (or `force`) and Ollama is up"""
+        async with self._models_lock:
+            due = time.monotonic() - self._models_fetched_at >= self.models_interval
+            if not (force or due or self._models is None) or not self.client.is_healthy():
+                return
+            try:
+                self._models = await self.client.list_models()
+                self._models_error = None
+            except Exception as e:
+                self._models_error = str(e)
+                logger.warning(f"⚠️ Model list refresh failed: {str(e)}")
+            self._models_fetched_at = time.monotonic()
+            if self._models is not None:
+                self._models_snapshot = Snapshot.build({"models": self._models})
+
+    def rebuild_status(self) -> Snapshot:
+        """Render the status payload from in-memory state only"""
+        ollama_health = self.client.health_monitor.snapshot()
+        backends = self.client.backends.snapshot()
+        models_age = time.monotonic() - self._models_fetched_at if self._models_fetched_at else None
+        status = {
+            "timestamp": datetime.now().isoformat(),
+            "version": "2.1.0",
+            "environment": otel_config.environment,
+            "telemetry": {
+                "sampling_rate": otel_config.sampling_rate,
+                "traces_enabled": True,
+                "metrics_enabled": True,
+                "export": otel_config.export_stats()
+            },
+            "ollama": {
+                "connected": ollama_health["healthy"],
+                "models_count": len(self._models or []),
+                "models_age_seconds": round(models_age, 3) if models_age is not None else None,
+                "models_error": self._models_error,
+                "circuit_state": ollama_health["circuit_state"],
+                "last_check_age_seconds": ollama_health["last_check_age_seconds"],
+                "response_cache": self.client.response_cache.stats() if self.client.response_cache else None,
+                "prefix_cache": self.client.prefix_cache.stats() if self.client.prefix_cache else None,
+                "scheduler": self.client.scheduler.snapshot(),
+                "backends": backends,
+                "model_residency": self.client.residency.snapshot()
+            },
+            "event_loop": loop_lag_monitor.stats()
+        }
+        # Only what a client would act on changes the ETag
+        identity = {
+            "version": status["version"],
+            "environment": status["environment"],
+            "connected": ollama_health["healthy"],
+            "circuit_state": ollama_health["circuit_state"],
+            "models": [(model.get("name"), model.get("digest")) for model in self._models or []],
+            "models_error": self._models_error,
+            "backends": [(backend["url"], backend["healthy"]) for backend in backends]
+        }
+        self._status = Snapshot.build(status, identity=identity)
+        return self._status
+
+    async def refresh(self) -> None:
+        with tracer.start_as_current_span("status_snapshot_refresh") as span:
+            await self.refresh_models()
+            snapshot = self.rebuild_status()
+            span.set_attribute("status.ollama.connected", snapshot.payload["ollama"]["connected"])
+            span.set_attribute("status.models.count", snapshot.payload["ollama"]["models_count"])
+
+    def status(self) -> Snapshot:
+        """Latest status snapshot (rendered on first use)"""
+        if self._status is None or self._status.age > self.interval * 2:
+            # Background loop not running (or stalled) - render from memory now
+            return self.rebuild_status()
+        return self._status
+
+    async def models(self) -> Optional[Snapshot]:
+        """Latest model list snapshot; fetched on demand only before the first refresh"""
+        if self._models_snapshot is None:
+            await self.refresh_models(force=True)
+        return self._models_snapshot
+
+    @property
+    def models_error(self) -> Optional[str]:
+        return self._models_error
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"⚠️ Status snapshot refresh failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background refresh loop on the running event loop"""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"📸 Status snapshot service started (interval {self.interval}s)")
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
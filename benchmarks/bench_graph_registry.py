@@ -0,0 +1,55 @@
+"""
+AutonomesAI v2.1 - Graph Registry Benchmark
+Per-request overhead of building + compiling the DAG vs. the shared registry.
+
+Usage: python benchmarks/bench_graph_registry.py [iterations]
+"""
+
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from graph import create_autonomes_graph, CompiledGraphRegistry, AUTONOMES_GRAPH  # noqa: E402
+
+
+def bench_per_request_compile(iterations: int) -> float:
+    """Old /chat behaviour: build and compile on every request"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        create_autonomes_graph().compile()
+    return (time.perf_counter() - start) / iterations
+
+
+def bench_registry(iterations: int) -> float:
+    """New /chat behaviour: fetch the shared compiled graph"""
+    registry = CompiledGraphRegistry()
+    registry.register(AUTONOMES_GRAPH, create_autonomes_graph)
+    registry.warm_up()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        registry.get(AUTONOMES_GRAPH)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    # Measure the default INFO logging too - it is part of the per-request cost
+    logging.basicConfig(level=logging.INFO, stream=open(os.devnull, "w"), force=True)
+
+    before = bench_per_request_compile(iterations)
+    after = bench_registry(iterations)
+
+    print(f"iterations:            {iterations}")
+    print(f"build+compile/request: {before * 1e6:10.1f} µs")
+    print(f"registry.get/request:  {after * 1e6:10.1f} µs")
+    print(f"speedup:               {before / after:10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+AutonomesAI v2.1 - Telemetry Export Benchmark
+Per-span overhead of the export pipeline against a local stub OTLP collector.
+
+Compares no processor, the old console setup (batch size 10) and OTLP/HTTP
+with the configured batching. Needs opentelemetry-exporter-otlp for the
+OTLP case; batching is tuned with the usual OTEL_BSP_* variables.
+
+Usage: python benchmarks/bench_otel_export.py [spans]
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Keep the global telemetry setup (imported with the package) quiet
+os.environ.setdefault("OTEL_TRACES_EXPORTER", "none")
+os.environ.setdefault("OTEL_METRICS_EXPORTER", "none")
+
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter  # noqa: E402
+
+from telemetry.export_pipeline import (  # noqa: E402
+    EXPORTER_OTLP,
+    PROTOCOL_HTTP,
+    ExportSettings,
+    create_span_processor,
+)
+
+
+class StubCollector(BaseHTTPRequestHandler):
+    """Accepts OTLP/HTTP export requests and counts them"""
+    requests = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        StubCollector.requests += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-protobuf")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_collector() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubCollector)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench(provider: TracerProvider, spans: int) -> float:
+    tracer = provider.get_tracer("bench")
+    start = time.perf_counter()
+    for i in range(spans):
+        with tracer.start_as_current_span("gen_ai.chat_completion") as span:
+            span.set_attribute("gen_ai.system", "langgraph")
+            span.set_attribute("gen_ai.request.model", "llama3.3:8b")
+            span.set_attribute("gen_ai.usage.input_tokens", i)
+    elapsed = (time.perf_counter() - start) / spans
+    provider.shutdown()
+    return elapsed
+
+
+def main():
+    spans = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    baseline = bench(TracerProvider(), spans)
+
+    with open(os.devnull, "w") as devnull:
+        console = TracerProvider()
+        console.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter(out=devnull), max_export_batch_size=10))
+        console_time = bench(console, spans)
+
+    print(f"spans:                 {spans}")
+    print(f"no processor:          {baseline * 1e6:8.2f} µs/span")
+    print(f"console (batch 10):    {console_time * 1e6:8.2f} µs/span")
+
+    server = start_stub_collector()
+    settings = ExportSettings.from_env()
+    settings.traces_exporter = EXPORTER_OTLP
+    settings.protocol = PROTOCOL_HTTP
+    settings.endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+
+    processor = create_span_processor(settings)
+    if processor is None:
+        print("otlp/http:             skipped (opentelemetry-exporter-otlp not installed)")
+        return
+    otlp = TracerProvider()
+    otlp.add_span_processor(processor)
+    otlp_time = bench(otlp, spans)
+    server.shutdown()
+
+    print(
+        f"otlp/http (batch {settings.max_export_batch_size}, queue {settings.max_queue_size}): "
+        f"{otlp_time * 1e6:8.2f} µs/span"
+    )
+    print(f"export requests:       {StubCollector.requests}")
+    print(f"dropped spans:         {processor.dropped_spans}")
+
+
+if __name__ == "__main__":
+    main()
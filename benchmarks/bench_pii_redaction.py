@@ -0,0 +1,87 @@
+"""
+AutonomesAI v2.1 - PII Redaction Benchmark
+Per-payload cost of the old top-level key filter vs. the redaction engine.
+
+Payloads are typical AutonomesState dicts (messages, status, data) of a
+few sizes. The old filter only looks at top-level keys, so it is cheaper
+on large conversations but misses everything inside `messages`/`data`.
+
+Usage: python benchmarks/bench_pii_redaction.py [iterations]
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Keep the global telemetry setup (imported with the package) quiet
+os.environ.setdefault("OTEL_TRACES_EXPORTER", "none")
+os.environ.setdefault("OTEL_METRICS_EXPORTER", "none")
+
+from telemetry.pii_redaction import PIIRedactor  # noqa: E402
+
+LEGACY_PII_FIELDS = ["email", "phone", "ssn", "credit_card", "password", "token", "api_key"]
+
+
+def legacy_filter(data):
+    """The previous add_pii_protection_filter, minus the span events"""
+    filtered_data = {}
+    for key, value in data.items():
+        if any(pii_field in key.lower() for pii_field in LEGACY_PII_FIELDS):
+            filtered_data[key] = "[REDACTED]"
+        else:
+            filtered_data[key] = value
+    return filtered_data
+
+
+def make_state(turns: int) -> dict:
+    messages = []
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"Question {i}: how do I tune the scheduler for tenant {i}?"})
+        messages.append({
+            "role": "assistant",
+            "content": "Raise OLLAMA_MAX_CONCURRENCY and keep interactive traffic at high priority. " * 4
+        })
+    messages.append({"role": "user", "content": "Reach me at jane.roe@example.com or +1 415-555-2671."})
+    return {
+        "messages": messages,
+        "status": "success",
+        "data": {
+            "prompt_version": "1.0.0",
+            "usage": {"prompt_tokens": 150, "completion_tokens": 50, "total_tokens": 200},
+            "api_key": "sk-not-a-real-key",
+            "tenant": {"id": "acme", "billing": {"card_number": "4111 1111 1111 1111"}}
+        },
+        "msg": "bootstrap",
+        "timestamp": "2025-06-18T16:23:52Z",
+        "version": "2.1.0"
+    }
+
+
+def bench(fn, payload, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(payload)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    redactor = PIIRedactor()
+
+    print(f"iterations: {iterations}")
+    print(f"{'turns':>6} {'legacy (top-level)':>20} {'redactor (nested)':>20} {'redactions':>12}")
+    for turns in (0, 5, 20, 50):
+        state = make_state(turns)
+        legacy = bench(legacy_filter, state, iterations)
+        current = bench(redactor.redact, state, iterations)
+        _, counts = redactor.redact(state)
+        print(
+            f"{turns:>6} {legacy * 1e6:>17.2f} µs {current * 1e6:>17.2f} µs "
+            f"{sum(counts.values()):>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
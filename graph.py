@@ -5,46 +5,85 @@ Sprint 0-A: "Hello Graph" with OpenTelemetry integration
 Following masterplan specifications exactly.
 """
 
-from typing import Dict, Any, TypedDict
+from typing import Annotated, Dict, Any, List, TypedDict, Awaitable, Callable, Optional, Tuple
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import functools
+import hashlib
+import inspect
 import json
 import logging
-import yaml
+import operator
+import threading
 import os
-from pathlib import Path
+import re
+import types
+import yaml
 
 # Import our advanced OTel configuration
-from telemetry.otel_config import get_tracer, create_gen_ai_span, otel_config
+from opentelemetry import trace
+from telemetry.otel_config import get_tracer, traced_gen_ai, otel_config
+from telemetry.gen_ai_metrics import timed_node
+from telemetry.logging_config import LazyJson, setup_logging
+from prompt_registry import prompt_registry
+from integrations.session_checkpointer import SessionCheckpointer
 
 tracer = get_tracer(__name__)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (queued, trace-correlated)
+setup_logging()
 logger = logging.getLogger(__name__)
 
+# Blocking work of async nodes (file I/O, parsing) runs here, never on the loop
+_offload_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AUTONOMES_GRAPH_OFFLOAD_THREADS", "4")),
+    thread_name_prefix="graph-offload"
+)
+
+
+async def offload(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run blocking `fn` on the graph thread pool from an async node.
+    The caller's context (current span, scheduling class) is carried over.
+    """
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, fn, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(_offload_executor, call)
+
 
 class AutonomesState(TypedDict):
     """Simple state for our autonomous AI system"""
-    messages: list
+    # Append-only: nodes return new messages, never the history
+    messages: Annotated[list, operator.add]
+    status: str
+    data: Dict[str, Any]
+
+
+class AgentTeamState(TypedDict):
+    """State of a planner -> parallel coder/reviewer branches -> merge run"""
+    messages: Annotated[list, operator.add]
     status: str
     data: Dict[str, Any]
+    subtasks: List[str]
+    # Join: every branch appends its own result; merge orders them
+    results: Annotated[list, operator.add]
+    summary: str
 
 
 def load_prompt_template(prompt_name: str) -> Dict[str, Any]:
     """
     Load prompt template from versioned YAML files
-    Sprint 0-B: Prompt versioning implementation
+    Sprint 0-B: Prompt versioning implementation (served from the cached registry)
     """
     try:
-        prompts_path = Path(__file__).parent / "prompts" / "system_prompts.yaml"
-        
-        with open(prompts_path, 'r', encoding='utf-8') as f:
-            prompts_data = yaml.safe_load(f)
+        template = prompt_registry.get(prompt_name)
         
-        if prompt_name in prompts_data.get("prompts", {}):
-            prompt_info = prompts_data["prompts"][prompt_name]
-            logger.info(f"📝 Loaded prompt '{prompt_name}' v{prompt_info.get('version', 'unknown')}")
-            return prompt_info
+        if template is not None:
+            logger.debug("📝 Using prompt '%s' v%s", prompt_name, template.version)
+            return template.to_dict()
         else:
             logger.warning(f"⚠️ Prompt '{prompt_name}' not found, using default")
             return {"version": "unknown", "content": "Default system prompt"}
@@ -54,67 +93,67 @@ def load_prompt_template(prompt_name: str) -> Dict[str, Any]:
         return {"version": "error", "content": "Error loading prompt"}
 
 
-def bootstrap_node(state: Dict[str, Any]) -> Dict[str, Any]:
+@timed_node("bootstrap")
+@traced_gen_ai("bootstrap", "autonomesai-v2.1", temperature=0.1, max_tokens=500)
+async def bootstrap_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Bootstrap node - first node in our DAG.
     Emits OpenTelemetry spans with Gen-AI semantic conventions v1.34.0.
     """
-    with create_gen_ai_span(
-        tracer, 
-        "bootstrap", 
-        "autonomesai-v2.1",
-        temperature=0.1,
-        max_tokens=500
-    ) as span:
-        logger.info("🚀 AutonomesAI v2.1 Bootstrap Node Executing")
-        
-        # Load prompt template
-        prompt_data = load_prompt_template("bootstrap_agent")
-        
-        result = {
-            "msg": "bootstrap",
-            "status": "success",
-            "timestamp": "2025-06-18T16:23:52Z",
-            "version": "2.1.0",
-            "sprint": "0-B",
-            "prompt_version": prompt_data.get("version", "1.0.0")
-        }
-        
-        # Filter PII and add response attributes
-        filtered_result = otel_config.add_pii_protection_filter(span, result)
-        otel_config.add_gen_ai_response_attributes(
-            span, 
-            "success", 
-            {"prompt_tokens": 150, "completion_tokens": 50, "total_tokens": 200}
-        )
-        
+    span = trace.get_current_span()
+    logger.info("🚀 AutonomesAI v2.1 Bootstrap Node Executing")
+    
+    prompt_data = load_prompt_template("bootstrap_agent")
+    
+    result = {
+        "msg": "bootstrap",
+        "status": "success",
+        "timestamp": "2025-06-18T16:23:52Z",
+        "version": "2.1.0",
+        "sprint": "0-B",
+        "prompt_version": prompt_data.get("version", "1.0.0")
+    }
+    
+    # Filter PII and add response attributes
+    filtered_result = otel_config.add_pii_protection_filter(span, result)
+    otel_config.add_gen_ai_response_attributes(
+        span, 
+        "success", 
+        {"prompt_tokens": 150, "completion_tokens": 50, "total_tokens": 200}
+    )
+    
+    if span.is_recording():
         span.add_event("bootstrap_completed", {"result_keys": list(filtered_result.keys())})
-        logger.info(f"✅ Bootstrap completed: {filtered_result}")
-        return filtered_result
+    logger.info("✅ Bootstrap completed: %s", filtered_result)
+    return filtered_result
 
 
-def end_node(state: Dict[str, Any]) -> Dict[str, Any]:
+@timed_node("end")
+@traced_gen_ai("finalize", "autonomesai-v2.1")
+async def end_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     End node - terminates the DAG execution with enhanced tracing.
     """
-    with create_gen_ai_span(tracer, "finalize", "autonomesai-v2.1") as span:
-        logger.info("🏁 AutonomesAI v2.1 End Node Executing")
-        
-        final_state = {
-            **state,
-            "completed": True,
-            "final_status": "dag_completed",
-            "telemetry_verified": True
-        }
-        
-        # Apply PII protection and add telemetry
-        filtered_state = otel_config.add_pii_protection_filter(span, final_state)
-        otel_config.add_gen_ai_response_attributes(span, "completed")
-        
+    span = trace.get_current_span()
+    logger.info("🏁 AutonomesAI v2.1 End Node Executing")
+    
+    # `messages` is append-only; returning it would re-append the history
+    final_state = {
+        **{key: value for key, value in state.items() if key != "messages"},
+        "completed": True,
+        "final_status": "dag_completed",
+        "telemetry_verified": True
+    }
+    
+    # Apply PII protection and add telemetry
+    filtered_state = otel_config.add_pii_protection_filter(span, final_state)
+    otel_config.add_gen_ai_response_attributes(span, "completed")
+    
+    if span.is_recording():
         span.add_event("dag_completed", {"final_state_keys": list(filtered_state.keys())})
-        logger.info(f"✅ DAG execution completed: {filtered_state}")
-        
-        return filtered_state
+    logger.info("✅ DAG execution completed: %s", filtered_state)
+    
+    return filtered_state
 
 
 def create_autonomes_graph() -> StateGraph:
@@ -142,6 +181,314 @@ def create_autonomes_graph() -> StateGraph:
     return graph
 
 
+AUTONOMES_GRAPH = "autonomes"
+# Same DAG, checkpointed per session thread (`thread_id` = session id)
+SESSION_GRAPH = "autonomes_session"
+# Planner fan-out to parallel coder/reviewer branches (see create_agent_team_graph)
+AGENT_TEAM_GRAPH = "autonomes_agents"
+
+# Branches (graph tasks) in flight per run; LangGraph's `max_concurrency`
+AGENT_TEAM_MAX_PARALLEL = int(os.getenv("AUTONOMES_GRAPH_MAX_PARALLEL", "4"))
+AGENT_TEAM_MAX_SUBTASKS = int(os.getenv("AUTONOMES_GRAPH_MAX_SUBTASKS", "8"))
+
+# (agent prompt name, task, run data) -> the agent's answer
+AgentRunner = Callable[[str, str, Dict[str, Any]], Awaitable[str]]
+
+_YAML_BLOCK_RE = re.compile(r"```(?:yaml|yml)?\s*\n(.*?)```", re.DOTALL)
+_LIST_ITEM_RE = re.compile(r"^\s*(?:[-*]|\d+[.)])\s+(?:task:\s*)?[\"']?(.+?)[\"']?\s*$")
+
+
+def parse_plan(text: str, max_subtasks: int = AGENT_TEAM_MAX_SUBTASKS) -> List[str]:
+    """
+    Subtasks from the planner's answer: `sprint_plan[].tasks[].task` of its
+    YAML block, else plain list items. Empty when nothing could be parsed.
+    """
+    block = _YAML_BLOCK_RE.search(text)
+    try:
+        plan = yaml.safe_load(block.group(1) if block else text)
+    except yaml.YAMLError:
+        plan = None
+
+    subtasks = []
+    if isinstance(plan, dict) and isinstance(plan.get("sprint_plan"), list):
+        for sprint in filter(lambda sprint: isinstance(sprint, dict), plan["sprint_plan"]):
+            for task in sprint.get("tasks") or []:
+                if isinstance(task, dict) and task.get("task"):
+                    subtasks.append(str(task["task"]))
+    if not subtasks:
+        for line in text.splitlines():
+            match = _LIST_ITEM_RE.match(line)
+            if match:
+                subtasks.append(match.group(1))
+    return subtasks[:max_subtasks]
+
+
+def create_agent_team_graph(run_agent: AgentRunner, max_subtasks: int = AGENT_TEAM_MAX_SUBTASKS) -> StateGraph:
+    """
+    Planner -> one branch per subtask -> merge.
+
+    The planner's subtasks are mapped with `Send`, so every branch (coder,
+    then reviewer, on its own subtask) is a separate task of the same
+    superstep and the branches run concurrently on the event loop, up to the
+    run's `max_concurrency`. Branches append to `results` (reducer join) and
+    `merge` runs once all of them are done: wall time is the slowest branch,
+    not the sum.
+    """
+    logger.info("🔧 Creating AutonomesAI agent team graph...")
+
+    @timed_node("plan")
+    @traced_gen_ai("plan", "autonomesai-v2.1")
+    async def plan_node(state: Dict[str, Any]) -> Dict[str, Any]:
+        span = trace.get_current_span()
+        request = state["messages"][-1]["content"]
+        plan = await run_agent("planner_agent", request, state["data"])
+        # Unparseable plan: the request itself is the only subtask
+        subtasks = parse_plan(plan, max_subtasks) or [request]
+        if span.is_recording():
+            span.set_attribute("autonomes.agents.subtasks", len(subtasks))
+        logger.info("🗂️ Planner produced %d subtasks", len(subtasks))
+        return {"subtasks": subtasks, "status": "planned"}
+
+    def fan_out(state: Dict[str, Any]) -> List[Send]:
+        return [
+            Send("branch", {"index": index, "subtask": subtask, "data": state["data"]})
+            for index, subtask in enumerate(state["subtasks"])
+        ]
+
+    @timed_node("branch")
+    @traced_gen_ai("agent_branch", "autonomesai-v2.1")
+    async def branch_node(task: Dict[str, Any]) -> Dict[str, Any]:
+        span = trace.get_current_span()
+        if span.is_recording():
+            span.set_attribute("autonomes.agents.subtask_index", task["index"])
+        implementation = await run_agent("coder_agent", task["subtask"], task["data"])
+        review = await run_agent(
+            "reviewer_agent",
+            f"Task: {task['subtask']}\n\nImplementation:\n{implementation}",
+            task["data"]
+        )
+        return {"results": [{
+            "index": task["index"],
+            "subtask": task["subtask"],
+            "implementation": implementation,
+            "review": review
+        }]}
+
+    @timed_node("merge")
+    @traced_gen_ai("merge", "autonomesai-v2.1")
+    async def merge_node(state: Dict[str, Any]) -> Dict[str, Any]:
+        # Branches finish in any order; report them in plan order
+        results = sorted(state["results"], key=lambda result: result["index"])
+        summary = "\n\n".join(
+            f"## {result['index'] + 1}. {result['subtask']}\n\n{result['implementation']}\n\n"
+            f"### Review\n\n{result['review']}"
+            for result in results
+        )
+        otel_config.add_gen_ai_response_attributes(trace.get_current_span(), "completed")
+        logger.info("✅ Merged %d agent branches", len(results))
+        return {
+            "summary": summary,
+            "status": "completed",
+            "messages": [{"role": "assistant", "content": summary}]
+        }
+
+    graph = StateGraph(AgentTeamState)
+    graph.add_node("plan", plan_node)
+    graph.add_node("branch", branch_node)
+    graph.add_node("merge", merge_node)
+
+    graph.set_entry_point("plan")
+    graph.add_conditional_edges("plan", fan_out, ["branch"])
+    graph.add_edge("branch", "merge")
+    graph.add_edge("merge", END)
+
+    logger.info("✅ Agent team graph created with plan->branch*->merge->END flow")
+    return graph
+
+
+def _code_fingerprint(code: types.CodeType) -> List[Any]:
+    """Bytecode, names and constants of a function (nested code included)"""
+    consts = []
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            consts.append(_code_fingerprint(const))
+        elif isinstance(const, frozenset):
+            consts.append(sorted(map(repr, const)))
+        else:
+            consts.append(repr(const))
+    return [code.co_code.hex(), list(code.co_names), consts]
+
+
+def _callable_fingerprint(runnable: Any) -> List[Any]:
+    """Qualified name and code of the function behind a node or router"""
+    fn = getattr(runnable, "func", None) or getattr(runnable, "afunc", None) or runnable
+    # Past timed_node / traced_gen_ai wrappers (functools.wraps) to the body
+    fn = inspect.unwrap(fn)
+    code = getattr(fn, "__code__", None)
+    return [
+        getattr(fn, "__qualname__", type(fn).__name__),
+        _code_fingerprint(code) if code is not None else None
+    ]
+
+
+def graph_fingerprint(graph: StateGraph) -> str:
+    """
+    Stable hash of a graph definition: nodes, edges, conditional branches
+    and the code of every node function and router.
+    Used as the default version so an unchanged definition never recompiles,
+    while an edited node body or router yields a new version.
+    """
+    nodes = sorted(
+        [name, getattr(spec.runnable, "name", ""), _callable_fingerprint(spec.runnable)]
+        for name, spec in graph.nodes.items()
+    )
+    edges = sorted(f"{start}->{end}" for start, end in graph.edges)
+    branches = []
+    for source, source_branches in graph.branches.items():
+        for name, branch in source_branches.items():
+            ends = branch.ends
+            branches.append([
+                source,
+                name,
+                _callable_fingerprint(branch.path),
+                sorted(map(str, ends.items() if isinstance(ends, dict) else ends or ()))
+            ])
+    branches.sort()
+    digest = hashlib.sha256(json.dumps([nodes, edges, branches]).encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+class CompiledGraphRegistry:
+    """
+    Registry of compiled LangGraph DAGs keyed by (name, version).
+
+    Each variant is built and compiled once and the compiled object is shared
+    by all concurrent requests. `swap` compiles the new definition first and
+    then flips the active version, so in-flight requests keep the graph they
+    started with.
+    """
+
+    def __init__(self):
+        self._builders: Dict[str, Callable[[], StateGraph]] = {}
+        self._checkpointers: Dict[str, Any] = {}
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        self._compiled: Dict[Tuple[str, str], Any] = {}
+        self._active: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        builder: Callable[[], StateGraph],
+        checkpointer: Any = None,
+        config: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Register a graph builder; compilation happens on warm-up or first use.
+        `checkpointer` may be a zero-argument factory, called at compile time.
+        `config` is bound to the compiled graph as run defaults (e.g.
+        `max_concurrency`); per-call config still overrides it.
+        """
+        with self._lock:
+            self._builders[name] = builder
+            self._checkpointers[name] = checkpointer
+            self._configs[name] = config or {}
+
+    def _compile(self, name: str, version: Optional[str] = None) -> str:
+        graph = self._builders[name]()
+        version = version or graph_fingerprint(graph)
+        key = (name, version)
+        if key not in self._compiled:
+            checkpointer = self._checkpointers.get(name)
+            if callable(checkpointer):
+                checkpointer = checkpointer()
+            compiled = graph.compile(checkpointer=checkpointer)
+            config = self._configs.get(name)
+            self._compiled[key] = compiled.with_config(config) if config else compiled
+            logger.info(f"🧩 Compiled graph '{name}' v{version}")
+        self._active[name] = version
+        return version
+
+    def warm_up(self) -> Dict[str, str]:
+        """Compile every registered graph that has no active version yet"""
+        with self._lock:
+            for name in self._builders:
+                if name not in self._active:
+                    self._compile(name)
+            return dict(self._active)
+
+    def get(self, name: str = AUTONOMES_GRAPH, version: Optional[str] = None) -> Any:
+        """Return the shared compiled graph (active version unless pinned)"""
+        active = self._active.get(name)
+        if version is None and active is not None:
+            return self._compiled[(name, active)]
+
+        with self._lock:
+            if name not in self._builders:
+                raise KeyError(f"Graph '{name}' is not registered")
+            if version is None:
+                version = self._active.get(name) or self._compile(name)
+            if (name, version) not in self._compiled:
+                raise KeyError(f"Graph '{name}' v{version} is not compiled")
+            return self._compiled[(name, version)]
+
+    def swap(
+        self,
+        name: str,
+        builder: Optional[Callable[[], StateGraph]] = None,
+        version: Optional[str] = None,
+        retire_previous: bool = True
+    ) -> str:
+        """
+        Hot swap the active version of a graph.
+        Rebuilds from `builder` (or the registered one); a no-op when the
+        definition fingerprint is unchanged.
+        """
+        with self._lock:
+            if builder is not None:
+                self._builders[name] = builder
+            previous = self._active.get(name)
+            new_version = self._compile(name, version)
+
+            if retire_previous and previous and previous != new_version:
+                self._compiled.pop((name, previous), None)
+                logger.info(f"♻️ Graph '{name}' swapped v{previous} -> v{new_version}")
+            return new_version
+
+    def active_versions(self) -> Dict[str, str]:
+        """Currently active version per graph name"""
+        return dict(self._active)
+
+
+# Global registry instance
+graph_registry = CompiledGraphRegistry()
+graph_registry.register(AUTONOMES_GRAPH, create_autonomes_graph)
+
+# Conversation sessions: sqlite checkpoints with an in-memory hot tier,
+# opened on first use so importing this module never creates the database
+_session_checkpointer: Optional[SessionCheckpointer] = None
+_session_checkpointer_lock = threading.Lock()
+
+
+def get_session_checkpointer() -> SessionCheckpointer:
+    """The shared session checkpointer (opened on first call)"""
+    global _session_checkpointer
+    with _session_checkpointer_lock:
+        if _session_checkpointer is None:
+            _session_checkpointer = SessionCheckpointer.from_env()
+        return _session_checkpointer
+
+
+def close_session_checkpointer() -> None:
+    """Close the session checkpointer if it was ever opened (at shutdown)"""
+    with _session_checkpointer_lock:
+        if _session_checkpointer is not None:
+            _session_checkpointer.close()
+
+
+graph_registry.register(SESSION_GRAPH, create_autonomes_graph, checkpointer=get_session_checkpointer)
+
+
 def main():
     """
     Main execution function for Sprint 0-A validation.
@@ -157,9 +504,8 @@ def main():
         logger.info(f"📊 Sampling rate: {otel_config.sampling_rate * 100}%")
         
         try:
-            # Create and compile the graph
-            graph = create_autonomes_graph()
-            compiled_graph = graph.compile()
+            # Get the shared compiled graph
+            compiled_graph = graph_registry.get(AUTONOMES_GRAPH)
             
             # Execute the graph with initial state
             initial_state = {
@@ -173,13 +519,13 @@ def main():
                 }
             }
             
-            logger.info(f"🎯 Executing graph with initial state: {initial_state}")
+            logger.info("🎯 Executing graph with initial state: %s", initial_state)
             
-            # Run the compiled graph
-            result = compiled_graph.invoke(initial_state)
+            # Run the compiled graph (nodes are async)
+            result = asyncio.run(compiled_graph.ainvoke(initial_state))
             
             logger.info("🎉 Graph execution completed successfully!")
-            logger.info(f"📊 Final result: {json.dumps(result, indent=2)}")
+            logger.info("📊 Final result: %s", LazyJson(result, indent=2))
             
             # Save result for next session
             with open("runtime_result.json", "w") as f:
@@ -189,7 +535,6 @@ def main():
             span.add_event("sprint_0b_completed", {"success": True, "telemetry_enhanced": True})
             
             # Force flush traces to ensure they're exported  
-            from opentelemetry import trace
             if hasattr(trace.get_tracer_provider(), 'force_flush'):
                 trace.get_tracer_provider().force_flush(timeout_millis=5000)
             
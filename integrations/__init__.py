@@ -4,6 +4,43 @@ External service integrations
 """
 
 from .ollama_client import OllamaClient
+from .health_monitor import OllamaHealthMonitor, CircuitState, CircuitOpenError
+from .response_cache import ResponseCache
+from .single_flight import SingleFlight
+from .scheduler import RequestScheduler, Priority, QueueFullError, scheduling
+from .http_pool import PoolConfig, OperationTimeouts
+from .backend_pool import Backend, BackendPool
+from .token_accounting import TokenUsage, TokenCounter, token_counter
+from .model_residency import ModelResidencyManager
+from .pull_jobs import PullJob, PullJobManager
+from .session_checkpointer import SessionCheckpointer
+from .prefix_cache import PrefixCache
+from .context_window import ContextWindowManager, FittedContext
 
 __version__ = "2.1.0"
-__all__ = ["OllamaClient"]
\ No newline at end of file
+__all__ = [
+    "OllamaClient",
+    "OllamaHealthMonitor",
+    "CircuitState",
+    "CircuitOpenError",
+    "ResponseCache",
+    "SingleFlight",
+    "RequestScheduler",
+    "Priority",
+    "QueueFullError",
+    "scheduling",
+    "PoolConfig",
+    "OperationTimeouts",
+    "Backend",
+    "BackendPool",
+    "TokenUsage",
+    "TokenCounter",
+    "token_counter",
+    "ModelResidencyManager",
+    "PullJob",
+    "PullJobManager",
+    "SessionCheckpointer",
+    "PrefixCache",
+    "ContextWindowManager",
+    "FittedContext"
+]
\ No newline at end of file
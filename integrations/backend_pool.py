@@ -0,0 +1,206 @@
+"""
+AutonomesAI v2.1 - Ollama Backend Pool
+Model-aware load balancing and failover across several Ollama nodes
+
+Routing prefers nodes that already have the model loaded (/api/ps), then
+nodes that have it pulled (/api/tags), and balances by in-flight count or
+latency EWMA among those.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Set
+from urllib.parse import urljoin
+
+import aiohttp
+
+from telemetry.otel_config import get_tracer
+
+logger = logging.getLogger(__name__)
+tracer = get_tracer(__name__)
+
+STRATEGY_LEAST_OUTSTANDING = "least_outstanding"
+STRATEGY_EWMA = "ewma"
+
+
+def normalize_model_name(model: str) -> str:
+    """Ollama treats `llama3` and `llama3:latest` as the same model"""
+    return model if ":" in model else f"{model}:latest"
+
+
+class Backend:
+    """Routing state for one Ollama node"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.in_flight = 0
+        self.ewma_latency = 0.0
+        self.models: Dict[str, str] = {}  # name -> digest, from /api/tags
+        self.loaded: Set[str] = set()      # resident models, from /api/ps
+        self.healthy = True
+        self.consecutive_failures = 0
+        self.retry_at = 0.0
+        self.tags_refreshed_at = 0.0
+
+    def available(self, now: float) -> bool:
+        """Healthy, or ejected long enough ago to deserve another try"""
+        return self.healthy or now >= self.retry_at
+
+    def observe_latency(self, seconds: float, alpha: float = 0.3) -> None:
+        self.ewma_latency = seconds if self.ewma_latency == 0 else (
+            alpha * seconds + (1 - alpha) * self.ewma_latency
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "in_flight": self.in_flight,
+            "ewma_latency_ms": round(self.ewma_latency * 1000, 1),
+            "models": sorted(self.models),
+            "loaded": sorted(self.loaded)
+        }
+
+
+class BackendPool:
+    """
+    Chooses an Ollama node per request and tracks its health.
+
+    A node is ejected after `failure_threshold` consecutive failures and is
+    retried after `eject_seconds` (or as soon as a refresh succeeds).
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        strategy: str = STRATEGY_LEAST_OUTSTANDING,
+        failure_threshold: int = 2,
+        eject_seconds: float = 10.0,
+        tags_interval: float = 60.0
+    ):
+        if not urls:
+            raise ValueError("BackendPool needs at least one Ollama base URL")
+        self.backends = [Backend(url) for url in urls]
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.eject_seconds = eject_seconds
+        self.tags_interval = tags_interval
+
+    @classmethod
+    def from_env(cls, urls: Sequence[str]) -> "BackendPool":
+        return cls(
+            urls,
+            strategy=os.getenv("OLLAMA_LB_STRATEGY", STRATEGY_LEAST_OUTSTANDING),
+            failure_threshold=int(os.getenv("OLLAMA_BACKEND_FAILURE_THRESHOLD", "2")),
+            eject_seconds=float(os.getenv("OLLAMA_BACKEND_EJECT_SECONDS", "10"))
+        )
+
+    def __len__(self) -> int:
+        return len(self.backends)
+
+    def _score(self, backend: Backend) -> tuple:
+        if self.strategy == STRATEGY_EWMA:
+            # Expected wait if we join this node's queue
+            return (backend.ewma_latency * (backend.in_flight + 1), backend.in_flight)
+        return (backend.in_flight, backend.ewma_latency)
+
+    def choose(self, model: Optional[str] = None, exclude: Sequence[Backend] = ()) -> Backend:
+        """Pick the best node for `model`, skipping nodes in `exclude`"""
+        now = time.monotonic()
+        candidates = [b for b in self.backends if b not in exclude and b.available(now)]
+        if not candidates:
+            # Everything is ejected - try anything not yet attempted
+            candidates = [b for b in self.backends if b not in exclude] or list(self.backends)
+
+        if model is not None:
+            model = normalize_model_name(model)
+            loaded = [b for b in candidates if model in b.loaded]
+            pulled = [b for b in candidates if model in b.models]
+            candidates = loaded or pulled or candidates
+
+        return min(candidates, key=self._score)
+
+    @contextmanager
+    def track(self, backend: Backend) -> Iterator[None]:
+        """Count a request as in flight on `backend` for the duration of the block"""
+        backend.in_flight += 1
+        try:
+            yield
+        finally:
+            backend.in_flight -= 1
+
+    def record_success(self, backend: Backend) -> None:
+        backend.consecutive_failures = 0
+        if not backend.healthy:
+            logger.info(f"✅ Ollama backend {backend.url} is back in rotation")
+        backend.healthy = True
+
+    def record_failure(self, backend: Backend) -> None:
+        backend.consecutive_failures += 1
+        if backend.healthy and backend.consecutive_failures >= self.failure_threshold:
+            backend.healthy = False
+            logger.warning(f"⚠️ Ejecting Ollama backend {backend.url} for {self.eject_seconds}s")
+        if not backend.healthy:
+            backend.retry_at = time.monotonic() + self.eject_seconds
+
+    def any_healthy(self) -> bool:
+        now = time.monotonic()
+        return any(b.available(now) for b in self.backends)
+
+    def digest(self, model: str) -> Optional[str]:
+        """Model digest as reported by any node"""
+        model = normalize_model_name(model)
+        for backend in self.backends:
+            if model in backend.models:
+                return backend.models[model]
+        return None
+
+    async def _refresh_backend(
+        self,
+        backend: Backend,
+        session: aiohttp.ClientSession,
+        timeout: aiohttp.ClientTimeout
+    ) -> bool:
+        try:
+            async with session.get(urljoin(backend.url, "/api/ps"), timeout=timeout) as response:
+                response.raise_for_status()
+                data = await response.json()
+                backend.loaded = {
+                    normalize_model_name(m["name"]) for m in data.get("models", []) if "name" in m
+                }
+
+            # The pulled-model list changes rarely; refresh it on a slower cadence
+            if time.monotonic() - backend.tags_refreshed_at > self.tags_interval:
+                async with session.get(urljoin(backend.url, "/api/tags"), timeout=timeout) as response:
+                    response.raise_for_status()
+                    self.update_models(backend, (await response.json()).get("models", []))
+
+            self.record_success(backend)
+            return True
+        except Exception as e:
+            logger.debug(f"Ollama backend {backend.url} refresh failed: {e}")
+            self.record_failure(backend)
+            return False
+
+    def update_models(self, backend: Backend, models: List[Dict[str, Any]]) -> None:
+        """Replace a node's pulled-model list from an /api/tags payload"""
+        backend.models = {
+            normalize_model_name(m["name"]): m.get("digest", m["name"]) for m in models if "name" in m
+        }
+        backend.tags_refreshed_at = time.monotonic()
+
+    async def refresh(self, session: aiohttp.ClientSession, timeout: aiohttp.ClientTimeout) -> bool:
+        """Refresh loaded/pulled models on every node; True if any node answered"""
+        with tracer.start_as_current_span("ollama_backend_refresh") as span:
+            results = await asyncio.gather(
+                *(self._refresh_backend(b, session, timeout) for b in self.backends)
+            )
+            span.set_attribute("ollama.backends.total", len(results))
+            span.set_attribute("ollama.backends.healthy", sum(results))
+            return any(results)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [backend.snapshot() for backend in self.backends]
@@ -0,0 +1,216 @@
+"""
+AutonomesAI v2.1 - Context Window Manager
+Fits conversation history into the model's context window and prompt budget
+
+System messages are pinned, the most recent turns are kept verbatim and
+older turns are replaced by a running summary. Summaries are built
+incrementally in the background (previous summary + newly dropped turns)
+and cached by history prefix, so a turn never waits on one and no summary
+is computed twice.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from telemetry.otel_config import get_meter
+from .token_accounting import TokenCounter, token_counter, MESSAGE_OVERHEAD_TOKENS
+
+logger = logging.getLogger(__name__)
+meter = get_meter(__name__)
+
+dropped_turns_counter = meter.create_counter(
+    "autonomes.context.dropped_messages",
+    unit="{message}",
+    description="History messages left out of the prompt, by handling (summarized/dropped)"
+)
+summaries_counter = meter.create_counter(
+    "autonomes.context.summaries",
+    unit="{summary}",
+    description="Background history summaries, by result (ok/error)"
+)
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+# (model, previous summary or "", turns to fold in) -> new summary
+Summarizer = Callable[[str, str, List[Dict[str, Any]]], Awaitable[str]]
+
+
+@dataclass
+class FittedContext:
+    """Messages to send plus what was left out to make them fit"""
+    messages: List[Dict[str, Any]]
+    prompt_tokens: int  # estimate
+    limit: int
+    summarized: int = 0  # older messages represented by the summary
+    dropped: int = 0  # older messages not represented at all (yet)
+
+
+class ContextWindowManager:
+    """
+    Token-budget-aware history trimming.
+
+    The prompt limit is the model's context window (OLLAMA_CONTEXT_WINDOW,
+    per-model OLLAMA_CONTEXT_WINDOWS=`model=tokens,...`) minus the tokens
+    reserved for the response, further capped by a prompt's
+    `metadata.token_budget` when one applies.
+    """
+
+    def __init__(
+        self,
+        counter: TokenCounter = token_counter,
+        context_window: int = 4096,
+        model_windows: Optional[Dict[str, int]] = None,
+        summary_tokens: int = 256,
+        summary_batch: int = 4,
+        max_summaries: int = 1024,
+        summarizer: Optional[Summarizer] = None
+    ):
+        self.counter = counter
+        self.context_window = context_window
+        self.model_windows = model_windows or {}
+        self.summary_tokens = summary_tokens
+        self.summary_batch = summary_batch
+        self.max_summaries = max_summaries
+        self.summarizer = summarizer
+
+        # history-prefix digest -> summary of that prefix
+        self._summaries: "OrderedDict[str, str]" = OrderedDict()
+        self._pending: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @classmethod
+    def from_env(cls, summarizer: Optional[Summarizer] = None) -> "ContextWindowManager":
+        model_windows = {}
+        for item in filter(None, (part.strip() for part in os.getenv("OLLAMA_CONTEXT_WINDOWS", "").split(","))):
+            model, _, tokens = item.partition("=")
+            model_windows[model.strip()] = int(tokens)
+        return cls(
+            context_window=int(os.getenv("OLLAMA_CONTEXT_WINDOW", "4096")),
+            model_windows=model_windows,
+            summary_tokens=int(os.getenv("OLLAMA_CONTEXT_SUMMARY_TOKENS", "256")),
+            summary_batch=int(os.getenv("OLLAMA_CONTEXT_SUMMARY_BATCH", "4")),
+            summarizer=summarizer if os.getenv("OLLAMA_CONTEXT_SUMMARIES", "true").lower() in ("1", "true", "yes") else None
+        )
+
+    def prompt_limit(self, model: str, max_tokens: int = 0, budget: Optional[int] = None) -> int:
+        """Prompt tokens available for `model` after reserving `max_tokens` for output"""
+        limit = self.model_windows.get(model, self.context_window) - max_tokens
+        if budget is not None:
+            limit = min(limit, budget)
+        return max(limit, 0)
+
+    def _message_tokens(self, model: str, message: Dict[str, Any]) -> int:
+        return self.counter.count(model, message.get("content") or "") + MESSAGE_OVERHEAD_TOKENS
+
+    @staticmethod
+    def _prefix_digests(messages: List[Dict[str, Any]]) -> List[str]:
+        """digests[i] identifies messages[:i] (chained, one hash per message)"""
+        digests = [""]
+        for message in messages:
+            digest = hashlib.sha256()
+            digest.update(digests[-1].encode("utf-8"))
+            digest.update(f"{message.get('role')}\0{message.get('content')}".encode("utf-8"))
+            digests.append(digest.hexdigest())
+        return digests
+
+    def fit(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: int = 0,
+        budget: Optional[int] = None
+    ) -> FittedContext:
+        """
+        Messages that fit the prompt limit: leading system messages, the
+        summary of older turns (when cached) and as many recent turns as fit.
+        The latest message is always kept.
+        """
+        limit = self.prompt_limit(model, max_tokens, budget)
+        pinned_count = 0
+        while pinned_count < len(messages) and messages[pinned_count].get("role") == "system":
+            pinned_count += 1
+        pinned, turns = messages[:pinned_count], messages[pinned_count:]
+
+        sizes = [self._message_tokens(model, message) for message in turns]
+        used = sum(self._message_tokens(model, message) for message in pinned)
+        if used + sum(sizes) <= limit:
+            return FittedContext(list(messages), used + sum(sizes), limit)
+
+        # Keep recent turns, leaving room for the summary of the rest
+        available = limit - used - self.summary_tokens - MESSAGE_OVERHEAD_TOKENS
+        cut = len(turns)
+        kept = 0
+        while cut > 0 and (cut == len(turns) or kept + sizes[cut - 1] <= available):
+            cut -= 1
+            kept += sizes[cut]
+        older = turns[:cut]
+
+        digests = self._prefix_digests(older)
+        summarized = 0
+        summary = None
+        for end in range(cut, 0, -1):
+            summary = self._summaries.get(digests[end])
+            if summary is not None:
+                self._summaries.move_to_end(digests[end])
+                summarized = end
+                break
+
+        # Fold dropped turns in batches: one summary call per few turns, not per turn
+        if cut - summarized >= (self.summary_batch if summary is not None else 1):
+            self._schedule_summary(model, digests[cut], summary or "", older[summarized:])
+
+        fitted = list(pinned)
+        if summary is not None:
+            summary_message = {"role": "system", "content": SUMMARY_PREFIX + summary}
+            fitted.append(summary_message)
+            used += self._message_tokens(model, summary_message)
+        fitted.extend(turns[cut:])
+
+        if summarized:
+            dropped_turns_counter.add(summarized, {"context.handling": "summarized"})
+        if cut - summarized:
+            dropped_turns_counter.add(cut - summarized, {"context.handling": "dropped"})
+        return FittedContext(fitted, used + kept, limit, summarized=summarized, dropped=cut - summarized)
+
+    def _schedule_summary(
+        self,
+        model: str,
+        digest: str,
+        previous: str,
+        turns: List[Dict[str, Any]]
+    ) -> None:
+        if self.summarizer is None or digest in self._pending:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # sync caller; the next async fit will summarize
+        self._pending.add(digest)
+        task = loop.create_task(self._summarize(model, digest, previous, turns))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _summarize(self, model: str, digest: str, previous: str, turns: List[Dict[str, Any]]) -> None:
+        try:
+            summary = await self.summarizer(model, previous, turns)
+            self._summaries[digest] = summary.strip()
+            if len(self._summaries) > self.max_summaries:
+                self._summaries.popitem(last=False)
+            summaries_counter.add(1, {"result": "ok"})
+        except Exception as e:
+            summaries_counter.add(1, {"result": "error"})
+            logger.warning(f"⚠️ History summary failed for {model}: {e}")
+        finally:
+            self._pending.discard(digest)
+
+    async def close(self) -> None:
+        """Cancel in-flight background summaries"""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
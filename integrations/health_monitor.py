@@ -0,0 +1,206 @@
+"""
+AutonomesAI v2.1 - Ollama Health Monitor
+Background health probing with a cached state and circuit breaker
+
+Hot paths consult the in-memory breaker instead of probing Ollama per call.
+"""
+
+import asyncio
+import logging
+import time
+from enum import Enum
+from typing import Awaitable, Callable, Dict, Any, Optional
+
+from telemetry.otel_config import get_tracer
+
+logger = logging.getLogger(__name__)
+tracer = get_tracer(__name__)
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"        # Requests flow normally
+    OPEN = "open"            # Upstream considered down, fail fast
+    HALF_OPEN = "half_open"  # Probing whether upstream recovered
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised when a request is rejected because the circuit is open"""
+
+
+class OllamaHealthMonitor:
+    """
+    Cached Ollama health state with circuit-breaker semantics.
+
+    - CLOSED -> OPEN after `failure_threshold` consecutive failures
+    - OPEN -> HALF_OPEN once `reset_timeout` seconds have passed
+    - HALF_OPEN lets a single trial through; success closes, failure re-opens
+
+    Failures and successes come from the background probe and from real
+    requests (passive checks), so a healthy hot path never probes.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], Awaitable[bool]],
+        interval: float = 10.0,
+        ttl: float = 30.0,
+        failure_threshold: int = 3,
+        reset_timeout: float = 15.0
+    ):
+        self.probe = probe
+        self.interval = interval
+        self.ttl = ttl
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._healthy: Optional[bool] = None
+        self._checked_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def state(self) -> CircuitState:
+        """Current breaker state (OPEN turns HALF_OPEN after the reset timeout)"""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    @property
+    def is_stale(self) -> bool:
+        """True when the cached health result is older than the TTL"""
+        return self._healthy is None or time.monotonic() - self._checked_at > self.ttl
+
+    def is_healthy(self) -> bool:
+        """In-memory health flag; never performs I/O"""
+        return self.state != CircuitState.OPEN and self._healthy is not False
+
+    def allow_request(self) -> bool:
+        """Decide whether a request may go upstream right now"""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            if self.is_stale and not self.running:
+                self._schedule_refresh()
+            return True
+        if state == CircuitState.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker will allow a trial request"""
+        if self._state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self) -> None:
+        """Record a successful upstream interaction"""
+        self._consecutive_failures = 0
+        self._trial_in_flight = False
+        self._healthy = True
+        self._checked_at = time.monotonic()
+        if self._state != CircuitState.CLOSED:
+            self._transition(CircuitState.CLOSED)
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        """Record a failed upstream interaction"""
+        self._consecutive_failures += 1
+        self._trial_in_flight = False
+        self._healthy = False
+        self._checked_at = time.monotonic()
+
+        state = self.state
+        if state == CircuitState.HALF_OPEN or (
+            state == CircuitState.CLOSED
+            and self._consecutive_failures >= self.failure_threshold
+        ):
+            self._opened_at = time.monotonic()
+            self._transition(CircuitState.OPEN)
+            if error is not None:
+                logger.warning(f"⚠️ Ollama circuit opened: {error}")
+
+    def release_trial(self) -> None:
+        """Free the half-open trial slot when a trial ended without an outcome"""
+        self._trial_in_flight = False
+
+    def _transition(self, new_state: CircuitState) -> None:
+        if new_state != self._state:
+            logger.info(f"🔌 Ollama circuit {self._state.value} -> {new_state.value}")
+            self._state = new_state
+
+    async def refresh(self) -> bool:
+        """Run one probe and update the cached state"""
+        with tracer.start_as_current_span("ollama_health_probe") as span:
+            try:
+                healthy = await self.probe()
+            except Exception as e:
+                healthy = False
+                span.add_event("probe_error", {"error": str(e)})
+
+            if healthy:
+                self.record_success()
+            else:
+                self.record_failure()
+
+            span.set_attribute("ollama.circuit.state", self._state.value)
+            return healthy
+
+    def _schedule_refresh(self) -> None:
+        """Revalidate a stale cache in the background without blocking callers"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        try:
+            self._refresh_task = asyncio.get_running_loop().create_task(self.refresh())
+        except RuntimeError:
+            pass  # No running loop - the next async caller will refresh
+
+    @property
+    def running(self) -> bool:
+        """Whether the background probe loop is active"""
+        return self._task is not None and not self._task.done()
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh()
+            # Probe again as soon as the breaker is ready for a trial
+            delay = self.interval
+            if self._state == CircuitState.OPEN:
+                delay = min(self.interval, max(self.retry_after(), 0.1))
+            await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        """Start the background probe loop on the running event loop"""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"🩺 Ollama health monitor started (interval {self.interval}s)")
+
+    async def stop(self) -> None:
+        """Stop the background probe loop"""
+        for task in (self._task, self._refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._refresh_task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serializable view of the cached health state"""
+        age = time.monotonic() - self._checked_at if self._healthy is not None else None
+        return {
+            "healthy": self.is_healthy(),
+            "circuit_state": self.state.value,
+            "consecutive_failures": self._consecutive_failures,
+            "last_check_age_seconds": round(age, 3) if age is not None else None,
+            "stale": self.is_stale,
+            "retry_after_seconds": round(self.retry_after(), 3)
+        }
@@ -0,0 +1,151 @@
+"""
+AutonomesAI v2.1 - Ollama HTTP Pool Configuration
+Connector sizing, keep-alive, DNS caching and per-operation timeouts
+
+Everything is configurable via env vars so the client can be sized for the
+deployment's real concurrency.
+"""
+
+import logging
+import os
+import weakref
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+import aiohttp
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from telemetry.otel_config import get_meter
+
+logger = logging.getLogger(__name__)
+meter = get_meter(__name__)
+
+
+def _env_float(name: str, default: Optional[float]) -> Optional[float]:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return None if value.lower() == "none" else float(value)
+
+
+def parse_base_urls(value: str) -> List[str]:
+    """Split a comma-separated list of Ollama base URLs"""
+    return [url.strip().rstrip("/") for url in value.split(",") if url.strip()]
+
+
+@dataclass
+class PoolConfig:
+    """aiohttp TCPConnector settings"""
+    limit: int = 100               # Total connections across all backends
+    limit_per_host: int = 16       # Connections per Ollama backend
+    keepalive_timeout: float = 60.0
+    ttl_dns_cache: int = 300       # Seconds; 0 disables DNS caching
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        return cls(
+            limit=int(os.getenv("OLLAMA_POOL_LIMIT", "100")),
+            limit_per_host=int(os.getenv("OLLAMA_POOL_LIMIT_PER_HOST", "16")),
+            keepalive_timeout=float(os.getenv("OLLAMA_KEEPALIVE_TIMEOUT", "60")),
+            ttl_dns_cache=int(os.getenv("OLLAMA_DNS_CACHE_TTL", "300"))
+        )
+
+    def create_connector(self) -> aiohttp.TCPConnector:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=self.ttl_dns_cache > 0,
+            ttl_dns_cache=self.ttl_dns_cache or None,
+            enable_cleanup_closed=True
+        )
+        _connectors.add(connector)
+        return connector
+
+
+@dataclass
+class OperationTimeouts:
+    """
+    Separate timeouts per operation type: metadata (/api/tags, /api/version,
+    /api/ps), non-streaming generate/chat, streaming, and model pulls.
+
+    `sock_read` bounds the gap between chunks, so a long generation is fine
+    as long as Ollama keeps producing tokens, while a stalled one fails fast.
+    """
+    metadata: aiohttp.ClientTimeout
+    generate: aiohttp.ClientTimeout
+    stream: aiohttp.ClientTimeout
+    pull: aiohttp.ClientTimeout
+
+    @classmethod
+    def from_env(cls, generate_total: float = 300) -> "OperationTimeouts":
+        connect = _env_float("OLLAMA_CONNECT_TIMEOUT", 5.0)
+        read = _env_float("OLLAMA_READ_TIMEOUT", 120.0)
+        return cls(
+            metadata=aiohttp.ClientTimeout(
+                total=_env_float("OLLAMA_METADATA_TIMEOUT", 10.0),
+                sock_connect=connect
+            ),
+            generate=aiohttp.ClientTimeout(
+                total=_env_float("OLLAMA_GENERATE_TIMEOUT", generate_total),
+                sock_connect=connect,
+                sock_read=read
+            ),
+            stream=aiohttp.ClientTimeout(
+                total=_env_float("OLLAMA_STREAM_TIMEOUT", None),
+                sock_connect=connect,
+                sock_read=read
+            ),
+            pull=aiohttp.ClientTimeout(
+                total=_env_float("OLLAMA_PULL_TIMEOUT", None),
+                sock_connect=connect,
+                sock_read=_env_float("OLLAMA_PULL_READ_TIMEOUT", 300.0)
+            )
+        )
+
+
+# -- pool utilization metrics ----------------------------------------------
+
+_connectors: "weakref.WeakSet[aiohttp.TCPConnector]" = weakref.WeakSet()
+
+
+def _host_attributes(key) -> dict:
+    return {"server.address": getattr(key, "host", "unknown"), "server.port": getattr(key, "port", 0) or 0}
+
+
+def _observe_in_use(options: CallbackOptions) -> Iterable[Observation]:
+    for connector in list(_connectors):
+        # aiohttp keeps per-host acquired connections in a private mapping
+        for key, acquired in getattr(connector, "_acquired_per_host", {}).items():
+            yield Observation(len(acquired), _host_attributes(key))
+
+
+def _observe_idle(options: CallbackOptions) -> Iterable[Observation]:
+    for connector in list(_connectors):
+        for key, idle in getattr(connector, "_conns", {}).items():
+            yield Observation(len(idle), _host_attributes(key))
+
+
+def _observe_limit(options: CallbackOptions) -> Iterable[Observation]:
+    for connector in list(_connectors):
+        yield Observation(connector.limit_per_host or connector.limit, {})
+
+
+meter.create_observable_gauge(
+    "autonomes.http.pool.in_use",
+    callbacks=[_observe_in_use],
+    unit="{connection}",
+    description="Ollama HTTP connections currently in use, per backend"
+)
+meter.create_observable_gauge(
+    "autonomes.http.pool.idle",
+    callbacks=[_observe_idle],
+    unit="{connection}",
+    description="Idle keep-alive connections available for reuse, per backend"
+)
+meter.create_observable_gauge(
+    "autonomes.http.pool.limit",
+    callbacks=[_observe_limit],
+    unit="{connection}",
+    description="Per-backend connection limit"
+)
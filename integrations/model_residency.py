@@ -0,0 +1,266 @@
+"""
+AutonomesAI v2.1 - Model Residency Manager
+Preloading, keep-alive hints and warm/evict decisions for Ollama models
+
+A cold model costs seconds of load time on its first request; this keeps
+the models the traffic actually uses resident and lets idle ones go.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence
+from urllib.parse import urljoin
+
+import aiohttp
+
+from telemetry.otel_config import get_meter, get_tracer
+from .backend_pool import Backend, BackendPool, normalize_model_name
+
+logger = logging.getLogger(__name__)
+tracer = get_tracer(__name__)
+meter = get_meter(__name__)
+
+cold_start_counter = meter.create_counter(
+    "autonomes.ollama.cold_starts",
+    unit="{request}",
+    description="Requests that had to wait for Ollama to load the model"
+)
+load_time_histogram = meter.create_histogram(
+    "autonomes.ollama.model_load_time",
+    unit="s",
+    description="Ollama model load latency, by reason (request/preload/warm)"
+)
+
+
+class ModelResidencyManager:
+    """
+    Decides which models should stay loaded in Ollama.
+
+    - `preload` models are loaded at startup and never evicted
+    - every upstream request carries a `keep_alive` hint; models requested at
+      least `hot_threshold` times within `window` seconds get `hot_keep_alive`
+    - a background loop warms hot models that are not resident anywhere and,
+      with `max_resident` set, unloads the least-requested ones per node
+
+    Residency (`Backend.loaded`) comes from the /api/ps refresh done by the
+    health probe, so the loop itself only issues load/unload calls.
+    """
+
+    def __init__(
+        self,
+        backends: BackendPool,
+        preload: Sequence[str] = (),
+        keep_alive: str = "5m",
+        hot_keep_alive: str = "1h",
+        hot_threshold: int = 3,
+        window: float = 600.0,
+        max_resident: int = 0,
+        interval: float = 60.0,
+        cold_start_threshold: float = 0.5
+    ):
+        self.backends = backends
+        self.preload = [normalize_model_name(model) for model in preload]
+        self.keep_alive = keep_alive
+        self.hot_keep_alive = hot_keep_alive
+        self.hot_threshold = hot_threshold
+        self.window = window
+        self.max_resident = max_resident  # Per node; 0 leaves eviction to Ollama
+        self.interval = interval
+        self.cold_start_threshold = cold_start_threshold
+
+        self._requests: Dict[str, Deque[float]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, backends: BackendPool) -> "ModelResidencyManager":
+        return cls(
+            backends,
+            preload=[m.strip() for m in os.getenv("OLLAMA_PRELOAD_MODELS", "").split(",") if m.strip()],
+            keep_alive=os.getenv("OLLAMA_KEEP_ALIVE", "5m"),
+            hot_keep_alive=os.getenv("OLLAMA_HOT_KEEP_ALIVE", "1h"),
+            hot_threshold=int(os.getenv("OLLAMA_HOT_THRESHOLD", "3")),
+            window=float(os.getenv("OLLAMA_RESIDENCY_WINDOW", "600")),
+            max_resident=int(os.getenv("OLLAMA_MAX_RESIDENT_MODELS", "0")),
+            interval=float(os.getenv("OLLAMA_RESIDENCY_INTERVAL", "60")),
+            cold_start_threshold=float(os.getenv("OLLAMA_COLD_START_THRESHOLD", "0.5"))
+        )
+
+    # -- request mix -------------------------------------------------------
+
+    def record_request(self, model: str) -> None:
+        """Count an upstream request towards the recent request mix"""
+        self._requests.setdefault(normalize_model_name(model), deque()).append(time.monotonic())
+
+    def request_mix(self) -> Dict[str, int]:
+        """Requests per model within the window"""
+        cutoff = time.monotonic() - self.window
+        mix = {}
+        for model, times in list(self._requests.items()):
+            while times and times[0] < cutoff:
+                times.popleft()
+            if times:
+                mix[model] = len(times)
+            else:
+                del self._requests[model]
+        return mix
+
+    def hot_models(self) -> List[str]:
+        """Models at or above the hot threshold, most requested first"""
+        mix = self.request_mix()
+        hot = [model for model, count in mix.items() if count >= self.hot_threshold]
+        return sorted(hot, key=lambda model: -mix[model])
+
+    def keep_alive_for(self, model: str) -> str:
+        """keep_alive hint to send with a request for `model`"""
+        model = normalize_model_name(model)
+        times = self._requests.get(model)
+        recent = 0 if times is None else sum(1 for t in times if t >= time.monotonic() - self.window)
+        if model in self.preload or recent >= self.hot_threshold:
+            return self.hot_keep_alive
+        return self.keep_alive
+
+    def observe_response(self, model: str, response: Dict[str, Any]) -> None:
+        """Detect cold starts from Ollama's load_duration"""
+        load_duration = response.get("load_duration")
+        if not load_duration:
+            return
+        seconds = load_duration / 1e9
+        if seconds >= self.cold_start_threshold:
+            cold_start_counter.add(1, {"gen_ai.request.model": model})
+            load_time_histogram.record(seconds, {"gen_ai.request.model": model, "ollama.load.reason": "request"})
+            logger.info(f"🧊 Cold start for {model}: loaded in {seconds:.2f}s")
+
+    # -- load / unload -----------------------------------------------------
+
+    async def _keep_alive_request(
+        self,
+        session: aiohttp.ClientSession,
+        backend: Backend,
+        model: str,
+        keep_alive: Any,
+        timeout: aiohttp.ClientTimeout
+    ) -> None:
+        # An empty generate request only (un)loads the model
+        url = urljoin(backend.url, "/api/generate")
+        async with session.post(url, json={"model": model, "keep_alive": keep_alive}, timeout=timeout) as response:
+            response.raise_for_status()
+            await response.read()
+
+    async def load(
+        self,
+        session: aiohttp.ClientSession,
+        model: str,
+        timeout: aiohttp.ClientTimeout,
+        reason: str = "warm"
+    ) -> Optional[Backend]:
+        """Load `model` on the best node; returns that node, or None on failure"""
+        model = normalize_model_name(model)
+        backend = self.backends.choose(model)
+        if model in backend.loaded:
+            return backend
+
+        with tracer.start_as_current_span("ollama_model_load") as span:
+            span.set_attribute("gen_ai.request.model", model)
+            span.set_attribute("ollama.backend.url", backend.url)
+            span.set_attribute("ollama.load.reason", reason)
+            started = time.monotonic()
+            try:
+                await self._keep_alive_request(session, backend, model, self.keep_alive_for(model), timeout)
+            except Exception as e:
+                span.add_event("load_failed", {"error": str(e)})
+                logger.warning(f"⚠️ Failed to load {model} on {backend.url}: {e}")
+                return None
+
+            seconds = time.monotonic() - started
+            backend.loaded.add(model)
+            load_time_histogram.record(seconds, {"gen_ai.request.model": model, "ollama.load.reason": reason})
+            logger.info(f"🔥 Loaded {model} on {backend.url} in {seconds:.2f}s ({reason})")
+            return backend
+
+    async def unload(
+        self,
+        session: aiohttp.ClientSession,
+        backend: Backend,
+        model: str,
+        timeout: aiohttp.ClientTimeout
+    ) -> bool:
+        try:
+            await self._keep_alive_request(session, backend, model, 0, timeout)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to unload {model} from {backend.url}: {e}")
+            return False
+        backend.loaded.discard(model)
+        logger.info(f"💤 Unloaded idle model {model} from {backend.url}")
+        return True
+
+    async def preload_all(self, session: aiohttp.ClientSession, timeout: aiohttp.ClientTimeout) -> None:
+        """Load every configured preload model (concurrently)"""
+        if self.preload:
+            await asyncio.gather(*(self.load(session, model, timeout, "preload") for model in self.preload))
+
+    async def rebalance(self, session: aiohttp.ClientSession, timeout: aiohttp.ClientTimeout) -> None:
+        """Warm hot models that are not resident; evict cold ones over the limit"""
+        hot = self.hot_models()
+        if self.max_resident:
+            hot = hot[:self.max_resident]
+
+        for model in hot:
+            if not any(model in backend.loaded for backend in self.backends.backends):
+                await self.load(session, model, timeout, "warm")
+
+        if not self.max_resident:
+            return
+
+        mix = self.request_mix()
+        protected = set(self.preload) | set(hot)
+        for backend in self.backends.backends:
+            excess = len(backend.loaded) - self.max_resident
+            if excess <= 0:
+                continue
+            candidates = sorted(
+                (model for model in backend.loaded if model not in protected),
+                key=lambda model: mix.get(model, 0)
+            )
+            for model in candidates[:excess]:
+                await self.unload(session, backend, model, timeout)
+
+    # -- background loop ---------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _run(self, session: aiohttp.ClientSession, timeout: aiohttp.ClientTimeout) -> None:
+        await self.preload_all(session, timeout)
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.rebalance(session, timeout)
+            except Exception as e:
+                logger.warning(f"⚠️ Model residency rebalance failed: {e}")
+
+    def start(self, session: aiohttp.ClientSession, timeout: aiohttp.ClientTimeout) -> None:
+        """Preload in the background, then rebalance every `interval` seconds"""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run(session, timeout))
+            logger.info(f"🔥 Model residency manager started (preload: {', '.join(self.preload) or 'none'})")
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "preload": self.preload,
+            "hot": self.hot_models(),
+            "request_mix": self.request_mix(),
+            "resident": {backend.url: sorted(backend.loaded) for backend in self.backends.backends}
+        }
@@ -9,7 +9,8 @@ import aiohttp
 import asyncio
 import logging
 import json
-from typing import Dict, Any, List, Optional, AsyncGenerator
+import time
+from typing import Dict, Any, List, Optional, Tuple, AsyncGenerator, AsyncIterator
 from urllib.parse import urljoin
 import os
 
@@ -17,12 +18,35 @@ import os
 OLLAMA_HEALTH_STATUS_KEY = "ollama.health.status"
 OLLAMA_UNAVAILABLE_MESSAGE = "Ollama service is not available"
 
-from telemetry.otel_config import get_tracer, create_gen_ai_span, otel_config
+from telemetry.otel_config import get_tracer, create_gen_ai_span, iterate_in_span, otel_config
+from telemetry.gen_ai_metrics import upstream_duration
+from .health_monitor import OllamaHealthMonitor, CircuitOpenError
+from .response_cache import ResponseCache
+from .single_flight import SingleFlight
+from .scheduler import RequestScheduler, Priority, scheduling
+from .http_pool import PoolConfig, OperationTimeouts, parse_base_urls
+from .backend_pool import Backend, BackendPool
+from .token_accounting import usage_from_response, record_usage
+from .model_residency import ModelResidencyManager
+from .prefix_cache import PrefixCache
+from .context_window import ContextWindowManager
+from prompt_registry import prompt_registry
 
 logger = logging.getLogger(__name__)
 tracer = get_tracer(__name__)
 
 
+def _is_upstream_failure(error: BaseException) -> bool:
+    """
+    Connection errors, timeouts, truncated bodies and 5xx count against the
+    circuit breaker (and trigger failover); local errors such as a bad URL,
+    an undecodable body or cancellation do not.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500
+    return isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError))
+
+
 class OllamaClient:
     """
     Async client for Ollama local LLM operations
@@ -33,28 +57,73 @@ class OllamaClient:
         self,
         base_url: str = None,
         timeout: int = 300,  # 5 minutes for model operations
-        max_retries: int = 3
+        max_retries: int = 3,
+        response_cache: Optional[ResponseCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        pool_config: Optional[PoolConfig] = None,
+        timeouts: Optional[OperationTimeouts] = None,
+        backends: Optional[BackendPool] = None,
+        residency: Optional[ModelResidencyManager] = None,
+        prefix_cache: Optional[PrefixCache] = None,
+        context_window: Optional[ContextWindowManager] = None
     ):
-        self.base_url = base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        # OLLAMA_BASE_URLS (comma-separated) takes precedence for multi-node setups
+        self.base_urls = parse_base_urls(
+            base_url
+            or os.getenv("OLLAMA_BASE_URLS")
+            or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        )
+        self.base_url = self.base_urls[0]
+        self.backends = backends or BackendPool.from_env(self.base_urls)
+        self.residency = residency or ModelResidencyManager.from_env(self.backends)
+        self.pool_config = pool_config or PoolConfig.from_env()
+        self.timeouts = timeouts or OperationTimeouts.from_env(generate_total=timeout)
+        self.timeout = self.timeouts.generate
         self.max_retries = max_retries
         self.session: Optional[aiohttp.ClientSession] = None
         self._initialized = False
+        self.response_cache = response_cache if response_cache is not None else ResponseCache.from_env()
+        self.prefix_cache = prefix_cache if prefix_cache is not None else PrefixCache.from_env()
+        self.context_window = context_window or ContextWindowManager.from_env(summarizer=self._summarize_history)
+        if single_flight is None and os.getenv("OLLAMA_SINGLE_FLIGHT", "true").lower() in ("1", "true", "yes"):
+            single_flight = SingleFlight()
+        self.single_flight = single_flight
+        self.scheduler = scheduler or RequestScheduler.from_env()
+        self.health_monitor = OllamaHealthMonitor(
+            self._probe,
+            interval=float(os.getenv("OLLAMA_HEALTH_INTERVAL", "10")),
+            ttl=float(os.getenv("OLLAMA_HEALTH_TTL", "30")),
+            failure_threshold=int(os.getenv("OLLAMA_CIRCUIT_FAILURE_THRESHOLD", "3")),
+            reset_timeout=float(os.getenv("OLLAMA_CIRCUIT_RESET_TIMEOUT", "15"))
+        )
         
-        logger.info(f"🦙 Ollama client initialized with base URL: {self.base_url}")
+        logger.info(f"🦙 Ollama client initialized with base URLs: {', '.join(self.base_urls)}")
     
     async def initialize(self) -> None:
         """Initialize the HTTP session"""
         if not self._initialized:
             self.session = aiohttp.ClientSession(
+                connector=self.pool_config.create_connector(),
                 timeout=self.timeout,
                 headers={"Content-Type": "application/json"}
             )
             self._initialized = True
             logger.info("✅ Ollama HTTP session initialized")
     
+    async def start_health_monitor(self) -> None:
+        """Initialize the session, start health probing and model preloading"""
+        await self.initialize()
+        self.health_monitor.start()
+        self.residency.start(self.session, self.timeouts.generate)
+    
     async def close(self) -> None:
         """Close the HTTP session"""
+        await self.context_window.close()
+        await self.residency.stop()
+        await self.health_monitor.stop()
+        if self.response_cache is not None:
+            self.response_cache.close()
         if self.session:
             await self.session.close()
             self._initialized = False
@@ -65,29 +134,126 @@ class OllamaClient:
         return self._initialized and self.session is not None
     
     async def health_check(self) -> bool:
-        """Check if Ollama service is healthy"""
+        """Actively probe Ollama and update the cached health state"""
+        return await self.health_monitor.refresh()
+    
+    def is_healthy(self) -> bool:
+        """Cached health state; never performs I/O"""
+        return self.health_monitor.is_healthy()
+    
+    async def _ensure_available(self) -> None:
+        """Fail fast from the cached circuit state instead of probing Ollama"""
+        if not self.is_ready():
+            await self.initialize()
+        if not self.health_monitor.allow_request():
+            raise CircuitOpenError(
+                f"{OLLAMA_UNAVAILABLE_MESSAGE} (circuit {self.health_monitor.state.value})"
+            )
+    
+    def _record_outcome(self, error: Optional[BaseException] = None) -> None:
+        """Feed the result of a real request into the circuit breaker"""
+        if isinstance(error, CircuitOpenError):
+            return
+        if error is None or (isinstance(error, aiohttp.ClientResponseError) and error.status < 500):
+            # Ollama answered (possibly with a 4xx), so it is reachable
+            self.health_monitor.record_success()
+        elif _is_upstream_failure(error):
+            self.health_monitor.record_failure(error)
+        else:
+            # Local error (queue rejection, bad arguments, decode error,
+            # cancellation) - no health signal, just free the trial slot
+            self.health_monitor.release_trial()
+    
+    def _cache_key(
+        self,
+        endpoint: str,
+        model: str,
+        options: Dict[str, Any],
+        use_cache: Optional[bool],
+        **request: Any
+    ) -> Optional[str]:
+        """
+        Response-cache key, or None when the request must not be cached.
+        By default only temperature=0 requests are cached; `use_cache`
+        forces the decision either way.
+        """
+        if self.response_cache is None or use_cache is False:
+            return None
+        if use_cache is None and options.get("temperature") != 0:
+            return None
+        
+        # Key on the model digest so a re-pulled model never serves stale output.
+        # Digests come from the background /api/tags refresh (health probe,
+        # status snapshots); until a model is listed it is keyed by name.
+        digest = self.backends.digest(model)
+        return ResponseCache.make_key(
+            endpoint=endpoint,
+            model=f"digest:{digest}" if digest else f"name:{model}",
+            options=options,
+            **request
+        )
+    
+    async def _cached_response(self, span: Any, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Look up a cached response and record the outcome on the span"""
+        if cache_key is None:
+            return None
+        cached = await self.response_cache.get(cache_key)
+        otel_config.add_cache_attributes(span, self.response_cache.name, cached is not None, cache_key)
+        return cached
+    
+    def _fit_messages(
+        self,
+        span: Any,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        budget: Optional[int] = None
+    ) -> List[Dict[str, str]]:
+        """Trim history to the model's context window / prompt budget (see ContextWindowManager)"""
+        fitted = self.context_window.fit(model, messages, max_tokens, budget)
+        if fitted.summarized or fitted.dropped:
+            span.set_attributes({
+                "autonomes.context.prompt_tokens": fitted.prompt_tokens,
+                "autonomes.context.limit": fitted.limit,
+                "autonomes.context.summarized_messages": fitted.summarized,
+                "autonomes.context.dropped_messages": fitted.dropped
+            })
+        return fitted.messages
+    
+    async def _summarize_history(self, model: str, previous: str, turns: List[Dict[str, Any]]) -> str:
+        """Fold `turns` into the running summary (background priority, deterministic)"""
+        transcript = "\n".join(f"{turn.get('role')}: {turn.get('content')}" for turn in turns)
+        prompt = prompt_registry.render(
+            "conversation_summary",
+            previous_summary=previous or "(none)",
+            turns=transcript
+        )
+        with scheduling(Priority.BACKGROUND, "context_summary"):
+            result = await self.generate(
+                model,
+                prompt,
+                temperature=0,
+                max_tokens=self.context_window.summary_tokens
+            )
+        return result.get("response", "")
+    
+    async def _probe(self) -> bool:
+        """
+        Refresh every backend's loaded models (/api/ps, plus /api/tags on a
+        slower cadence); healthy when at least one node answers.
+        """
         with tracer.start_as_current_span("ollama_health_check") as span:
             try:
                 if not self.is_ready():
                     await self.initialize()
                 
-                url = urljoin(self.base_url, "/api/tags")
-                
-                async with self.session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        models_count = len(data.get("models", []))
-                        
-                        span.set_attribute(OLLAMA_HEALTH_STATUS_KEY, "healthy")
-                        span.set_attribute("ollama.models.count", models_count)
-                        
-                        logger.info(f"✅ Ollama is healthy with {models_count} models available")
-                        return True
-                    else:
-                        span.set_attribute(OLLAMA_HEALTH_STATUS_KEY, "unhealthy")
-                        span.set_attribute("ollama.health.status_code", response.status)
-                        logger.warning(f"⚠️ Ollama health check failed with status {response.status}")
-                        return False
+                healthy = await self.backends.refresh(self.session, self.timeouts.metadata)
+                span.set_attribute(OLLAMA_HEALTH_STATUS_KEY, "healthy" if healthy else "unhealthy")
+                if healthy:
+                    logger.debug("✅ Ollama health probe succeeded")
+                else:
+                    logger.warning("⚠️ Ollama health check failed on every backend")
+                return healthy
                         
             except Exception as e:
                 span.set_attribute(OLLAMA_HEALTH_STATUS_KEY, "error")
@@ -95,34 +261,57 @@ class OllamaClient:
                 logger.error(f"❌ Ollama health check error: {str(e)}")
                 return False
     
+    async def _list_backend_models(self, backend: Backend) -> List[Dict[str, Any]]:
+        url = urljoin(backend.url, "/api/tags")
+        async with self.session.get(url, timeout=self.timeouts.metadata) as response:
+            response.raise_for_status()
+            models = (await response.json()).get("models", [])
+        self.backends.update_models(backend, models)
+        return models
+    
     async def list_models(self) -> List[Dict[str, Any]]:
-        """List all available models"""
+        """List all available models (union across backends, first node wins)"""
         with tracer.start_as_current_span("ollama_list_models") as span:
             try:
-                if not await self.health_check():
-                    raise ConnectionError(OLLAMA_UNAVAILABLE_MESSAGE)
+                await self._ensure_available()
                 
-                url = urljoin(self.base_url, "/api/tags")
+                results = await asyncio.gather(
+                    *(self._list_backend_models(b) for b in self.backends.backends),
+                    return_exceptions=True
+                )
+                errors = [r for r in results if isinstance(r, BaseException)]
+                if len(errors) == len(results):
+                    raise errors[0]
+                self._record_outcome()
                 
-                async with self.session.get(url) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    
-                    models = data.get("models", [])
-                    
-                    span.set_attribute("ollama.models.count", len(models))
-                    span.add_event("models_listed", {"count": len(models)})
-                    
-                    logger.info(f"📦 Found {len(models)} available models")
-                    return models
-                    
+                merged: Dict[str, Dict[str, Any]] = {}
+                for backend_models in results:
+                    if not isinstance(backend_models, BaseException):
+                        for model in backend_models:
+                            merged.setdefault(model.get("name"), model)
+                models = list(merged.values())
+                
+                span.set_attribute("ollama.models.count", len(models))
+                span.add_event("models_listed", {"count": len(models)})
+                
+                logger.info(f"📦 Found {len(models)} available models")
+                return models
+                
+            except asyncio.CancelledError as e:
+                self._record_outcome(e)
+                raise
             except Exception as e:
+                self._record_outcome(e)
                 span.add_event("list_models_error", {"error": str(e)})
                 logger.error(f"❌ Failed to list models: {str(e)}")
                 raise
     
     async def pull_model(self, model_name: str) -> AsyncGenerator[Dict[str, Any], None]:
-        """Pull a model from Ollama registry with streaming progress"""
+        """
+        Pull a model from Ollama registry with streaming progress.
+        Only phase changes become span events; byte progress is left to the
+        caller (see PullJobManager) so long pulls don't bloat the span.
+        """
         with tracer.start_as_current_span("ollama_pull_model") as span:
             span.set_attribute("ollama.model.name", model_name)
             
@@ -130,34 +319,32 @@ class OllamaClient:
                 if not self.is_ready():
                     await self.initialize()
                 
-                url = urljoin(self.base_url, "/api/pull")
+                backend = self.backends.choose()
+                url = urljoin(backend.url, "/api/pull")
                 payload = {"name": model_name}
+                span.set_attribute("ollama.backend.url", backend.url)
                 
                 logger.info(f"📥 Starting to pull model: {model_name}")
                 
-                async with self.session.post(url, json=payload) as response:
+                async with self.session.post(url, json=payload, timeout=self.timeouts.pull) as response:
                     response.raise_for_status()
                     
-                    async for line in response.content:
-                        if line:
-                            try:
-                                data = json.loads(line.decode('utf-8'))
-                                
-                                # Log progress
-                                if "status" in data:
-                                    logger.info(f"📥 {model_name}: {data['status']}")
-                                
-                                span.add_event("pull_progress", data)
-                                yield data
-                                
-                                # Check if completed
-                                if data.get("status") == "success":
-                                    span.set_attribute("ollama.pull.status", "completed")
-                                    logger.info(f"✅ Model {model_name} pulled successfully")
-                                    break
-                                    
-                            except json.JSONDecodeError:
-                                continue
+                    phase = None
+                    async for data in self._iter_ndjson(response):
+                        if data.get("status") != phase:
+                            phase = data.get("status")
+                            logger.info(f"📥 {model_name}: {phase}")
+                            span.add_event("pull_phase", {"status": str(phase)})
+                        
+                        yield data
+                        
+                        # Check if completed
+                        if phase == "success":
+                            span.set_attribute("ollama.pull.status", "completed")
+                            # Pick up the new model on the next /api/tags refresh
+                            backend.tags_refreshed_at = 0.0
+                            logger.info(f"✅ Model {model_name} pulled successfully")
+                            break
                                 
             except Exception as e:
                 span.set_attribute("ollama.pull.status", "failed")
@@ -165,15 +352,122 @@ class OllamaClient:
                 logger.error(f"❌ Failed to pull model {model_name}: {str(e)}")
                 raise
     
+    def _should_failover(self, error: BaseException, tried: List[Backend]) -> bool:
+        """Retry on another node for transport errors/5xx, up to max_retries attempts"""
+        return _is_upstream_failure(error) and len(tried) < min(self.max_retries, len(self.backends))
+    
+    async def _post_to(self, backend: Backend, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """One POST against one backend, tracking its load, latency and health"""
+        async with self.scheduler.slot(payload["model"]):
+            started = time.monotonic()
+            try:
+                with self.backends.track(backend):
+                    url = urljoin(backend.url, path)
+                    body = {**payload, "keep_alive": self.residency.keep_alive_for(payload["model"])}
+                    async with self.session.post(url, json=body, timeout=self.timeouts.generate) as response:
+                        response.raise_for_status()
+                        
+                        if payload.get("stream"):
+                            # Collect the streamed chunks, keeping the final stats chunk
+                            parts = []
+                            final_chunk: Dict[str, Any] = {}
+                            async for data in self._iter_ndjson(response):
+                                parts.append(data.get("response", ""))
+                                if data.get("done", False):
+                                    final_chunk = data
+                                    break
+                            
+                            result = {
+                                **final_chunk,
+                                "response": "".join(parts),
+                                "model": payload["model"],
+                                "done": True
+                            }
+                        else:
+                            result = await response.json()
+            except Exception as e:
+                if _is_upstream_failure(e):
+                    self.backends.record_failure(backend)
+                raise
+            
+            elapsed = time.monotonic() - started
+            backend.observe_latency(elapsed)
+            upstream_duration.record(elapsed, {
+                "gen_ai.request.model": payload["model"],
+                "http.route": path,
+                "server.address": backend.url
+            })
+            self.backends.record_success(backend)
+            self.residency.observe_response(payload["model"], result)
+            return result
+    
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Upstream POST routed to the best backend, failing over to another node
+        on transport errors. Collects NDJSON chunks when `payload["stream"]`
+        is set. Feeds the outcome into the circuit breaker exactly once.
+        """
+        try:
+            await self._ensure_available()
+            self.residency.record_request(payload["model"])
+            
+            tried: List[Backend] = []
+            while True:
+                backend = self.backends.choose(payload["model"], exclude=tried)
+                tried.append(backend)
+                try:
+                    result = await self._post_to(backend, path, payload)
+                    break
+                except Exception as e:
+                    if not self._should_failover(e, tried):
+                        raise
+                    logger.warning(f"⚠️ Ollama backend {backend.url} failed ({e}), failing over")
+            
+            self._record_outcome()
+            return result
+            
+        except (Exception, asyncio.CancelledError) as e:
+            self._record_outcome(e)
+            raise
+    
+    async def _coalesced(
+        self,
+        span: Any,
+        path: str,
+        payload: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """POST via the single-flight layer so identical in-flight requests share one call"""
+        if self.single_flight is None:
+            return await self._post(path, payload)
+        
+        key = ResponseCache.make_key(path=path, **payload)
+        span.set_attribute("autonomes.single_flight.coalesced", self.single_flight.in_flight(key))
+        return await self.single_flight.do(key, lambda: self._post(path, payload))
+    
     async def generate(
         self,
         model: str,
         prompt: str,
         temperature: float = 0.7,
         max_tokens: int = 1000,
-        stream: bool = False
+        stream: bool = False,
+        cache: Optional[bool] = None,
+        system_prompt: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None
     ) -> Dict[str, Any]:
-        """Generate completion using specified model"""
+        """
+        Generate completion using specified model.
+        `cache` overrides the response-cache policy (default: temperature=0 only).
+        
+        `system_prompt` names a prompt from the registry; `history` holds the
+        earlier turns of the conversation (`[]` for its first turn). For a
+        conversation, the context Ollama returns is kept in the prefix cache
+        and passed back on the next turn, so the system prompt and history are
+        not re-evaluated. A history whose context is not cached is replayed
+        once (fitted to the window) to obtain a fresh one. One-shot calls
+        (`history=None`) skip the prefix cache: a context embeds the task and
+        answer, so no other call could reuse it.
+        """
         
         with create_gen_ai_span(
             tracer,
@@ -184,73 +478,96 @@ class OllamaClient:
         ) as span:
             
             try:
-                if not await self.health_check():
-                    raise ConnectionError(OLLAMA_UNAVAILABLE_MESSAGE)
+                options = {
+                    "temperature": temperature,
+                    "num_predict": max_tokens
+                }
+                template = None
+                if system_prompt is not None:
+                    template = prompt_registry.get(system_prompt)
+                    if template is None:
+                        raise ValueError(f"Unknown system prompt '{system_prompt}'")
+                
+                # Only a conversation's next turn can reuse the returned context
+                use_prefix = self.prefix_cache is not None and history is not None
+                scope = (model, system_prompt or "", template.version if template else "")
+                history = history or []
+                context = self.prefix_cache.get(scope, history) if use_prefix else None
+                if use_prefix:
+                    otel_config.add_cache_attributes(span, "ollama_prefix", context is not None)
+                
+                budget = template.token_budget if template else None
+                if context is not None and len(context) + self.context_window.counter.count(model, prompt) > \
+                        self.context_window.prompt_limit(model, max_tokens, budget):
+                    # Outgrew the window: replay the trimmed/summarized history instead
+                    context = None
+                
+                system = template.content if template else None
+                if history and not use_prefix:
+                    messages = [{"role": "system", "content": system}] if system else []
+                    result = await self.chat(model, messages + history + [{"role": "user", "content": prompt}],
+                                             temperature=temperature, max_tokens=max_tokens, cache=cache,
+                                             budget=budget)
+                    result["response"] = result.get("message", {}).get("content", "")
+                    return result
+                
+                request_prompt = prompt
+                if history and context is None:
+                    # No cached context (restart, eviction, outgrown window): replay
+                    # the history once so the following turns are back on the prefix path
+                    system, request_prompt = self._replay_prompt(span, model, system, history, prompt, max_tokens, budget)
+                
+                request_parts = {"system": scope[1:], "history": history} if use_prefix else {}
+                cache_key = self._cache_key("generate", model, options, cache, prompt=prompt, **request_parts)
+                cached = await self._cached_response(span, cache_key)
+                if cached is not None:
+                    logger.info("⚡ Served %s generation from response cache", model)
+                    return cached
                 
-                url = urljoin(self.base_url, "/api/generate")
                 payload = {
                     "model": model,
-                    "prompt": prompt,
+                    "prompt": request_prompt,
                     "stream": stream,
-                    "options": {
-                        "temperature": temperature,
-                        "num_predict": max_tokens
-                    }
+                    "options": options
                 }
+                # A context already holds the system prompt; Ollama would template it in again
+                if system and context is None:
+                    payload["system"] = system
+                if context is not None:
+                    payload["context"] = context
+                    span.set_attribute("ollama.request.context_tokens", len(context))
                 
-                span.set_attribute("ollama.request.prompt_length", len(prompt))
+                span.set_attribute("ollama.request.prompt_length", len(request_prompt))
                 
-                logger.info(f"🤖 Generating completion with {model}")
+                logger.info("🤖 Generating completion with %s", model)
                 
-                async with self.session.post(url, json=payload) as response:
-                    response.raise_for_status()
-                    
-                    if stream:
-                        # Handle streaming response
-                        full_response = ""
-                        async for line in response.content:
-                            if line:
-                                try:
-                                    data = json.loads(line.decode('utf-8'))
-                                    if "response" in data:
-                                        full_response += data["response"]
-                                    if data.get("done", False):
-                                        break
-                                except json.JSONDecodeError:
-                                    continue
-                        
-                        result = {
-                            "response": full_response,
-                            "model": model,
-                            "done": True
-                        }
-                    else:
-                        # Handle non-streaming response
-                        result = await response.json()
-                    
-                    # Add telemetry data
-                    response_length = len(result.get("response", ""))
-                    estimated_tokens = len(result.get("response", "").split())
-                    
-                    otel_config.add_gen_ai_response_attributes(
-                        span,
-                        "success",
-                        {
-                            "prompt_tokens": len(prompt.split()),
-                            "completion_tokens": estimated_tokens,
-                            "total_tokens": len(prompt.split()) + estimated_tokens
-                        }
-                    )
-                    
-                    span.set_attribute("ollama.response.length", response_length)
-                    span.add_event("generation_completed", {
-                        "model": model,
-                        "response_length": response_length,
-                        "estimated_tokens": estimated_tokens
-                    })
-                    
-                    logger.info(f"✅ Generation completed with {estimated_tokens} tokens")
-                    return result
+                result = await self._coalesced(span, "/api/generate", payload)
+                
+                # The returned context is large; keep it in the prefix cache only
+                returned_context = result.pop("context", None)
+                if use_prefix:
+                    self.prefix_cache.observe(model, result, len(context) if context else 0)
+                    turn = [{"role": "user", "content": prompt}, {"role": "assistant", "content": result.get("response", "")}]
+                    self.prefix_cache.put(scope, history + turn, returned_context)
+                
+                # Token usage, computed once and carried with the result
+                response_length = len(result.get("response", ""))
+                usage = usage_from_response(model, result, prompt=request_prompt)
+                result["usage"] = usage.as_dict()
+                record_usage(span, model, usage)
+                
+                span.set_attribute("ollama.response.length", response_length)
+                span.add_event("generation_completed", {
+                    "model": model,
+                    "response_length": response_length,
+                    "completion_tokens": usage.completion_tokens
+                })
+                
+                if cache_key is not None:
+                    await self.response_cache.set(cache_key, result)
+                
+                logger.info("✅ Generation completed with %d tokens", usage.completion_tokens)
+                return result
                     
             except Exception as e:
                 span.set_attribute("gen_ai.response.finish_reason", "error")
@@ -258,14 +575,46 @@ class OllamaClient:
                 logger.error(f"❌ Generation failed: {str(e)}")
                 raise
     
+    def _replay_prompt(
+        self,
+        span: Any,
+        model: str,
+        system: Optional[str],
+        history: List[Dict[str, str]],
+        prompt: str,
+        max_tokens: int,
+        budget: Optional[int]
+    ) -> Tuple[Optional[str], str]:
+        """
+        System text and prompt carrying `history` (trimmed/summarized to the
+        window) in one /api/generate request, whose returned context then
+        seeds the prefix cache for the turns that follow.
+        """
+        messages = [{"role": "system", "content": system}] if system else []
+        messages = self._fit_messages(
+            span, model, messages + history + [{"role": "user", "content": prompt}], max_tokens, budget
+        )
+        system_parts = [message["content"] for message in messages if message.get("role") == "system"]
+        turns = [message for message in messages if message.get("role") != "system"]
+        transcript = "".join(f"{message['role']}: {message['content']}\n\n" for message in turns[:-1])
+        span.set_attribute("ollama.request.replayed_messages", len(turns) - 1)
+        return "\n\n".join(system_parts) or None, transcript + turns[-1]["content"]
+    
     async def chat(
         self,
         model: str,
         messages: List[Dict[str, str]],
         temperature: float = 0.7,
-        max_tokens: int = 1000
+        max_tokens: int = 1000,
+        cache: Optional[bool] = None,
+        budget: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Chat completion using conversation format"""
+        """
+        Chat completion using conversation format.
+        `cache` overrides the response-cache policy (default: temperature=0 only).
+        History beyond the context window (or the `budget` prompt tokens) is
+        summarized or dropped; system messages and recent turns are kept.
+        """
         
         with create_gen_ai_span(
             tracer,
@@ -276,54 +625,50 @@ class OllamaClient:
         ) as span:
             
             try:
-                if not await self.health_check():
-                    raise ConnectionError(OLLAMA_UNAVAILABLE_MESSAGE)
+                messages = self._fit_messages(span, model, messages, max_tokens, budget)
+                options = {
+                    "temperature": temperature,
+                    "num_predict": max_tokens
+                }
+                cache_key = self._cache_key("chat", model, options, cache, messages=messages)
+                cached = await self._cached_response(span, cache_key)
+                if cached is not None:
+                    logger.info("⚡ Served %s chat from response cache", model)
+                    return cached
                 
-                url = urljoin(self.base_url, "/api/chat")
                 payload = {
                     "model": model,
                     "messages": messages,
                     "stream": False,
-                    "options": {
-                        "temperature": temperature,
-                        "num_predict": max_tokens
-                    }
+                    "options": options
                 }
                 
                 span.set_attribute("ollama.chat.messages_count", len(messages))
                 
-                logger.info(f"💬 Starting chat with {model} ({len(messages)} messages)")
+                logger.info("💬 Starting chat with %s (%d messages)", model, len(messages))
                 
-                async with self.session.post(url, json=payload) as response:
-                    response.raise_for_status()
-                    result = await response.json()
-                    
-                    # Extract response message
-                    response_message = result.get("message", {})
-                    response_content = response_message.get("content", "")
-                    
-                    # Add telemetry
-                    estimated_tokens = len(response_content.split())
-                    total_input_tokens = sum(len(msg.get("content", "").split()) for msg in messages)
-                    
-                    otel_config.add_gen_ai_response_attributes(
-                        span,
-                        "success",
-                        {
-                            "prompt_tokens": total_input_tokens,
-                            "completion_tokens": estimated_tokens,
-                            "total_tokens": total_input_tokens + estimated_tokens
-                        }
-                    )
-                    
-                    span.add_event("chat_completed", {
-                        "model": model,
-                        "response_length": len(response_content),
-                        "estimated_tokens": estimated_tokens
-                    })
-                    
-                    logger.info(f"✅ Chat completed with {estimated_tokens} tokens")
-                    return result
+                result = await self._coalesced(span, "/api/chat", payload)
+                
+                # Extract response message
+                response_message = result.get("message", {})
+                response_content = response_message.get("content", "")
+                
+                # Token usage, computed once and carried with the result
+                usage = usage_from_response(model, result, messages=messages, completion=response_content)
+                result["usage"] = usage.as_dict()
+                record_usage(span, model, usage)
+                
+                span.add_event("chat_completed", {
+                    "model": model,
+                    "response_length": len(response_content),
+                    "completion_tokens": usage.completion_tokens
+                })
+                
+                if cache_key is not None:
+                    await self.response_cache.set(cache_key, result)
+                
+                logger.info("✅ Chat completed with %d tokens", usage.completion_tokens)
+                return result
                     
             except Exception as e:
                 span.set_attribute("gen_ai.response.finish_reason", "error")
@@ -331,6 +676,255 @@ class OllamaClient:
                 logger.error(f"❌ Chat failed: {str(e)}")
                 raise
     
+    async def generate_many_iter(
+        self,
+        requests: List[Dict[str, Any]],
+        concurrency: int = 4
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Run many `generate` calls with at most `concurrency` in flight,
+        yielding `{"index", "result"}` or `{"index", "error", "error_type"}`
+        as each one finishes. Each request is a dict of `generate` kwargs.
+        """
+        if not requests:
+            return
+        
+        outcomes: asyncio.Queue = asyncio.Queue()
+        pending = iter(enumerate(requests))
+        
+        async def worker() -> None:
+            # Workers share one iterator, so items are dispatched in order
+            for index, request in pending:
+                try:
+                    outcome = {"index": index, "result": await self.generate(**request)}
+                except BaseException as e:
+                    outcome = {"index": index, "error": str(e) or type(e).__name__, "error_type": type(e).__name__}
+                    # Stop only when this worker itself is cancelled (the consumer
+                    # left) or the process is exiting; a CancelledError raised
+                    # from inside one item is just that item's failure
+                    if isinstance(e, (KeyboardInterrupt, SystemExit)) or asyncio.current_task().cancelling():
+                        raise
+                finally:
+                    # Every dispatched item gets exactly one outcome, so the
+                    # consumer never waits for a worker that is gone
+                    outcomes.put_nowait(outcome)
+        
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(max(1, min(concurrency, len(requests))))
+        ]
+        try:
+            for _ in range(len(requests)):
+                yield await outcomes.get()
+        finally:
+            for task in workers:
+                if not task.done():
+                    task.cancel()
+    
+    async def generate_many(
+        self,
+        requests: List[Dict[str, Any]],
+        concurrency: int = 4
+    ) -> List[Dict[str, Any]]:
+        """Batch `generate` with bounded parallelism; outcomes keep request order"""
+        with tracer.start_as_current_span("ollama_generate_many") as span:
+            span.set_attribute("ollama.batch.size", len(requests))
+            span.set_attribute("ollama.batch.concurrency", concurrency)
+            
+            outcomes: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+            async for outcome in self.generate_many_iter(requests, concurrency):
+                outcomes[outcome["index"]] = outcome
+            
+            failed = sum(1 for outcome in outcomes if "error" in outcome)
+            span.set_attribute("ollama.batch.failed", failed)
+            logger.info("📦 Batch completed: %d/%d succeeded", len(requests) - failed, len(requests))
+            return outcomes
+    
+    @staticmethod
+    async def _iter_ndjson(response: aiohttp.ClientResponse) -> AsyncGenerator[Dict[str, Any], None]:
+        """Decode an NDJSON response body one line at a time"""
+        async for line in response.content:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+    
+    @staticmethod
+    def _chunk_text(data: Dict[str, Any]) -> str:
+        return data.get("response") or data.get("message", {}).get("content", "")
+    
+    async def _stream(
+        self,
+        span: Any,
+        path: str,
+        payload: Dict[str, Any]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Forward NDJSON chunks from Ollama as they arrive.
+        The upstream body is only read when the consumer asks for the next
+        chunk, and closing the generator closes the connection, which makes
+        Ollama abort the generation.
+        """
+        chunks = 0
+        parts: List[str] = []
+        try:
+            await self._ensure_available()
+            self.residency.record_request(payload["model"])
+            
+            tried: List[Backend] = []
+            while True:
+                backend = self.backends.choose(payload["model"], exclude=tried)
+                tried.append(backend)
+                try:
+                    async with self.scheduler.slot(payload["model"]):
+                        started = time.monotonic()
+                        with self.backends.track(backend):
+                            url = urljoin(backend.url, path)
+                            body = {**payload, "keep_alive": self.residency.keep_alive_for(payload["model"])}
+                            async with self.session.post(url, json=body, timeout=self.timeouts.stream) as response:
+                                response.raise_for_status()
+                                
+                                async for data in self._iter_ndjson(response):
+                                    chunks += 1
+                                    if chunks == 1:
+                                        self._record_outcome()
+                                        self.backends.record_success(backend)
+                                        backend.observe_latency(time.monotonic() - started)
+                                        span.set_attribute("ollama.backend.url", backend.url)
+                                        span.add_event("first_chunk_received")
+                                    
+                                    if not data.get("done", False):
+                                        parts.append(self._chunk_text(data))
+                                        yield data
+                                        continue
+                                    
+                                    parts.append(self._chunk_text(data))
+                                    usage = usage_from_response(
+                                        payload["model"],
+                                        data,
+                                        prompt=payload.get("prompt"),
+                                        messages=payload.get("messages"),
+                                        completion="".join(parts)
+                                    )
+                                    data["usage"] = usage.as_dict()
+                                    record_usage(span, payload["model"], usage)
+                                    self.residency.observe_response(payload["model"], data)
+                                    upstream_duration.record(time.monotonic() - started, {
+                                        "gen_ai.request.model": payload["model"],
+                                        "http.route": path,
+                                        "server.address": backend.url
+                                    })
+                                    span.set_attribute("ollama.stream.chunks", chunks)
+                                    logger.info("✅ Stream completed with %d chunks", chunks)
+                                    yield data
+                                    break
+                    return
+                except Exception as e:
+                    if _is_upstream_failure(e):
+                        self.backends.record_failure(backend)
+                    # Only fail over before anything was sent to the consumer
+                    if chunks > 0 or not self._should_failover(e, tried):
+                        raise
+                    logger.warning(f"⚠️ Ollama backend {backend.url} failed ({e}), failing over")
+                        
+        except (asyncio.CancelledError, GeneratorExit):
+            if chunks == 0:
+                self.health_monitor.release_trial()
+            span.set_attribute("gen_ai.response.finish_reason", "cancelled")
+            span.add_event("stream_cancelled", {"chunks": chunks})
+            logger.info("🛑 Stream cancelled by consumer after %d chunks", chunks)
+            raise
+        except Exception as e:
+            self._record_outcome(e)
+            span.set_attribute("gen_ai.response.finish_reason", "error")
+            span.add_event("stream_error", {"error": str(e)})
+            logger.error(f"❌ Streaming failed: {str(e)}")
+            raise
+    
+    def _shared_stream(
+        self,
+        span: Any,
+        path: str,
+        payload: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream via the single-flight layer: identical in-flight streams share
+        one upstream request and followers replay its chunks.
+        """
+        if self.single_flight is None:
+            return self._stream(span, path, payload)
+        
+        key = ResponseCache.make_key(path=path, **payload)
+        span.set_attribute("autonomes.single_flight.coalesced", self.single_flight.in_flight(key))
+        return self.single_flight.stream(key, lambda: self._stream(span, path, payload))
+    
+    async def generate_stream(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1000
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream a completion, yielding each Ollama chunk as it is produced"""
+        
+        with create_gen_ai_span(
+            tracer,
+            "ollama_generate_stream",
+            model,
+            set_current=False,
+            temperature=temperature,
+            max_tokens=max_tokens
+        ) as span:
+            span.set_attribute("ollama.request.prompt_length", len(prompt))
+            payload = {
+                "model": model,
+                "prompt": prompt,
+                "stream": True,
+                "options": {
+                    "temperature": temperature,
+                    "num_predict": max_tokens
+                }
+            }
+            
+            logger.info("🤖 Streaming completion with %s", model)
+            async for data in iterate_in_span(span, self._shared_stream(span, "/api/generate", payload)):
+                yield data
+    
+    async def chat_stream(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream a chat completion, yielding each Ollama chunk as it is produced"""
+        
+        with create_gen_ai_span(
+            tracer,
+            "ollama_chat_stream",
+            model,
+            set_current=False,
+            temperature=temperature,
+            max_tokens=max_tokens
+        ) as span:
+            messages = self._fit_messages(span, model, messages, max_tokens)
+            span.set_attribute("ollama.chat.messages_count", len(messages))
+            payload = {
+                "model": model,
+                "messages": messages,
+                "stream": True,
+                "options": {
+                    "temperature": temperature,
+                    "num_predict": max_tokens
+                }
+            }
+            
+            logger.info("💬 Streaming chat with %s (%d messages)", model, len(messages))
+            async for data in iterate_in_span(span, self._shared_stream(span, "/api/chat", payload)):
+                yield data
+    
     async def __aenter__(self):
         """Async context manager entry"""
         await self.initialize()
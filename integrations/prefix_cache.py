@@ -0,0 +1,147 @@
+"""
+AutonomesAI v2.1 - Ollama Prefix Cache
+Reuses the `context` Ollama returns so earlier turns are not re-evaluated
+
+/api/generate returns `context`: the token ids of the prompt and response
+it just evaluated. Passing it back with the next prompt lets Ollama skip
+re-evaluating the system prompt and history. Contexts are stored per
+(model, system prompt name + version, history prefix).
+"""
+
+import hashlib
+import json
+import logging
+import os
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from telemetry.otel_config import get_meter
+
+logger = logging.getLogger(__name__)
+meter = get_meter(__name__)
+
+prefix_lookups_counter = meter.create_counter(
+    "autonomes.ollama.prefix_cache.lookups",
+    unit="{request}",
+    description="Prefix (context) cache lookups by result (hit/miss)"
+)
+saved_tokens_counter = meter.create_counter(
+    "autonomes.ollama.prefix_cache.saved_tokens",
+    unit="{token}",
+    description="Prompt tokens Ollama did not re-evaluate thanks to a cached context"
+)
+saved_time_histogram = meter.create_histogram(
+    "autonomes.ollama.prefix_cache.saved_time",
+    unit="s",
+    description="Estimated prompt-eval time saved per request by a cached context"
+)
+
+# (model, system prompt name, system prompt version)
+PrefixScope = Tuple[str, str, str]
+
+
+class PrefixCache:
+    """
+    LRU of Ollama contexts bounded by entry count and total tokens.
+
+    Contexts are kept as compact int arrays (4 bytes per token). When a
+    scope is used with a new system prompt version, all entries of the
+    old version are dropped at once.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_tokens: int = 4_000_000):
+        self.max_entries = max_entries
+        self.max_tokens = max_tokens
+
+        self._entries: "OrderedDict[str, Tuple[PrefixScope, array]]" = OrderedDict()
+        self._tokens = 0
+        # Latest version seen per (model, system prompt name)
+        self._versions: Dict[Tuple[str, str], str] = {}
+        # Prompt-eval seconds per token, per model (EWMA of Ollama's timings)
+        self._eval_rates: Dict[str, float] = {}
+
+    @classmethod
+    def from_env(cls) -> Optional["PrefixCache"]:
+        """Build from OLLAMA_PREFIX_CACHE* env vars (None when disabled)"""
+        if os.getenv("OLLAMA_PREFIX_CACHE", "true").lower() not in ("1", "true", "yes"):
+            return None
+        return cls(
+            max_entries=int(os.getenv("OLLAMA_PREFIX_CACHE_MAX_ENTRIES", "1024")),
+            max_tokens=int(os.getenv("OLLAMA_PREFIX_CACHE_MAX_TOKENS", "4000000"))
+        )
+
+    @staticmethod
+    def make_key(scope: PrefixScope, history: Sequence[Dict[str, Any]]) -> str:
+        """Hash of the scope plus every (role, content) turn of the history"""
+        turns = [(message.get("role"), message.get("content")) for message in history]
+        encoded = json.dumps([scope, turns], separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _check_version(self, scope: PrefixScope) -> None:
+        model, name, version = scope
+        previous = self._versions.get((model, name))
+        if previous == version:
+            return
+        self._versions[(model, name)] = version
+        if previous is None:
+            return
+        stale = [key for key, (entry_scope, _) in self._entries.items() if entry_scope[:2] == (model, name)]
+        for key in stale:
+            self._forget(key)
+        logger.info(f"♻️ Prompt '{name}' v{previous} -> v{version}: dropped {len(stale)} cached {model} contexts")
+
+    def _forget(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._tokens -= len(entry[1])
+
+    def get(self, scope: PrefixScope, history: Sequence[Dict[str, Any]]) -> Optional[List[int]]:
+        """Context covering exactly `history` under `scope`, if cached"""
+        self._check_version(scope)
+        key = self.make_key(scope, history)
+        entry = self._entries.get(key)
+        prefix_lookups_counter.add(1, {"gen_ai.request.model": scope[0], "cache.result": "hit" if entry else "miss"})
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1].tolist()
+
+    def put(self, scope: PrefixScope, history: Sequence[Dict[str, Any]], context: Sequence[int]) -> None:
+        """Remember the context Ollama returned after evaluating `history`"""
+        if not context or len(context) > self.max_tokens:
+            return
+        self._check_version(scope)
+        key = self.make_key(scope, history)
+        self._forget(key)
+        self._entries[key] = (scope, array("i", context))
+        self._tokens += len(context)
+        while len(self._entries) > self.max_entries or self._tokens > self.max_tokens:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._tokens -= len(evicted)
+
+    def observe(self, model: str, response: Dict[str, Any], reused_tokens: int = 0) -> None:
+        """
+        Update the model's prompt-eval rate from Ollama's timings and record
+        the tokens (and estimated time) a reused context saved.
+        """
+        count = response.get("prompt_eval_count")
+        duration = response.get("prompt_eval_duration")
+        if count and duration:
+            rate = duration / 1e9 / count
+            previous = self._eval_rates.get(model)
+            self._eval_rates[model] = rate if previous is None else 0.8 * previous + 0.2 * rate
+
+        if reused_tokens:
+            attributes = {"gen_ai.request.model": model}
+            saved_tokens_counter.add(reused_tokens, attributes)
+            rate = self._eval_rates.get(model)
+            if rate is not None:
+                saved_time_histogram.record(reused_tokens * rate, attributes)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tokens = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "tokens": self._tokens}
@@ -0,0 +1,242 @@
+"""
+AutonomesAI v2.1 - Model Pull Jobs
+Background Ollama model pulls with dedup and throttled progress
+
+A pull runs to completion as its own task, independent of the request
+that started it; clients poll or subscribe to the job's progress.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from telemetry.otel_config import get_meter
+from .backend_pool import normalize_model_name
+
+logger = logging.getLogger(__name__)
+meter = get_meter(__name__)
+
+pull_bytes_counter = meter.create_counter(
+    "autonomes.ollama.pull.bytes",
+    unit="By",
+    description="Model bytes downloaded by Ollama pulls (sampled)"
+)
+pull_counter = meter.create_counter(
+    "autonomes.ollama.pulls",
+    unit="{pull}",
+    description="Finished model pulls, by outcome"
+)
+pull_duration_histogram = meter.create_histogram(
+    "autonomes.ollama.pull.duration",
+    unit="s",
+    description="Model pull duration"
+)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class PullJob:
+    """State of one model pull"""
+    model: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = JOB_QUEUED
+    phase: Optional[str] = None      # Ollama's status line, e.g. "pulling manifest"
+    completed_bytes: int = 0
+    total_bytes: int = 0
+    error: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    finished_at: Optional[str] = None
+    started: float = field(default_factory=time.monotonic)
+    ended: Optional[float] = None    # time.monotonic() when it finished
+    changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED)
+
+    @property
+    def progress(self) -> Optional[float]:
+        if self.status == JOB_COMPLETED:
+            return 1.0
+        if not self.total_bytes:
+            return None
+        return min(1.0, self.completed_bytes / self.total_bytes)
+
+    def publish(self) -> None:
+        """Wake subscribers waiting for the next update"""
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        progress = self.progress
+        return {
+            "id": self.id,
+            "model": self.model,
+            "status": self.status,
+            "phase": self.phase,
+            "completed_bytes": self.completed_bytes,
+            "total_bytes": self.total_bytes,
+            "progress": round(progress, 4) if progress is not None else None,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+
+class PullJobManager:
+    """
+    Runs Ollama model pulls as background jobs.
+
+    - a pull for a model that is already being pulled joins the existing job
+    - progress lines are folded into the job, but subscribers and metrics are
+      only updated every `progress_interval` seconds (or on a phase change)
+    - finished jobs are kept for `retention` seconds after they finish, at
+      most `max_jobs`
+    """
+
+    def __init__(
+        self,
+        pull: Callable[[str], AsyncIterator[Dict[str, Any]]],
+        progress_interval: float = 0.5,
+        retention: float = 3600.0,
+        max_jobs: int = 100
+    ):
+        self.pull = pull
+        self.progress_interval = progress_interval
+        self.retention = retention
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, PullJob]" = OrderedDict()
+        self._active: Dict[str, PullJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        _managers.add(self)
+
+    def start(self, model: str) -> Tuple[PullJob, bool]:
+        """Start pulling `model`; returns the job and whether it was newly created"""
+        model = normalize_model_name(model)
+        job = self._active.get(model)
+        if job is not None:
+            logger.info(f"🔗 Pull of {model} already in progress (job {job.id})")
+            return job, False
+
+        self._prune()
+        job = PullJob(model=model)
+        self._jobs[job.id] = job
+        self._active[model] = job
+        self._tasks[job.id] = asyncio.get_running_loop().create_task(self._run(job))
+        return job, True
+
+    def get(self, job_id: str) -> Optional[PullJob]:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> List[PullJob]:
+        return list(self._jobs.values())
+
+    async def _run(self, job: PullJob) -> None:
+        job.status = JOB_RUNNING
+        job.publish()
+        attributes = {"gen_ai.request.model": job.model}
+        last_published = time.monotonic()
+        reported_bytes = 0
+        # Ollama reports progress per layer; bytes are summed across layers
+        layers: Dict[str, Tuple[int, int]] = {}
+
+        try:
+            async for data in self.pull(job.model):
+                if "error" in data:
+                    raise RuntimeError(data["error"])
+
+                phase = data.get("status")
+                if "digest" in data and data.get("total"):
+                    layers[data["digest"]] = (data.get("completed", 0), data["total"])
+                    job.completed_bytes = sum(done for done, _ in layers.values())
+                    job.total_bytes = sum(total for _, total in layers.values())
+
+                now = time.monotonic()
+                if phase != job.phase or now - last_published >= self.progress_interval:
+                    job.phase = phase
+                    pull_bytes_counter.add(max(0, job.completed_bytes - reported_bytes), attributes)
+                    reported_bytes = max(reported_bytes, job.completed_bytes)
+                    last_published = now
+                    job.publish()
+
+                if phase == "success":
+                    break
+
+            if job.phase != "success":
+                raise RuntimeError("Ollama closed the pull stream before it succeeded")
+            job.status = JOB_COMPLETED
+            logger.info(f"✅ Pull job {job.id} for {job.model} completed")
+        except asyncio.CancelledError:
+            job.status = JOB_FAILED
+            job.error = "cancelled"
+            raise
+        except Exception as e:
+            job.status = JOB_FAILED
+            job.error = str(e)
+            logger.error(f"❌ Pull job {job.id} for {job.model} failed: {e}")
+        finally:
+            pull_bytes_counter.add(max(0, job.completed_bytes - reported_bytes), attributes)
+            pull_counter.add(1, {**attributes, "ollama.pull.status": job.status})
+            pull_duration_histogram.record(time.monotonic() - job.started, {**attributes, "ollama.pull.status": job.status})
+            job.finished_at = datetime.now().isoformat()
+            job.ended = time.monotonic()
+            self._active.pop(job.model, None)
+            self._tasks.pop(job.id, None)
+            job.publish()
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the job state now and after every published update until it finishes"""
+        job = self._jobs[job_id]
+        while True:
+            changed = job.changed
+            yield job.to_dict()
+            if job.finished:
+                return
+            await changed.wait()
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.retention
+        for job_id, job in list(self._jobs.items()):
+            # Retention counts from completion, so a long pull's result stays readable
+            if job.finished and job.ended is not None and (job.ended < cutoff or len(self._jobs) >= self.max_jobs):
+                del self._jobs[job_id]
+
+    async def close(self) -> None:
+        """Cancel running pulls"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# -- sampled progress gauge --------------------------------------------------
+
+_managers: "weakref.WeakSet[PullJobManager]" = weakref.WeakSet()
+
+
+def _observe_progress(options: CallbackOptions) -> Iterable[Observation]:
+    for manager in list(_managers):
+        for job in list(manager._active.values()):
+            progress = job.progress
+            if progress is not None:
+                yield Observation(progress, {"gen_ai.request.model": job.model})
+
+
+meter.create_observable_gauge(
+    "autonomes.ollama.pull.progress",
+    callbacks=[_observe_progress],
+    unit="1",
+    description="Fraction of bytes downloaded for in-progress model pulls"
+)
@@ -0,0 +1,186 @@
+"""
+AutonomesAI v2.1 - Ollama Response Cache
+Opt-in cache for deterministic (temperature=0) generations
+
+In-memory LRU bounded by entry count and bytes, with optional sqlite
+persistence so warm restarts keep their hits.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from telemetry.otel_config import get_meter
+
+logger = logging.getLogger(__name__)
+meter = get_meter(__name__)
+
+cache_requests_counter = meter.create_counter(
+    "autonomes.cache.requests",
+    unit="{request}",
+    description="Cache lookups by cache name and result (hit/miss)"
+)
+
+
+class ResponseCache:
+    """
+    LRU response cache keyed on model digest + prompt/messages + options.
+
+    Values are stored as JSON strings so the size bound is cheap to track
+    and every hit hands out a fresh copy that callers may mutate freely.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 3600.0,
+        path: Optional[str] = None,
+        name: str = "ollama_response"
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.path = path
+        self.name = name
+
+        # key -> (expires_at wall time, serialized value)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if path:
+            self._open_db(path)
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """Build a cache from OLLAMA_RESPONSE_CACHE* env vars (None when disabled)"""
+        if os.getenv("OLLAMA_RESPONSE_CACHE", "false").lower() not in ("1", "true", "yes"):
+            return None
+        return cls(
+            max_entries=int(os.getenv("OLLAMA_RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+            max_bytes=int(os.getenv("OLLAMA_RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            ttl=float(os.getenv("OLLAMA_RESPONSE_CACHE_TTL", "3600")),
+            path=os.getenv("OLLAMA_RESPONSE_CACHE_PATH") or None
+        )
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Stable hash over the request parts that determine the output"""
+        encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    # -- persistence -------------------------------------------------------
+
+    def _open_db(self, path: str) -> None:
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._db.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+        logger.info(f"💾 Response cache persistence enabled at {path}")
+
+    def _db_get(self, key: str) -> Optional[Tuple[float, str]]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT expires_at, value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _db_set(self, key: str, expires_at: float, value: str) -> None:
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+
+    # -- in-memory LRU -----------------------------------------------------
+
+    def _remember(self, key: str, expires_at: float, value: str) -> None:
+        if len(value) > self.max_bytes:
+            return
+        self._forget(key)
+        self._entries[key] = (expires_at, value)
+        self._bytes += len(value)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def _forget(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    def _record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        cache_requests_counter.add(1, {"cache.name": self.name, "cache.result": "hit" if hit else "miss"})
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached value or None; falls back to sqlite on a memory miss"""
+        now = time.time()
+        entry = self._entries.get(key)
+
+        if entry is None and self._db is not None:
+            entry = await asyncio.to_thread(self._db_get, key)
+            if entry is not None and entry[0] >= now:
+                self._remember(key, *entry)
+
+        if entry is None or entry[0] < now:
+            if entry is not None:
+                self._forget(key)
+            self._record(False)
+            return None
+
+        self._entries.move_to_end(key)
+        self._record(True)
+        return json.loads(entry[1])
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a JSON-serializable value"""
+        expires_at = time.time() + self.ttl
+        serialized = json.dumps(value, separators=(",", ":"))
+        self._remember(key, expires_at, serialized)
+        if self._db is not None:
+            await asyncio.to_thread(self._db_set, key, expires_at, serialized)
+
+    def clear(self) -> None:
+        """Drop every cached entry (memory and disk)"""
+        self._entries.clear()
+        self._bytes = 0
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close the sqlite connection"""
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "persistent": self._db is not None
+        }
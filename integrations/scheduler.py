@@ -0,0 +1,263 @@
+"""
+AutonomesAI v2.1 - Ollama Request Scheduler
+Per-model concurrency limits, admission control, priorities and tenant fairness
+
+Requests wait in a bounded in-process queue instead of piling up inside
+Ollama until the client timeout fires.
+"""
+
+import asyncio
+import contextvars
+import logging
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from enum import IntEnum
+from typing import AsyncIterator, Deque, Dict, Iterator, Optional, Tuple, TypeVar
+
+from telemetry.otel_config import get_meter
+
+logger = logging.getLogger(__name__)
+meter = get_meter(__name__)
+
+T = TypeVar("T")
+
+queue_depth_counter = meter.create_up_down_counter(
+    "autonomes.scheduler.queue_depth",
+    unit="{request}",
+    description="Requests waiting for an Ollama slot"
+)
+wait_time_histogram = meter.create_histogram(
+    "autonomes.scheduler.wait_time",
+    unit="ms",
+    description="Time spent queued before an Ollama slot was granted"
+)
+rejected_counter = meter.create_counter(
+    "autonomes.scheduler.rejected",
+    unit="{request}",
+    description="Requests rejected by admission control"
+)
+
+
+class Priority(IntEnum):
+    """Scheduling classes; lower value is served first"""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class QueueFullError(Exception):
+    """Raised when admission control rejects a request"""
+
+    def __init__(self, model: str, retry_after: float):
+        self.model = model
+        self.retry_after = retry_after
+        super().__init__(f"Ollama request queue is full for model '{model}'")
+
+
+# Priority/tenant of the current request; set by the API layer, read by the client
+_scheduling: contextvars.ContextVar[Tuple[Priority, str]] = contextvars.ContextVar(
+    "ollama_scheduling", default=(Priority.INTERACTIVE, "default")
+)
+
+
+@contextmanager
+def scheduling(priority: Priority = Priority.INTERACTIVE, tenant: str = "default") -> Iterator[None]:
+    """Tag every Ollama call made inside the block with a priority and tenant"""
+    token = _scheduling.set((priority, tenant))
+    try:
+        yield
+    finally:
+        _scheduling.reset(token)
+
+
+async def iterate_scheduled(
+    source: AsyncIterator[T],
+    priority: Priority = Priority.INTERACTIVE,
+    tenant: str = "default"
+) -> AsyncIterator[T]:
+    """
+    Iterate `source` inside `scheduling(priority, tenant)` while each item is
+    produced, but not while the consumer holds it. A generator that wraps its
+    `yield`s in `scheduling` breaks when it is closed from another context
+    (e.g. on client disconnect); this never holds the value across a `yield`.
+    Closing this iterator closes `source`.
+    """
+    try:
+        while True:
+            with scheduling(priority, tenant):
+                try:
+                    item = await source.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield item
+    finally:
+        aclose = getattr(source, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class _ModelQueue:
+    """Waiters for one model: strict priority, round-robin across tenants"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.waiting = 0
+        self.classes: Dict[Priority, "OrderedDict[str, Deque[asyncio.Future]]"] = {
+            priority: OrderedDict() for priority in Priority
+        }
+
+    def push(self, priority: Priority, tenant: str, waiter: asyncio.Future) -> None:
+        self.classes[priority].setdefault(tenant, deque()).append(waiter)
+        self.waiting += 1
+
+    def pop(self) -> Optional[asyncio.Future]:
+        for priority in Priority:
+            tenants = self.classes[priority]
+            if not tenants:
+                continue
+            tenant, waiters = next(iter(tenants.items()))
+            waiter = waiters.popleft()
+            if waiters:
+                tenants.move_to_end(tenant)  # next tenant gets the following slot
+            else:
+                del tenants[tenant]
+            self.waiting -= 1
+            return waiter
+        return None
+
+    def remove(self, priority: Priority, tenant: str, waiter: asyncio.Future) -> bool:
+        waiters = self.classes[priority].get(tenant)
+        if waiters is None or waiter not in waiters:
+            return False
+        waiters.remove(waiter)
+        if not waiters:
+            del self.classes[priority][tenant]
+        self.waiting -= 1
+        return True
+
+
+class RequestScheduler:
+    """
+    Async admission controller in front of Ollama.
+
+    Each model gets `limits[model]` (or `default_limit`) concurrent slots.
+    Extra requests queue by priority class, round-robin between tenants
+    within a class. Once `max_queue` requests are waiting across all models
+    new requests are rejected with QueueFullError carrying a Retry-After
+    estimate derived from the recent average slot hold time. Limits below 1
+    are raised to 1: a model with no slots would never serve anything.
+    """
+
+    def __init__(
+        self,
+        default_limit: int = 2,
+        limits: Optional[Dict[str, int]] = None,
+        max_queue: int = 64
+    ):
+        self.default_limit = max(1, default_limit)
+        self.limits = {model: max(1, limit) for model, limit in (limits or {}).items()}
+        self.max_queue = max_queue
+        self._queues: Dict[str, _ModelQueue] = {}
+        self._waiting = 0
+        self._avg_hold_seconds = 1.0
+
+    @classmethod
+    def from_env(cls) -> "RequestScheduler":
+        """OLLAMA_MAX_CONCURRENCY, OLLAMA_MODEL_CONCURRENCY=model:n,... and OLLAMA_MAX_QUEUE"""
+        limits = {}
+        for item in os.getenv("OLLAMA_MODEL_CONCURRENCY", "").split(","):
+            model, _, limit = item.strip().rpartition(":")
+            if model and limit.isdigit():
+                limits[model] = max(1, int(limit))
+        return cls(
+            default_limit=max(1, int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2"))),
+            limits=limits,
+            max_queue=int(os.getenv("OLLAMA_MAX_QUEUE", "64"))
+        )
+
+    def _queue(self, model: str) -> _ModelQueue:
+        queue = self._queues.get(model)
+        if queue is None:
+            queue = self._queues[model] = _ModelQueue(self.limits.get(model, self.default_limit))
+        return queue
+
+    def retry_after(self, model: str) -> float:
+        """Rough seconds until a queued request for `model` would be served"""
+        queue = self._queue(model)
+        return max(1.0, math.ceil(self._avg_hold_seconds * (queue.waiting + 1) / queue.limit))
+
+    def can_admit(self, model: str) -> bool:
+        """Whether a request for `model` would currently be admitted"""
+        queue = self._queue(model)
+        return (queue.active < queue.limit and not queue.waiting) or self._waiting < self.max_queue
+
+    async def acquire(self, model: str) -> None:
+        """Wait for a slot for `model` (priority/tenant come from `scheduling`)"""
+        queue = self._queue(model)
+        priority, tenant = _scheduling.get()
+        attributes = {"gen_ai.request.model": model, "scheduler.priority": priority.name.lower()}
+
+        if queue.active < queue.limit and not queue.waiting:
+            queue.active += 1
+            wait_time_histogram.record(0, attributes)
+            return
+
+        if self._waiting >= self.max_queue:
+            rejected_counter.add(1, attributes)
+            raise QueueFullError(model, self.retry_after(model))
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue.push(priority, tenant, waiter)
+        self._waiting += 1
+        queue_depth_counter.add(1, {"gen_ai.request.model": model})
+        started = time.monotonic()
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if queue.remove(priority, tenant, waiter):
+                self._waiting -= 1
+                queue_depth_counter.add(-1, {"gen_ai.request.model": model})
+            elif waiter.done() and not waiter.cancelled():
+                self.release(model)  # Slot was granted as we were cancelled
+            raise
+
+        wait_time_histogram.record((time.monotonic() - started) * 1000, attributes)
+
+    def release(self, model: str, held_seconds: Optional[float] = None) -> None:
+        """Return a slot and hand it to the next waiter, if any"""
+        queue = self._queue(model)
+        queue.active -= 1
+        if held_seconds is not None:
+            self._avg_hold_seconds = 0.8 * self._avg_hold_seconds + 0.2 * held_seconds
+
+        while queue.active < queue.limit:
+            waiter = queue.pop()
+            if waiter is None:
+                break
+            self._waiting -= 1
+            queue_depth_counter.add(-1, {"gen_ai.request.model": model})
+            if waiter.cancelled():
+                continue
+            queue.active += 1
+            waiter.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, model: str) -> AsyncIterator[None]:
+        """Hold an Ollama slot for `model` for the duration of the block"""
+        await self.acquire(model)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(model, time.monotonic() - started)
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Active/waiting/limit per model"""
+        return {
+            model: {"active": queue.active, "waiting": queue.waiting, "limit": queue.limit}
+            for model, queue in self._queues.items()
+        }
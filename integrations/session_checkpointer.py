@@ -0,0 +1,614 @@
+"""
+AutonomesAI v2.1 - Session Checkpointer
+LangGraph checkpointer with an in-memory LRU hot tier over sqlite
+
+Conversation state (`AutonomesState`) is checkpointed per session thread.
+List channels that only grew since the previous version (the `messages`
+history) are stored as append-only deltas, so a new turn costs O(turn) in
+serialization and disk writes rather than O(history). The latest checkpoint
+of recently active threads is served from memory; cold threads are loaded
+from sqlite once and then stay hot.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+
+from telemetry.otel_config import get_meter
+
+logger = logging.getLogger(__name__)
+meter = get_meter(__name__)
+
+checkpoint_reads_counter = meter.create_counter(
+    "autonomes.sessions.checkpoint_reads",
+    unit="{read}",
+    description="Checkpoint lookups by tier (hot/cold/miss)"
+)
+checkpoint_bytes_counter = meter.create_counter(
+    "autonomes.sessions.bytes_written",
+    unit="By",
+    description="Serialized channel bytes written, by blob kind (full/append)"
+)
+evicted_threads_counter = meter.create_counter(
+    "autonomes.sessions.evicted",
+    unit="{session}",
+    description="Session threads evicted from sqlite, by reason (age/size)"
+)
+
+# Next to the application code (/app/data in the container), not the cwd
+DEFAULT_SESSION_DB_PATH = Path(__file__).resolve().parent.parent / "data" / "sessions.db"
+
+BLOB_FULL = "full"
+BLOB_APPEND = "append"
+BLOB_EMPTY = "empty"
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS threads ("
+    "thread_id TEXT PRIMARY KEY, updated_at REAL NOT NULL, bytes INTEGER NOT NULL DEFAULT 0)",
+    "CREATE TABLE IF NOT EXISTS checkpoints ("
+    "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL, "
+    "parent_checkpoint_id TEXT, type TEXT, checkpoint BLOB, metadata_type TEXT, metadata BLOB, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))",
+    "CREATE TABLE IF NOT EXISTS blobs ("
+    "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, channel TEXT NOT NULL, version TEXT NOT NULL, "
+    "kind TEXT NOT NULL, base_version TEXT, type TEXT, data BLOB, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, channel, version))",
+    "CREATE TABLE IF NOT EXISTS writes ("
+    "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL, "
+    "task_id TEXT NOT NULL, idx INTEGER NOT NULL, channel TEXT NOT NULL, type TEXT, value BLOB, "
+    "task_path TEXT NOT NULL DEFAULT '', "
+    "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))",
+    "CREATE INDEX IF NOT EXISTS threads_updated_at ON threads (updated_at)",
+)
+
+# Base first, then every append delta up to `version`
+_CHAIN_QUERY = (
+    "WITH RECURSIVE chain(kind, base_version, type, data, depth) AS ("
+    " SELECT kind, base_version, type, data, 0 FROM blobs"
+    " WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?"
+    " UNION ALL"
+    " SELECT b.kind, b.base_version, b.type, b.data, chain.depth + 1 FROM blobs b JOIN chain"
+    " ON b.thread_id = ? AND b.checkpoint_ns = ? AND b.channel = ? AND b.version = chain.base_version"
+    " WHERE chain.kind = 'append'"
+    ") SELECT kind, type, data FROM chain ORDER BY depth DESC"
+)
+
+
+class _HotThread:
+    """
+    Latest checkpoint of one (thread, namespace), fully materialized.
+    Never mutated in place: `writes` is replaced wholesale, so an entry
+    taken from the hot tier can be read without any lock held.
+    """
+
+    __slots__ = ("checkpoint_id", "checkpoint", "metadata", "parent_id", "values", "writes")
+
+    def __init__(
+        self,
+        checkpoint_id: str,
+        checkpoint: Dict[str, Any],
+        metadata: CheckpointMetadata,
+        parent_id: Optional[str],
+        values: Dict[str, Tuple[str, Any]]
+    ):
+        self.checkpoint_id = checkpoint_id
+        self.checkpoint = checkpoint  # without channel_values
+        self.metadata = metadata
+        self.parent_id = parent_id
+        self.values = values  # channel -> (version, value)
+        self.writes: Dict[Tuple[str, int], Tuple[str, str, Any]] = {}
+
+
+def _config(thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> RunnableConfig:
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}}
+
+
+class SessionCheckpointer(BaseCheckpointSaver):
+    """
+    sqlite-backed LangGraph checkpointer for conversation sessions.
+
+    Keeps the latest `max_checkpoints` checkpoints per thread (older ones,
+    their pending writes and the blob versions only they used are pruned)
+    and evicts whole threads idle for longer than `ttl` seconds, oldest
+    first once the database holds more than `max_bytes` of session data.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        hot_threads: int = 256,
+        max_checkpoints: int = 10,
+        ttl: float = 7 * 24 * 3600,
+        max_bytes: int = 512 * 1024 * 1024,
+        evict_every: int = 256
+    ):
+        super().__init__()
+        self.path = path
+        self.hot_threads = hot_threads
+        self.max_checkpoints = max_checkpoints
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+
+        self._hot: "OrderedDict[Tuple[str, str], _HotThread]" = OrderedDict()
+        # `_lock` serializes sqlite work; `_hot_lock` only guards the LRU dict
+        # and is never held across I/O, so the event loop never waits on disk
+        self._lock = threading.RLock()
+        self._hot_lock = threading.Lock()
+        self._puts = 0
+
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self.evict()
+        logger.info(f"💾 Session checkpoints at {path} (hot tier: {hot_threads} threads)")
+
+    @classmethod
+    def from_env(cls) -> "SessionCheckpointer":
+        return cls(
+            path=os.getenv("SESSION_DB_PATH", str(DEFAULT_SESSION_DB_PATH)),
+            hot_threads=int(os.getenv("SESSION_HOT_THREADS", "256")),
+            max_checkpoints=int(os.getenv("SESSION_MAX_CHECKPOINTS", "10")),
+            ttl=float(os.getenv("SESSION_TTL", str(7 * 24 * 3600))),
+            max_bytes=int(os.getenv("SESSION_MAX_BYTES", str(512 * 1024 * 1024)))
+        )
+
+    # -- hot tier ----------------------------------------------------------
+
+    def _hot_get(self, key: Tuple[str, str]) -> Optional[_HotThread]:
+        with self._hot_lock:
+            entry = self._hot.get(key)
+            if entry is not None:
+                self._hot.move_to_end(key)
+            return entry
+
+    def _hot_put(self, key: Tuple[str, str], entry: _HotThread) -> None:
+        with self._hot_lock:
+            self._hot[key] = entry
+            self._hot.move_to_end(key)
+            while len(self._hot) > self.hot_threads:
+                self._hot.popitem(last=False)
+
+    def _tuple_from_hot(self, thread_id: str, checkpoint_ns: str, entry: _HotThread) -> CheckpointTuple:
+        # Fresh containers per read; graph code never sees the cached lists
+        channel_values = {
+            channel: list(value) if isinstance(value, list) else value
+            for channel, (_, value) in entry.values.items()
+        }
+        return CheckpointTuple(
+            config=_config(thread_id, checkpoint_ns, entry.checkpoint_id),
+            checkpoint={**entry.checkpoint, "channel_values": channel_values},
+            metadata=entry.metadata,
+            parent_config=_config(thread_id, checkpoint_ns, entry.parent_id) if entry.parent_id else None,
+            pending_writes=list(entry.writes.values())
+        )
+
+    # -- sqlite ------------------------------------------------------------
+
+    def _load_channel(self, thread_id: str, checkpoint_ns: str, channel: str, version: str) -> Tuple[bool, Any]:
+        key = (thread_id, checkpoint_ns, channel, version)
+        rows = self._db.execute(_CHAIN_QUERY, key + key[:3]).fetchall()
+        if not rows or rows[-1][0] == BLOB_EMPTY:
+            return False, None
+        value = None
+        for kind, type_, data in rows:
+            part = self.serde.loads_typed((type_, data))
+            value = part if kind == BLOB_FULL else value + part
+        return True, value
+
+    def _load_row(self, thread_id: str, checkpoint_ns: str, row: Sequence[Any]) -> _HotThread:
+        checkpoint_id, parent_id, type_, data, metadata_type, metadata = row
+        checkpoint = self.serde.loads_typed((type_, data))
+        values = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            found, value = self._load_channel(thread_id, checkpoint_ns, channel, version)
+            if found:
+                values[channel] = (version, value)
+        entry = _HotThread(checkpoint_id, checkpoint, self.serde.loads_typed((metadata_type, metadata)), parent_id, values)
+        for task_id, idx, channel, value_type, value, task_path in self._db.execute(
+            "SELECT task_id, idx, channel, type, value, task_path FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id)
+        ):
+            entry.writes[(task_id, idx)] = (task_id, channel, self.serde.loads_typed((value_type, value)))
+        return entry
+
+    def _touch(self, thread_id: str, written: int) -> None:
+        self._db.execute(
+            "INSERT INTO threads (thread_id, updated_at, bytes) VALUES (?, ?, ?) "
+            "ON CONFLICT(thread_id) DO UPDATE SET updated_at = excluded.updated_at, bytes = bytes + excluded.bytes",
+            (thread_id, time.time(), written)
+        )
+
+    def _prune(self, thread_id: str, checkpoint_ns: str) -> int:
+        """
+        Drop all but the latest `max_checkpoints` checkpoints, their writes and
+        every blob version no kept checkpoint (or append chain) still needs.
+        Returns the bytes freed.
+        """
+        stale = self._db.execute(
+            "SELECT checkpoint_id, LENGTH(checkpoint) + LENGTH(metadata) FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?",
+            (thread_id, checkpoint_ns, self.max_checkpoints)
+        ).fetchall()
+        if not stale:
+            return 0
+        freed = 0
+        for checkpoint_id, size in stale:
+            freed += size or 0
+            for table in ("checkpoints", "writes"):
+                self._db.execute(
+                    f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id)
+                )
+
+        # Versions the kept checkpoints point at, plus the bases of their deltas
+        referenced = set()
+        for type_, data in self._db.execute(
+            "SELECT type, checkpoint FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?",
+            (thread_id, checkpoint_ns)
+        ):
+            referenced.update(self.serde.loads_typed((type_, data))["channel_versions"].items())
+        blobs = {
+            (channel, version): (base_version, size or 0)
+            for channel, version, base_version, size in self._db.execute(
+                "SELECT channel, version, base_version, LENGTH(data) FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ?",
+                (thread_id, checkpoint_ns)
+            )
+        }
+        needed = self._with_bases(referenced, blobs)
+
+        # Deltas below the kept checkpoints pile up turn after turn; once they
+        # outnumber the kept checkpoints, rebase the oldest kept versions as full blobs
+        if len(needed) - len(referenced) > self.max_checkpoints:
+            for channel, version in referenced:
+                base_version, size = blobs.get((channel, version), (None, 0))
+                if base_version is None or (channel, base_version) in referenced:
+                    continue
+                _, value = self._load_channel(thread_id, checkpoint_ns, channel, version)
+                type_, data = self.serde.dumps_typed(value)
+                self._db.execute(
+                    "UPDATE blobs SET kind = ?, base_version = NULL, type = ?, data = ? "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                    (BLOB_FULL, type_, data, thread_id, checkpoint_ns, channel, version)
+                )
+                checkpoint_bytes_counter.add(len(data), {"kind": BLOB_FULL})
+                freed += size - len(data)
+                blobs[(channel, version)] = (None, len(data))
+            needed = self._with_bases(referenced, blobs)
+
+        unused = [blob for blob in blobs if blob not in needed]
+        self._db.executemany(
+            "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+            [(thread_id, checkpoint_ns, channel, version) for channel, version in unused]
+        )
+        return freed + sum(blobs[blob][1] for blob in unused)
+
+    @staticmethod
+    def _with_bases(
+        versions: Set[Tuple[str, str]],
+        blobs: Dict[Tuple[str, str], Tuple[Optional[str], int]]
+    ) -> Set[Tuple[str, str]]:
+        """`versions` plus every base version their append chains rest on"""
+        needed = set(versions)
+        pending = list(versions)
+        while pending:
+            channel, version = pending.pop()
+            base_version = blobs.get((channel, version), (None, 0))[0]
+            if base_version is not None and (channel, base_version) not in needed:
+                needed.add((channel, base_version))
+                pending.append((channel, base_version))
+        return needed
+
+    def _delete(self, thread_id: str) -> None:
+        for table in ("checkpoints", "blobs", "writes", "threads"):
+            self._db.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+        with self._hot_lock:
+            for key in [key for key in self._hot if key[0] == thread_id]:
+                del self._hot[key]
+
+    def evict(self) -> int:
+        """Drop threads idle past the TTL, then the oldest until under max_bytes"""
+        evicted = 0
+        with self._lock:
+            expired = self._db.execute(
+                "SELECT thread_id FROM threads WHERE updated_at < ?", (time.time() - self.ttl,)
+            ).fetchall()
+            for (thread_id,) in expired:
+                self._delete(thread_id)
+            if expired:
+                evicted_threads_counter.add(len(expired), {"reason": "age"})
+            evicted += len(expired)
+
+            total = self._db.execute("SELECT COALESCE(SUM(bytes), 0) FROM threads").fetchone()[0]
+            if total > self.max_bytes:
+                oldest = self._db.execute("SELECT thread_id, bytes FROM threads ORDER BY updated_at")
+                victims = []
+                for thread_id, size in oldest:
+                    if total <= self.max_bytes:
+                        break
+                    victims.append(thread_id)
+                    total -= size
+                for thread_id in victims:
+                    self._delete(thread_id)
+                if victims:
+                    evicted_threads_counter.add(len(victims), {"reason": "size"})
+                evicted += len(victims)
+
+        if evicted:
+            logger.info(f"🧹 Evicted {evicted} session threads")
+        return evicted
+
+    # -- BaseCheckpointSaver -----------------------------------------------
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        key = (thread_id, checkpoint_ns)
+
+        with self._lock:
+            entry = self._hot_get(key)
+            if entry is not None and checkpoint_id in (None, entry.checkpoint_id):
+                checkpoint_reads_counter.add(1, {"tier": "hot"})
+                return self._tuple_from_hot(thread_id, checkpoint_ns, entry)
+
+            query = (
+                "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+                "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            )
+            if checkpoint_id is None:
+                row = self._db.execute(
+                    query + "ORDER BY checkpoint_id DESC LIMIT 1", (thread_id, checkpoint_ns)
+                ).fetchone()
+            else:
+                row = self._db.execute(
+                    query + "AND checkpoint_id = ?", (thread_id, checkpoint_ns, checkpoint_id)
+                ).fetchone()
+            if row is None:
+                checkpoint_reads_counter.add(1, {"tier": "miss"})
+                return None
+
+            checkpoint_reads_counter.add(1, {"tier": "cold"})
+            entry = self._load_row(thread_id, checkpoint_ns, row)
+            if checkpoint_id is None:
+                self._hot_put(key, entry)
+            return self._tuple_from_hot(thread_id, checkpoint_ns, entry)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[CheckpointTuple]:
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+            "metadata_type, metadata FROM checkpoints WHERE 1 = 1"
+        )
+        params: List[Any] = []
+        if config is not None:
+            query += " AND thread_id = ?"
+            params.append(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                query += " AND checkpoint_ns = ?"
+                params.append(checkpoint_ns)
+        if before is not None and get_checkpoint_id(before):
+            query += " AND checkpoint_id < ?"
+            params.append(get_checkpoint_id(before))
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+            tuples = []
+            for thread_id, checkpoint_ns, *row in rows:
+                entry = self._load_row(thread_id, checkpoint_ns, row)
+                if filter and any(entry.metadata.get(k) != v for k, v in filter.items()):
+                    continue
+                tuples.append(self._tuple_from_hot(thread_id, checkpoint_ns, entry))
+                if limit is not None and len(tuples) >= limit:
+                    break
+        yield from tuples
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        parent_id = config["configurable"].get("checkpoint_id")
+        key = (thread_id, checkpoint_ns)
+
+        stored = dict(checkpoint)
+        channel_values = stored.pop("channel_values")
+
+        with self._lock:
+            previous = self._hot_get(key)
+            # Deltas are only taken against the parent checkpoint's values
+            prior_values = previous.values if previous is not None and previous.checkpoint_id == parent_id else {}
+            values = {
+                channel: (version, channel_values[channel])
+                for channel, version in checkpoint["channel_versions"].items()
+                if channel in channel_values
+            }
+            blob_rows = []
+            for channel, version in new_versions.items():
+                if channel not in channel_values:
+                    blob_rows.append((channel, version, BLOB_EMPTY, None, None, None))
+                    continue
+
+                value = channel_values[channel]
+                kind, base_version, payload = BLOB_FULL, None, value
+                prior = prior_values.get(channel)
+                if isinstance(value, list) and prior is not None and isinstance(prior[1], list):
+                    prior_version, prior_value = prior
+                    # Grown in place (e.g. an `operator.add` reducer): store only the new items
+                    if len(value) >= len(prior_value) and value[:len(prior_value)] == prior_value:
+                        kind, base_version, payload = BLOB_APPEND, prior_version, value[len(prior_value):]
+                type_, data = self.serde.dumps_typed(payload)
+                blob_rows.append((channel, version, kind, base_version, type_, data))
+                checkpoint_bytes_counter.add(len(data), {"kind": kind})
+
+            checkpoint_type, checkpoint_data = self.serde.dumps_typed(stored)
+            metadata_type, metadata_data = self.serde.dumps_typed(metadata)
+            written = len(checkpoint_data) + len(metadata_data) + sum(len(row[5] or b"") for row in blob_rows)
+
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO blobs "
+                    "(thread_id, checkpoint_ns, channel, version, kind, base_version, type, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(thread_id, checkpoint_ns) + row for row in blob_rows]
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, "
+                    "parent_checkpoint_id, type, checkpoint, metadata_type, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, checkpoint["id"], parent_id,
+                     checkpoint_type, checkpoint_data, metadata_type, metadata_data)
+                )
+                self._touch(thread_id, written - self._prune(thread_id, checkpoint_ns))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+            self._hot_put(key, _HotThread(checkpoint["id"], stored, metadata, parent_id, values))
+            self._puts += 1
+            should_evict = self._puts % self.evict_every == 0
+
+        if should_evict:
+            self.evict()
+        return _config(thread_id, checkpoint_ns, checkpoint["id"])
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        with self._lock:
+            entry = self._hot_get((thread_id, checkpoint_ns))
+            if entry is not None and entry.checkpoint_id != checkpoint_id:
+                entry = None
+
+            rows = []
+            pending = dict(entry.writes) if entry is not None else {}
+            for idx, (channel, value) in enumerate(writes):
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                # Regular writes are idempotent per (task, idx); special channels overwrite
+                if write_idx >= 0 and (task_id, write_idx) in pending:
+                    continue
+                type_, data = self.serde.dumps_typed(value)
+                rows.append((thread_id, checkpoint_ns, checkpoint_id, task_id, write_idx, channel, type_, data, task_path))
+                pending[(task_id, write_idx)] = (task_id, channel, value)
+
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, "
+                "channel, type, value, task_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._db.execute("COMMIT")
+            if entry is not None:
+                entry.writes = pending
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._delete(thread_id)
+            self._db.execute("COMMIT")
+
+    def get_next_version(self, current: Optional[str], channel: Any) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # Hot-tier hits are answered inline under `_hot_lock` only (a worker thread
+    # may hold `_lock` during sqlite I/O); everything else runs in a worker thread
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        entry = self._hot_get((thread_id, checkpoint_ns))
+        if entry is not None and get_checkpoint_id(config) in (None, entry.checkpoint_id):
+            checkpoint_reads_counter.add(1, {"tier": "hot"})
+            return self._tuple_from_hot(thread_id, checkpoint_ns, entry)
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[CheckpointTuple]:
+        tuples = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in tuples:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def close(self) -> None:
+        """Close the sqlite connection"""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,163 @@
+"""
+AutonomesAI v2.1 - Request Coalescing
+Single-flight for identical in-flight Ollama requests
+
+During a thundering herd only the first request (the leader) goes upstream;
+identical followers await the leader's result or subscribe to its stream.
+"""
+
+import asyncio
+import copy
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from telemetry.otel_config import get_meter
+
+logger = logging.getLogger(__name__)
+meter = get_meter(__name__)
+
+T = TypeVar("T")
+
+coalesced_counter = meter.create_counter(
+    "autonomes.single_flight.coalesced",
+    unit="{request}",
+    description="Requests served by joining an identical in-flight request"
+)
+
+
+class _SharedStream:
+    """
+    One upstream stream fanned out to many subscribers.
+
+    Chunks are buffered for the lifetime of the stream so late joiners replay
+    from the start; the upstream is cancelled once every subscriber leaves,
+    and `on_finished` runs right then so nobody subscribes to a dying stream.
+    """
+
+    def __init__(self, source: Callable[[], AsyncIterator[Any]], on_finished: Callable[[], None]):
+        self._chunks: List[Any] = []
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._changed = asyncio.Event()
+        self._subscribers = 0
+        self._on_finished = on_finished
+        self._task = asyncio.ensure_future(self._pump(source))
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _pump(self, source: Callable[[], AsyncIterator[Any]]) -> None:
+        try:
+            async for chunk in source():
+                self._chunks.append(chunk)
+                self._notify()
+        except asyncio.CancelledError:
+            self._error = asyncio.CancelledError()
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done = True
+            self._on_finished()
+            self._notify()
+
+    async def subscribe(self) -> AsyncIterator[Any]:
+        self._subscribers += 1
+        index = 0
+        try:
+            while True:
+                if index < len(self._chunks):
+                    yield self._chunks[index]
+                    index += 1
+                    continue
+                if self._done:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                await self._changed.wait()
+        finally:
+            self._subscribers -= 1
+            if self._subscribers == 0 and not self._task.done():
+                self._on_finished()
+                self._task.cancel()
+
+
+class _Call:
+    """One shared in-flight call: its task, current waiters and whether anyone joined it"""
+
+    __slots__ = ("task", "waiters", "shared")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+        self.shared = False
+
+
+class SingleFlight:
+    """
+    Deduplicate identical concurrent calls by key.
+
+    The shared work runs in its own task, so a cancelled leader does not
+    cancel its followers; the task is only cancelled once nobody is waiting.
+    Once a call is shared, every caller (the leader included) receives its
+    own deep copy of the result, so nobody can mutate a value another caller
+    is holding; an uncontended caller gets the result as is.
+    """
+
+    def __init__(self, name: str = "ollama"):
+        self.name = name
+        self._calls: Dict[str, _Call] = {}
+        self._streams: Dict[str, _SharedStream] = {}
+
+    def in_flight(self, key: str) -> bool:
+        """Whether a call or stream with this key is currently running"""
+        return key in self._calls or key in self._streams
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn` once per key at a time; concurrent callers share the result"""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            # Registered before any waiter's callback: once the leader resumes,
+            # the call is forgotten and no new follower can join it
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            call.shared = True
+            coalesced_counter.add(1, {"single_flight.name": self.name, "single_flight.kind": "call"})
+            logger.debug("🔗 Joined in-flight request %.12s", key)
+
+        call.waiters += 1
+        try:
+            result = await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.task.cancelled():
+                raise
+            # This caller went away; stop the shared work if nobody else waits
+            if call.waiters <= 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+        return copy.deepcopy(result) if call.shared else result
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stream(self, key: str, source: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """Subscribe to the stream for `key`, starting it if nobody else has"""
+        shared = self._streams.get(key)
+        if shared is None:
+            shared = _SharedStream(source, lambda: self._forget_stream(key, shared))
+            self._streams[key] = shared
+        else:
+            coalesced_counter.add(1, {"single_flight.name": self.name, "single_flight.kind": "stream"})
+            logger.debug("🔗 Subscribed to in-flight stream %.12s", key)
+        return shared.subscribe()
+
+    def _forget_stream(self, key: str, shared: _SharedStream) -> None:
+        # Called on cancel and again when the pump ends; never drop a newer stream
+        if self._streams.get(key) is shared:
+            del self._streams[key]
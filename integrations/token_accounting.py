@@ -0,0 +1,194 @@
+"""
+AutonomesAI v2.1 - Token Accounting
+Server-reported token usage with a cached tokenizer fallback
+
+Ollama returns `prompt_eval_count`/`eval_count` with every completed
+response; those are used whenever present. Counts Ollama omits (e.g. the
+prompt evaluation is skipped when the prompt is already in its KV cache)
+are estimated with the tokenizer mapped to the model, computed once per
+request.
+"""
+
+import logging
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from opentelemetry import trace
+
+from telemetry.otel_config import otel_config
+from telemetry.gen_ai_metrics import token_usage, tokens_per_second
+
+try:  # Optional: closer estimates for BPE-style vocabularies
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Words, or single punctuation marks - closer to subword counts than str.split()
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+# Role/separator tokens chat templates wrap around each message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SOURCE_SERVER = "ollama"
+SOURCE_ESTIMATE = "estimate"
+SOURCE_MIXED = "mixed"
+
+
+@dataclass(frozen=True)
+class TokenUsage:
+    """Token usage for one request"""
+    prompt_tokens: int
+    completion_tokens: int
+    source: str = SOURCE_SERVER
+    eval_seconds: Optional[float] = None  # Ollama's eval_duration
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        if not self.eval_seconds or self.source == SOURCE_ESTIMATE:
+            return None
+        return self.completion_tokens / self.eval_seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "source": self.source
+        }
+
+
+class TokenCounter:
+    """
+    Fallback token counter with one cached tokenizer per model and an LRU
+    of recent counts, so a prompt reused across calls is counted once.
+
+    Each model uses the tiktoken encoding mapped to it (per-model
+    OLLAMA_TOKENIZER_ENCODINGS=`model=encoding,...`), else the default
+    `encoding` (OLLAMA_TOKENIZER_ENCODING). Without tiktoken, or for an
+    encoding it cannot load, counts fall back to a word/punctuation regex.
+    """
+
+    def __init__(
+        self,
+        encoding: Optional[str] = None,
+        model_encodings: Optional[Dict[str, str]] = None,
+        max_entries: int = 4096
+    ):
+        self.encoding = encoding or os.getenv("OLLAMA_TOKENIZER_ENCODING", "cl100k_base")
+        if model_encodings is None:
+            model_encodings = {}
+            for item in filter(None, (part.strip() for part in os.getenv("OLLAMA_TOKENIZER_ENCODINGS", "").split(","))):
+                model, _, name = item.partition("=")
+                model_encodings[model.strip()] = name.strip()
+        self.model_encodings = model_encodings
+        self.max_entries = max_entries
+        self._tokenizers: Dict[str, Callable[[str], int]] = {}
+        self._counts: "OrderedDict[Tuple[str, int, int], int]" = OrderedDict()
+
+    def encoding_for(self, model: str) -> str:
+        """tiktoken encoding name used to count tokens for `model`"""
+        return self.model_encodings.get(model, self.encoding)
+
+    def _tokenizer(self, model: str) -> Callable[[str], int]:
+        tokenizer = self._tokenizers.get(model)
+        if tokenizer is None:
+            tokenizer = self._load_tokenizer(model)
+            self._tokenizers[model] = tokenizer
+        return tokenizer
+
+    def _load_tokenizer(self, model: str) -> Callable[[str], int]:
+        encoding = self.encoding_for(model)
+        if tiktoken is not None:
+            try:
+                encoder = tiktoken.get_encoding(encoding)
+                return lambda text: len(encoder.encode(text, disallowed_special=()))
+            except Exception as e:
+                logger.warning(f"⚠️ Tokenizer '{encoding}' unavailable for {model}: {e}")
+        return lambda text: len(_TOKEN_PATTERN.findall(text))
+
+    def count(self, model: str, text: str) -> int:
+        """Estimated token count of `text` for `model`"""
+        if not text:
+            return 0
+        key = (model, len(text), hash(text))
+        count = self._counts.get(key)
+        if count is not None:
+            self._counts.move_to_end(key)
+            return count
+
+        count = self._tokenizer(model)(text)
+        self._counts[key] = count
+        if len(self._counts) > self.max_entries:
+            self._counts.popitem(last=False)
+        return count
+
+    def count_messages(self, model: str, messages: List[Dict[str, Any]]) -> int:
+        """Estimated prompt tokens for a chat conversation"""
+        return sum(
+            self.count(model, message.get("content") or "") + MESSAGE_OVERHEAD_TOKENS
+            for message in messages
+        )
+
+
+def usage_from_response(
+    model: str,
+    response: Dict[str, Any],
+    prompt: Optional[str] = None,
+    messages: Optional[List[Dict[str, Any]]] = None,
+    completion: Optional[str] = None
+) -> TokenUsage:
+    """
+    Token usage for a completed Ollama response, preferring the server's
+    `prompt_eval_count`/`eval_count` and estimating whatever is missing.
+    """
+    prompt_tokens = response.get("prompt_eval_count")
+    completion_tokens = response.get("eval_count")
+    estimated = 0
+
+    if prompt_tokens is None:
+        estimated += 1
+        if messages is not None:
+            prompt_tokens = token_counter.count_messages(model, messages)
+        else:
+            prompt_tokens = token_counter.count(model, prompt or "")
+
+    if completion_tokens is None:
+        estimated += 1
+        if completion is None:
+            completion = response.get("response") or response.get("message", {}).get("content", "")
+        completion_tokens = token_counter.count(model, completion)
+
+    eval_duration = response.get("eval_duration")
+    return TokenUsage(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        source=(SOURCE_SERVER, SOURCE_MIXED, SOURCE_ESTIMATE)[estimated],
+        eval_seconds=eval_duration / 1e9 if eval_duration else None
+    )
+
+
+def record_usage(span: trace.Span, model: str, usage: TokenUsage) -> None:
+    """Set gen_ai.usage.* on the span and record the token metrics"""
+    otel_config.add_gen_ai_response_attributes(span, "success", usage.as_dict())
+    span.set_attribute("autonomes.usage.source", usage.source)
+
+    attributes = {"gen_ai.request.model": model, "autonomes.usage.source": usage.source}
+    token_usage.record(usage.prompt_tokens, {**attributes, "gen_ai.token.type": "input"})
+    token_usage.record(usage.completion_tokens, {**attributes, "gen_ai.token.type": "output"})
+
+    rate = usage.tokens_per_second
+    if rate is not None:
+        tokens_per_second.record(rate, {"gen_ai.request.model": model})
+
+
+# Global counter instance
+token_counter = TokenCounter()
@@ -0,0 +1,226 @@
+"""
+AutonomesAI v2.1 - Prompt Registry
+Sprint 0-B follow-up: cached, hot-reloadable prompt versioning
+
+Parses prompts/system_prompts.yaml once, indexes prompts by name and version,
+and reloads only when the file content changes on disk.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROMPTS_PATH = Path(__file__).parent / "prompts" / "system_prompts.yaml"
+PROMPT_SECTIONS = ("prompts", "utility_prompts")
+
+# Only `{identifier}` is a placeholder; other braces (YAML/JSON examples) stay literal
+_PLACEHOLDER_RE = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A single versioned prompt with a pre-compiled `{placeholder}` template"""
+    name: str
+    version: str
+    section: str
+    content: str
+    description: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    # Alternating literal / placeholder segments, split once at load time
+    parts: Tuple[Tuple[bool, str], ...] = ()
+
+    @classmethod
+    def from_yaml(cls, name: str, section: str, data: Dict[str, Any]) -> "PromptTemplate":
+        content = data.get("content", "")
+        parts: List[Tuple[bool, str]] = []
+        position = 0
+        for match in _PLACEHOLDER_RE.finditer(content):
+            if match.start() > position:
+                parts.append((False, content[position:match.start()]))
+            parts.append((True, match.group(1)))
+            position = match.end()
+        if position < len(content):
+            parts.append((False, content[position:]))
+
+        return cls(
+            name=name,
+            version=str(data.get("version", "unknown")),
+            section=section,
+            content=content,
+            description=data.get("description", ""),
+            metadata=data.get("metadata", {}) or {},
+            parts=tuple(parts)
+        )
+
+    @property
+    def placeholders(self) -> Tuple[str, ...]:
+        """Placeholder names in order of first appearance"""
+        return tuple(dict.fromkeys(value for is_field, value in self.parts if is_field))
+
+    @property
+    def token_budget(self) -> Optional[int]:
+        return self.metadata.get("token_budget")
+
+    def render(self, **values: Any) -> str:
+        """Fill placeholders; raises KeyError naming the first missing value"""
+        try:
+            return "".join(
+                str(values[value]) if is_field else value
+                for is_field, value in self.parts
+            )
+        except KeyError as e:
+            raise KeyError(f"Prompt '{self.name}' v{self.version} missing placeholder {e}") from None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Raw YAML-shaped view, as returned by graph.load_prompt_template"""
+        return {
+            "version": self.version,
+            "description": self.description,
+            "content": self.content,
+            "metadata": self.metadata
+        }
+
+
+class PromptRegistry:
+    """
+    In-memory index of the prompt pack.
+
+    Lookups never touch the filesystem, so they are safe on the event loop.
+    A daemon watcher thread re-stats the file every `check_interval` seconds
+    and re-parses it only when its size/mtime change *and* its content hash
+    differs, so host edits to the read-only bind mount take effect without a
+    restart. Versions seen earlier in the process stay addressable after a
+    reload. `check_interval <= 0` disables the watcher (use `reload()`).
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_PROMPTS_PATH, check_interval: float = 1.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._active: Dict[str, PromptTemplate] = {}
+        self._by_version: Dict[Tuple[str, str], PromptTemplate] = {}
+        self._pack_version = "unknown"
+        self._stat_key: Optional[Tuple[int, int]] = None
+        self._digest: Optional[str] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def pack_version(self) -> str:
+        """Version of the whole prompt pack (top-level `version` key)"""
+        self._ensure_loaded()
+        return self._pack_version
+
+    @property
+    def digest(self) -> Optional[str]:
+        """Content hash of the currently loaded prompt file"""
+        self._ensure_loaded()
+        return self._digest
+
+    def start(self) -> None:
+        """Load the pack (blocking) and start the reload watcher; idempotent"""
+        if self._digest is None:
+            self._maybe_reload()
+        with self._lock:
+            if self._watcher is not None or self.check_interval <= 0:
+                return
+            self._stopped.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, name="prompt-registry-watcher", daemon=True
+            )
+            self._watcher.start()
+
+    def stop(self) -> None:
+        """Stop the reload watcher (lookups keep serving the loaded pack)"""
+        with self._lock:
+            watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            self._stopped.set()
+            watcher.join()
+
+    def _ensure_loaded(self) -> None:
+        # Only the very first lookup reads the file; the API preloads it off-loop on startup
+        if self._digest is None:
+            self.start()
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.check_interval):
+            self._maybe_reload()
+
+    def _maybe_reload(self, force: bool = False) -> None:
+        with self._lock:
+            try:
+                stat = self.path.stat()
+                stat_key = (stat.st_mtime_ns, stat.st_size)
+                if not force and self._digest is not None and stat_key == self._stat_key:
+                    return
+
+                raw = self.path.read_bytes()
+                digest = hashlib.sha256(raw).hexdigest()[:16]
+                self._stat_key = stat_key
+                if not force and digest == self._digest:
+                    return
+
+                self._load(yaml.safe_load(raw) or {}, digest)
+            except (OSError, yaml.YAMLError) as e:
+                if self._digest is None:
+                    raise
+                # Keep serving the last good pack while the file is mid-edit
+                logger.error(f"❌ Prompt reload failed, keeping v{self._pack_version}: {e}")
+
+    def _load(self, data: Dict[str, Any], digest: str) -> None:
+        active: Dict[str, PromptTemplate] = {}
+        for section in PROMPT_SECTIONS:
+            for name, prompt_data in (data.get(section) or {}).items():
+                template = PromptTemplate.from_yaml(name, section, prompt_data or {})
+                active[name] = template
+                self._by_version[(name, template.version)] = template
+
+        self._active = active
+        self._pack_version = str(data.get("version", "unknown"))
+        previous, self._digest = self._digest, digest
+
+        action = "Reloaded" if previous else "Loaded"
+        logger.info(
+            f"📝 {action} prompt pack v{self._pack_version} "
+            f"({len(active)} prompts, digest {digest})"
+        )
+
+    def reload(self) -> None:
+        """Force a re-parse of the prompt file"""
+        self._maybe_reload(force=True)
+
+    def get(self, name: str, version: Optional[str] = None) -> Optional[PromptTemplate]:
+        """Active prompt by name, or a specific previously loaded version"""
+        self._ensure_loaded()
+        if version is None:
+            return self._active.get(name)
+        return self._by_version.get((name, version))
+
+    def render(self, name: str, version: Optional[str] = None, **values: Any) -> str:
+        """Render a prompt template by name"""
+        template = self.get(name, version)
+        if template is None:
+            raise KeyError(f"Prompt '{name}' not found")
+        return template.render(**values)
+
+    def names(self, section: Optional[str] = None) -> List[str]:
+        """Names of the active prompts, optionally limited to one section"""
+        self._ensure_loaded()
+        return [
+            name for name, template in self._active.items()
+            if section is None or template.section == section
+        ]
+
+
+# Global registry instance
+prompt_registry = PromptRegistry()
@@ -8,8 +8,16 @@ from .otel_config import (
     get_tracer,
     get_meter,
     create_gen_ai_span,
+    traced_gen_ai,
+    iterate_in_span,
     otel_config
 )
+from .export_pipeline import ExportSettings, CountingBatchSpanProcessor
+from .sampling import RateLimitingSampler, TailSamplingSpanProcessor, create_sampler
+from .gen_ai_metrics import track_request, timed_node
+from .pii_redaction import PIIRedactor, pii_redactor
+from .logging_config import LazyJson, setup_logging
+from .loop_monitor import LoopLagMonitor, loop_lag_monitor
 
 __version__ = "2.1.0"
 __all__ = [
@@ -17,5 +25,20 @@ __all__ = [
     "get_tracer", 
     "get_meter",
     "create_gen_ai_span",
-    "otel_config"
+    "traced_gen_ai",
+    "iterate_in_span",
+    "otel_config",
+    "ExportSettings",
+    "CountingBatchSpanProcessor",
+    "RateLimitingSampler",
+    "TailSamplingSpanProcessor",
+    "create_sampler",
+    "track_request",
+    "timed_node",
+    "PIIRedactor",
+    "pii_redactor",
+    "LazyJson",
+    "setup_logging",
+    "LoopLagMonitor",
+    "loop_lag_monitor"
 ]
\ No newline at end of file
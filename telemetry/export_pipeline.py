@@ -0,0 +1,176 @@
+"""
+AutonomesAI v2.1 - Telemetry Export Pipeline
+OTLP (gRPC/HTTP) exporters and tunable batching from environment variables
+
+Uses the standard OTEL_* variable names so the same settings work for the
+collector, Jaeger and any OTLP-compatible backend.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from opentelemetry import metrics
+from opentelemetry.sdk.metrics.export import (
+    ConsoleMetricExporter,
+    MetricExporter,
+    PeriodicExportingMetricReader,
+)
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SpanExporter
+
+logger = logging.getLogger(__name__)
+
+# Proxy meter: binds to the real MeterProvider once metrics are set up
+meter = metrics.get_meter(__name__)
+
+dropped_spans_counter = meter.create_counter(
+    "autonomes.otel.spans.dropped",
+    unit="{span}",
+    description="Finished spans dropped because the export queue was full"
+)
+
+EXPORTER_OTLP = "otlp"
+EXPORTER_CONSOLE = "console"
+EXPORTER_NONE = "none"
+
+PROTOCOL_GRPC = "grpc"
+PROTOCOL_HTTP = "http/protobuf"
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+@dataclass
+class ExportSettings:
+    """
+    Export configuration. Defaults: OTLP when an endpoint is configured,
+    otherwise console output (when enabled) for local development.
+    """
+    traces_exporter: str = EXPORTER_CONSOLE
+    metrics_exporter: str = EXPORTER_CONSOLE
+    endpoint: Optional[str] = None
+    protocol: str = PROTOCOL_HTTP
+    insecure: bool = True
+    max_queue_size: int = 2048
+    max_export_batch_size: int = 512
+    schedule_delay_millis: int = 5000
+    export_timeout_millis: int = 30000
+    metric_export_interval_millis: int = 60000
+
+    @classmethod
+    def from_env(cls, enable_console_export: bool = True) -> "ExportSettings":
+        endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT") or None
+        default_exporter = EXPORTER_OTLP if endpoint else (
+            EXPORTER_CONSOLE if enable_console_export else EXPORTER_NONE
+        )
+        return cls(
+            traces_exporter=os.getenv("OTEL_TRACES_EXPORTER", default_exporter).lower(),
+            metrics_exporter=os.getenv("OTEL_METRICS_EXPORTER", default_exporter).lower(),
+            endpoint=endpoint,
+            protocol=os.getenv("OTEL_EXPORTER_OTLP_PROTOCOL", PROTOCOL_HTTP).lower(),
+            insecure=os.getenv("OTEL_EXPORTER_OTLP_INSECURE", "true").lower() in ("1", "true", "yes"),
+            max_queue_size=_env_int("OTEL_BSP_MAX_QUEUE_SIZE", 2048),
+            max_export_batch_size=_env_int("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", 512),
+            schedule_delay_millis=_env_int("OTEL_BSP_SCHEDULE_DELAY", 5000),
+            export_timeout_millis=_env_int("OTEL_BSP_EXPORT_TIMEOUT", 30000),
+            metric_export_interval_millis=_env_int("OTEL_METRIC_EXPORT_INTERVAL", 60000)
+        )
+
+    def signal_endpoint(self, signal: str) -> Optional[str]:
+        specific = os.getenv(f"OTEL_EXPORTER_OTLP_{signal.upper()}_ENDPOINT")
+        if specific:
+            return specific
+        if self.endpoint is None or self.protocol == PROTOCOL_GRPC:
+            return self.endpoint
+        # OTLP/HTTP: the generic endpoint is a base URL, one path per signal
+        return f"{self.endpoint.rstrip('/')}/v1/{signal}"
+
+
+class CountingBatchSpanProcessor(BatchSpanProcessor):
+    """
+    BatchSpanProcessor that counts spans dropped on queue overflow.
+
+    The SDK drops the oldest queued span when the queue is full and only
+    logs a warning once; this exposes every drop as a metric.
+    """
+
+    def __init__(self, span_exporter: SpanExporter, **kwargs):
+        super().__init__(span_exporter, **kwargs)
+        self.dropped_spans = 0
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if not self.done and span.context.trace_flags.sampled and len(self.queue) >= self.max_queue_size:
+            self.dropped_spans += 1
+            dropped_spans_counter.add(1)
+        super().on_end(span)
+
+
+def create_span_exporter(settings: ExportSettings) -> Optional[SpanExporter]:
+    """Span exporter for `settings.traces_exporter`, or None when disabled"""
+    if settings.traces_exporter == EXPORTER_CONSOLE:
+        return ConsoleSpanExporter()
+    if settings.traces_exporter != EXPORTER_OTLP:
+        return None
+
+    endpoint = settings.signal_endpoint("traces")
+    try:
+        if settings.protocol == PROTOCOL_GRPC:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+            return OTLPSpanExporter(endpoint=endpoint, insecure=settings.insecure)
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=endpoint)
+    except ImportError:
+        logger.warning("⚠️ opentelemetry-exporter-otlp is not installed; span export disabled")
+        return None
+
+
+def create_metric_exporter(settings: ExportSettings) -> Optional[MetricExporter]:
+    """Metric exporter for `settings.metrics_exporter`, or None when disabled"""
+    if settings.metrics_exporter == EXPORTER_CONSOLE:
+        return ConsoleMetricExporter()
+    if settings.metrics_exporter != EXPORTER_OTLP:
+        return None
+
+    endpoint = settings.signal_endpoint("metrics")
+    try:
+        if settings.protocol == PROTOCOL_GRPC:
+            from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
+            return OTLPMetricExporter(endpoint=endpoint, insecure=settings.insecure)
+        from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+        return OTLPMetricExporter(endpoint=endpoint)
+    except ImportError:
+        logger.warning("⚠️ opentelemetry-exporter-otlp is not installed; metric export disabled")
+        return None
+
+
+def create_span_processor(settings: ExportSettings) -> Optional[CountingBatchSpanProcessor]:
+    exporter = create_span_exporter(settings)
+    if exporter is None:
+        return None
+    logger.info(
+        f"📤 Span export: {settings.traces_exporter} "
+        f"({settings.protocol if settings.traces_exporter == EXPORTER_OTLP else 'stdout'}), "
+        f"batch {settings.max_export_batch_size}, queue {settings.max_queue_size}, "
+        f"delay {settings.schedule_delay_millis}ms"
+    )
+    return CountingBatchSpanProcessor(
+        exporter,
+        max_queue_size=settings.max_queue_size,
+        max_export_batch_size=settings.max_export_batch_size,
+        schedule_delay_millis=settings.schedule_delay_millis,
+        export_timeout_millis=settings.export_timeout_millis
+    )
+
+
+def create_metric_reader(settings: ExportSettings) -> Optional[PeriodicExportingMetricReader]:
+    exporter = create_metric_exporter(settings)
+    if exporter is None:
+        return None
+    return PeriodicExportingMetricReader(
+        exporter,
+        export_interval_millis=settings.metric_export_interval_millis
+    )
@@ -0,0 +1,216 @@
+"""
+AutonomesAI v2.1 - Gen-AI Metrics
+Pre-created instruments for request latency, TTFT, throughput and errors
+
+Instruments are created once at import; hot paths only call record/add
+with small attribute dicts (model + endpoint).
+"""
+
+import functools
+import inspect
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from opentelemetry import metrics
+from opentelemetry.sdk.metrics.view import ExplicitBucketHistogramAggregation, View
+
+logger = logging.getLogger(__name__)
+
+# Proxy meter: binds to the real MeterProvider once metrics are set up
+meter = metrics.get_meter(__name__)
+
+# A single uninterrupted step of an async node longer than this is logged
+SLOW_STEP_WARNING = float(os.getenv("AUTONOMES_LOOP_BLOCK_WARN_MS", "100")) / 1000
+
+# Seconds; LLM calls span milliseconds (cache hits) to minutes (long generations)
+DURATION_BUCKETS = (0.01, 0.02, 0.04, 0.08, 0.16, 0.32, 0.64, 1.28, 2.56, 5.12, 10.24, 20.48, 40.96, 81.92)
+TTFT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+TOKENS_PER_SECOND_BUCKETS = (1, 2, 5, 10, 20, 30, 50, 75, 100, 150, 200, 300, 500)
+TOKEN_COUNT_BUCKETS = (1, 4, 16, 64, 256, 1024, 4096, 16384, 65536)
+NODE_DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+request_duration = meter.create_histogram(
+    "gen_ai.client.operation.duration",
+    unit="s",
+    description="End-to-end API request duration"
+)
+time_to_first_token = meter.create_histogram(
+    "gen_ai.server.time_to_first_token",
+    unit="s",
+    description="Time from request start until the first generated token was sent"
+)
+tokens_per_second = meter.create_histogram(
+    "autonomes.gen_ai.tokens_per_second",
+    unit="{token}/s",
+    description="Ollama output tokens per second of evaluation time"
+)
+token_usage = meter.create_histogram(
+    "gen_ai.client.token.usage",
+    unit="{token}",
+    description="Tokens per request, by token type (input/output)"
+)
+upstream_duration = meter.create_histogram(
+    "autonomes.ollama.upstream.duration",
+    unit="s",
+    description="Ollama HTTP call latency per backend"
+)
+in_flight_requests = meter.create_up_down_counter(
+    "autonomes.http.requests.in_flight",
+    unit="{request}",
+    description="API requests currently being processed"
+)
+errors = meter.create_counter(
+    "autonomes.errors",
+    unit="{error}",
+    description="Failed requests by error type"
+)
+graph_node_duration = meter.create_histogram(
+    "autonomes.graph.node.duration",
+    unit="s",
+    description="LangGraph node execution time"
+)
+graph_node_loop_blocking = meter.create_histogram(
+    "autonomes.graph.node.loop_blocking",
+    unit="s",
+    description="Longest time an async LangGraph node held the event loop without awaiting, per run"
+)
+event_loop_lag = meter.create_histogram(
+    "autonomes.event_loop.lag",
+    unit="s",
+    description="How late the event loop woke a periodic probe (time spent blocked)"
+)
+
+# Histogram bucket boundaries, applied by the MeterProvider
+METRIC_VIEWS = [
+    View(instrument_name=name, aggregation=ExplicitBucketHistogramAggregation(boundaries))
+    for name, boundaries in (
+        ("gen_ai.client.operation.duration", DURATION_BUCKETS),
+        ("autonomes.ollama.upstream.duration", DURATION_BUCKETS),
+        ("gen_ai.server.time_to_first_token", TTFT_BUCKETS),
+        ("autonomes.gen_ai.tokens_per_second", TOKENS_PER_SECOND_BUCKETS),
+        ("gen_ai.client.token.usage", TOKEN_COUNT_BUCKETS),
+        ("autonomes.graph.node.duration", NODE_DURATION_BUCKETS),
+        ("autonomes.graph.node.loop_blocking", NODE_DURATION_BUCKETS),
+        ("autonomes.event_loop.lag", NODE_DURATION_BUCKETS),
+    )
+]
+
+
+def error_type(error: BaseException) -> str:
+    """Low-cardinality error label: HTTP status for HTTP errors, else the class name"""
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    return str(status) if isinstance(status, int) else type(error).__name__
+
+
+def record_error(error: BaseException, attributes: Dict[str, Any]) -> None:
+    errors.add(1, {**attributes, "error.type": error_type(error)})
+
+
+class RequestTimer:
+    """Timing handle for one API request (see `track_request`)"""
+
+    __slots__ = ("started", "attributes", "_first_token_recorded")
+
+    def __init__(self, attributes: Dict[str, Any]):
+        self.started = time.perf_counter()
+        self.attributes = attributes
+        self._first_token_recorded = False
+
+    def first_token(self) -> None:
+        """Record time-to-first-token once; later calls are no-ops"""
+        if not self._first_token_recorded:
+            self._first_token_recorded = True
+            time_to_first_token.record(time.perf_counter() - self.started, self.attributes)
+
+
+@contextmanager
+def track_request(endpoint: str, model: Optional[str] = None) -> Iterator[RequestTimer]:
+    """In-flight count, duration and errors for one API request"""
+    attributes = {"http.route": endpoint}
+    if model is not None:
+        attributes["gen_ai.request.model"] = model
+    timer = RequestTimer(attributes)
+    in_flight_requests.add(1, {"http.route": endpoint})
+    try:
+        yield timer
+    except Exception as e:
+        record_error(e, attributes)
+        raise
+    finally:
+        in_flight_requests.add(-1, {"http.route": endpoint})
+        request_duration.record(time.perf_counter() - timer.started, attributes)
+
+
+class _StepTimer:
+    """
+    Awaitable driving a coroutine one step at a time, timing each step: the
+    time between two of its awaits is time the event loop could not serve
+    anything else. Records the longest step when the coroutine finishes.
+    """
+
+    __slots__ = ("coro", "attributes")
+
+    def __init__(self, coro, attributes: Dict[str, Any]):
+        self.coro = coro
+        self.attributes = attributes
+
+    def __await__(self):
+        coro = self.coro
+        longest = 0.0
+        value, error = None, None
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    yielded = coro.send(value) if error is None else coro.throw(error)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    longest = max(longest, time.perf_counter() - started)
+                try:
+                    value, error = (yield yielded), None
+                except GeneratorExit:
+                    coro.close()
+                    raise
+                except BaseException as e:
+                    value, error = None, e
+        finally:
+            graph_node_loop_blocking.record(longest, self.attributes)
+            if longest >= SLOW_STEP_WARNING:
+                logger.warning(
+                    "🐢 Node '%s' blocked the event loop for %.0fms; offload blocking work",
+                    self.attributes["autonomes.graph.node"], longest * 1000
+                )
+
+
+def timed_node(name: str) -> Callable[[Callable], Callable]:
+    """
+    Record a LangGraph node's execution time (sync or async node).
+    Async nodes also record how long they held the event loop in one step.
+    """
+    attributes = {"autonomes.graph.node": name}
+
+    def decorator(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await _StepTimer(fn(*args, **kwargs), attributes)
+                finally:
+                    graph_node_duration.record(time.perf_counter() - started, attributes)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                graph_node_duration.record(time.perf_counter() - started, attributes)
+        return wrapper
+
+    return decorator
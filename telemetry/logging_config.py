@@ -0,0 +1,216 @@
+"""
+AutonomesAI v2.1 - Logging Configuration
+Queue-based, trace-correlated logging that keeps I/O off the event loop
+
+Handlers on the root logger only tag the record with the current trace/span
+ids and enqueue it; a QueueListener thread formats (text or JSON) and writes.
+Noisy INFO/DEBUG lines are rate-limited per module so bursts cannot swamp
+the queue.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from logging.handlers import QueueHandler, QueueListener
+
+from opentelemetry import metrics, trace
+
+from .sampling import TokenBucket
+
+# Proxy meter: binds to the real MeterProvider once metrics are set up
+meter = metrics.get_meter(__name__)
+
+dropped_logs_counter = meter.create_counter(
+    "autonomes.logs.dropped",
+    unit="{record}",
+    description="Log records dropped, by reason (sampled/queue_full)"
+)
+
+FORMAT_TEXT = "text"
+FORMAT_JSON = "json"
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [trace=%(trace_id)s span=%(span_id)s] %(message)s"
+
+# LogRecord attributes that are not user `extra` fields
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "trace_id", "span_id"
+}
+
+
+class LazyJson:
+    """Defers json.dumps of a payload until the record is actually formatted"""
+
+    __slots__ = ("payload", "indent")
+
+    def __init__(self, payload: Any, indent: Optional[int] = None):
+        self.payload = payload
+        self.indent = indent
+
+    def __str__(self) -> str:
+        return json.dumps(self.payload, indent=self.indent, default=str)
+
+
+class TraceContextFilter(logging.Filter):
+    """
+    Tags records with the current trace/span ids. Attached to the queue
+    handler, so it runs on the calling thread before the record is queued:
+    the contextvars holding the span are empty on the listener thread.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = trace.get_current_span().get_span_context()
+        if context.is_valid:
+            record.trace_id = format(context.trace_id, "032x")
+            record.span_id = format(context.span_id, "016x")
+        else:
+            record.trace_id = record.span_id = "-"
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate-limits records below WARNING to `rate` per second per logger,
+    with per-module overrides; WARNING and above always pass.
+    """
+
+    def __init__(self, rate: float = 0.0, overrides: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.rate = rate
+        self.overrides = overrides or {}
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, name: str) -> Optional[TokenBucket]:
+        bucket = self._buckets.get(name, False)
+        if bucket is False:
+            with self._lock:
+                rate = self.rate
+                # Longest matching module prefix wins
+                for prefix in sorted(self.overrides, key=len, reverse=True):
+                    if name == prefix or name.startswith(prefix + "."):
+                        rate = self.overrides[prefix]
+                        break
+                bucket = TokenBucket(rate) if rate > 0 else None
+                self._buckets[name] = bucket
+        return bucket
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        bucket = self._bucket(record.name)
+        if bucket is None or bucket.try_acquire():
+            return True
+        dropped_logs_counter.add(1, {"reason": "sampled"})
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with trace correlation and `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "trace_id": getattr(record, "trace_id", "-"),
+            "span_id": getattr(record, "span_id", "-"),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Enqueues records without formatting them; the listener thread does the
+    %-interpolation, so logged payloads must not be mutated after the call.
+    Records are dropped (and counted) when the queue is full.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            dropped_logs_counter.add(1, {"reason": "queue_full"})
+
+
+def _parse_overrides(value: str) -> Dict[str, float]:
+    """`module=rate,module=rate` -> {module: rate}"""
+    overrides = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, rate = item.partition("=")
+        overrides[name.strip()] = float(rate)
+    return overrides
+
+
+_listener: Optional[QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+def setup_logging(
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    queue_size: Optional[int] = None
+) -> None:
+    """
+    Configure root logging once per process (later calls are no-ops).
+
+    LOG_LEVEL, LOG_FORMAT (text/json; json outside development),
+    LOG_QUEUE_SIZE, LOG_SAMPLING_RATE (INFO lines/s per module, 0 = off) and
+    LOG_SAMPLING_OVERRIDES (`integrations.ollama_client=5,...`).
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+        environment = os.getenv("DEPLOYMENT_ENVIRONMENT", "development")
+        default_format = FORMAT_TEXT if environment == "development" else FORMAT_JSON
+        log_format = (log_format or os.getenv("LOG_FORMAT", default_format)).lower()
+        queue_size = queue_size or int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+        output = logging.StreamHandler(sys.stderr)
+        output.setFormatter(JsonFormatter() if log_format == FORMAT_JSON else logging.Formatter(TEXT_FORMAT))
+
+        handler = NonBlockingQueueHandler(queue.Queue(queue_size))
+        handler.addFilter(SamplingFilter(
+            rate=float(os.getenv("LOG_SAMPLING_RATE", "0")),
+            overrides=_parse_overrides(os.getenv("LOG_SAMPLING_OVERRIDES", ""))
+        ))
+        handler.addFilter(TraceContextFilter())
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(level)
+
+        _listener = QueueListener(handler.queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
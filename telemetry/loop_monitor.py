@@ -0,0 +1,70 @@
+"""
+AutonomesAI v2.1 - Event Loop Lag Monitor
+Measures how long the event loop is blocked, independent of who blocks it
+
+A background task sleeps for a fixed interval and records how late it was
+woken up. Any lateness is time the loop spent running something that did
+not await: every concurrent request was stalled for that long. Per-node
+blocking is recorded by `timed_node` (see gen_ai_metrics).
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from .gen_ai_metrics import event_loop_lag
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """Periodic probe of event loop responsiveness (start/stop on the loop it watches)"""
+
+    def __init__(self, interval: float = 0.25, warn_threshold: float = 0.1):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls) -> "LoopLagMonitor":
+        return cls(
+            interval=float(os.getenv("AUTONOMES_LOOP_LAG_INTERVAL_MS", "250")) / 1000,
+            warn_threshold=float(os.getenv("AUTONOMES_LOOP_BLOCK_WARN_MS", "100")) / 1000
+        )
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            event_loop_lag.record(lag)
+            if lag >= self.warn_threshold:
+                logger.warning("🐢 Event loop was blocked for %.0fms", lag * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "last_lag_ms": round(self.last_lag * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 2)
+        }
+
+
+# Global instance (started by the API on startup)
+loop_lag_monitor = LoopLagMonitor.from_env()
@@ -5,17 +5,26 @@ Sprint 0-B: Enhanced tracing with Gen-AI semantic conventions v1.34.0
 Production-ready observability setup following 2025 best practices.
 """
 
+import functools
+import inspect
 import os
-from typing import Dict, Any, Optional
+from contextlib import contextmanager
+from typing import Dict, Any, AsyncIterator, Callable, Iterator, Optional, TypeVar
 from opentelemetry import trace, metrics
+from opentelemetry.trace import Status, StatusCode
 from opentelemetry.sdk.resources import SERVICE_NAME, SERVICE_VERSION, DEPLOYMENT_ENVIRONMENT, Resource
 from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
-from opentelemetry.sdk.trace.sampling import TraceIdRatioBased
+from opentelemetry.sdk.trace.sampling import ALWAYS_ON, ParentBased, TraceIdRatioBased
 from opentelemetry.sdk.metrics import MeterProvider
-from opentelemetry.sdk.metrics.export import ConsoleMetricExporter, PeriodicExportingMetricReader
 import logging
 
+from .export_pipeline import ExportSettings, create_span_processor, create_metric_reader
+from .sampling import create_sampler, tail_sampling_from_env
+from .gen_ai_metrics import METRIC_VIEWS
+from .pii_redaction import pii_redactor, record_redactions
+
+T = TypeVar("T")
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,13 +40,17 @@ class AutonomesOTelConfig:
         service_version: str = "2.1.0",
         environment: str = "development",
         sampling_rate: float = 0.1,  # 10% sampling in dev, 100% in prod
-        enable_console_export: bool = True
+        enable_console_export: bool = True,
+        export_settings: Optional[ExportSettings] = None
     ):
         self.service_name = service_name
         self.service_version = service_version
         self.environment = environment
         self.sampling_rate = sampling_rate if environment != "production" else 1.0
         self.enable_console_export = enable_console_export
+        self.export_settings = export_settings or ExportSettings.from_env(enable_console_export)
+        self.span_processor = None
+        self.tail_sampler = None
         
         # Initialize telemetry
         self._setup_tracing()
@@ -58,13 +71,19 @@ class AutonomesOTelConfig:
             "ai.system.name": "langgraph"
         })
         
-        # Setup sampling - respect PII and performance
-        if self.environment == "development":
-            sampler = TraceIdRatioBased(self.sampling_rate)
+        # Setup sampling - respect PII and performance. Parent-based, so a
+        # trace is never split by a downstream service deciding differently.
+        sampler_name = os.getenv("OTEL_TRACES_SAMPLER")
+        if sampler_name:
+            sampler = create_sampler(sampler_name, os.getenv("OTEL_TRACES_SAMPLER_ARG"))
+            logger.info(f"🔍 Tracing: {sampler.get_description()}")
+        elif self.environment == "development":
+            sampler = ParentBased(TraceIdRatioBased(self.sampling_rate))
             logger.info(f"🔍 Tracing: {self.sampling_rate*100:.1f}% sampling rate for development")
         else:
-            sampler = TraceIdRatioBased(1.0)  # 100% in production
-            logger.info("🔍 Tracing: 100% sampling rate for production")
+            # Record everything; the tail sampler decides what is exported
+            sampler = ParentBased(ALWAYS_ON)
+            logger.info("🔍 Tracing: 100% head sampling for production, tail-sampled export")
         
         # Create tracer provider
         trace_provider = TracerProvider(
@@ -72,14 +91,15 @@ class AutonomesOTelConfig:
             sampler=sampler
         )
         
-        # Add span processors
-        if self.enable_console_export:
-            console_processor = BatchSpanProcessor(
-                ConsoleSpanExporter(),
-                max_export_batch_size=10,
-                export_timeout_millis=30000
+        # Add span processors (OTLP or console, batching tuned via OTEL_BSP_*)
+        self.span_processor = create_span_processor(self.export_settings)
+        if self.span_processor is not None:
+            # Tail sampling (on by default outside development) keeps errors and slow traces
+            self.tail_sampler = tail_sampling_from_env(
+                self.span_processor,
+                enabled_by_default=self.environment != "development"
             )
-            trace_provider.add_span_processor(console_processor)
+            trace_provider.add_span_processor(self.tail_sampler or self.span_processor)
         
         # Set global tracer provider
         trace.set_tracer_provider(trace_provider)
@@ -98,24 +118,35 @@ class AutonomesOTelConfig:
         
         # Setup metric readers
         readers = []
-        if self.enable_console_export:
-            readers.append(
-                PeriodicExportingMetricReader(
-                    ConsoleMetricExporter(),
-                    export_interval_millis=60000  # Export every minute
-                )
-            )
+        reader = create_metric_reader(self.export_settings)
+        if reader is not None:
+            readers.append(reader)
         
         # Create meter provider
         metrics.set_meter_provider(
             MeterProvider(
                 resource=resource,
-                metric_readers=readers
+                metric_readers=readers,
+                views=METRIC_VIEWS
             )
         )
         
         logger.info("✅ OpenTelemetry metrics initialized")
     
+    def export_stats(self) -> Dict[str, Any]:
+        """Exporter configuration and span drop count"""
+        settings = self.export_settings
+        return {
+            "traces_exporter": settings.traces_exporter,
+            "metrics_exporter": settings.metrics_exporter,
+            "protocol": settings.protocol if settings.endpoint else None,
+            "max_queue_size": settings.max_queue_size,
+            "max_export_batch_size": settings.max_export_batch_size,
+            "schedule_delay_millis": settings.schedule_delay_millis,
+            "dropped_spans": self.span_processor.dropped_spans if self.span_processor else 0,
+            "tail_sampling": self.tail_sampler is not None
+        }
+    
     def get_tracer(self, name: str) -> trace.Tracer:
         """Get tracer instance with proper naming"""
         return trace.get_tracer(name)
@@ -124,35 +155,65 @@ class AutonomesOTelConfig:
         """Get meter instance for custom metrics"""
         return metrics.get_meter(name)
     
+    @staticmethod
+    def _gen_ai_attributes(
+        operation_name: str,
+        model_name: str,
+        system_name: str,
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        attributes = {
+            # Required Gen-AI attributes
+            "gen_ai.system": system_name,
+            "gen_ai.operation.name": operation_name,
+            "gen_ai.request.model": model_name
+        }
+        # Optional but recommended attributes
+        for key in ("temperature", "max_tokens", "top_p"):
+            if key in kwargs:
+                attributes[f"gen_ai.request.{key}"] = kwargs[key]
+        return attributes
+    
+    @contextmanager
     def create_gen_ai_span(
         self,
         tracer: trace.Tracer,
         operation_name: str,
         model_name: str,
         system_name: str = "langgraph",
+        set_current: bool = True,
         **kwargs
-    ) -> trace.Span:
+    ) -> Iterator[trace.Span]:
         """
-        Create a span with Gen-AI semantic conventions v1.34.0
+        Span with Gen-AI semantic conventions v1.34.0, as a context manager.
+        
+        Attributes are passed at creation in one batch (and are visible to
+        samplers). The span is parented to the current context and, unless
+        `set_current` is False, becomes current for the block so nested spans
+        - across awaits and LangGraph node execution - are its children.
+        Async generators must pass `set_current=False` (see `iterate_in_span`):
+        a context attached across a `yield` leaks into the consumer.
         
         Following: https://opentelemetry.io/docs/specs/semconv/gen-ai/
         """
-        span = tracer.start_span(f"gen_ai.{operation_name}")
+        name = f"gen_ai.{operation_name}"
+        attributes = self._gen_ai_attributes(operation_name, model_name, system_name, kwargs)
         
-        # Required Gen-AI attributes
-        span.set_attribute("gen_ai.system", system_name)
-        span.set_attribute("gen_ai.operation.name", operation_name)
-        span.set_attribute("gen_ai.request.model", model_name)
+        if set_current:
+            with tracer.start_as_current_span(name, attributes=attributes) as span:
+                yield span
+            return
         
-        # Optional but recommended attributes
-        if "temperature" in kwargs:
-            span.set_attribute("gen_ai.request.temperature", kwargs["temperature"])
-        if "max_tokens" in kwargs:
-            span.set_attribute("gen_ai.request.max_tokens", kwargs["max_tokens"])
-        if "top_p" in kwargs:
-            span.set_attribute("gen_ai.request.top_p", kwargs["top_p"])
-        
-        return span
+        span = tracer.start_span(name, attributes=attributes)
+        try:
+            yield span
+        except Exception as e:
+            if span.is_recording():
+                span.record_exception(e)
+                span.set_status(Status(StatusCode.ERROR, str(e)))
+            raise
+        finally:
+            span.end()
     
     def add_gen_ai_response_attributes(
         self,
@@ -161,35 +222,47 @@ class AutonomesOTelConfig:
         usage_data: Optional[Dict[str, Any]] = None
     ) -> None:
         """Add Gen-AI response attributes to span"""
+        if not span.is_recording():
+            return
         
-        span.set_attribute("gen_ai.response.finish_reason", finish_reason)
-        
+        attributes = {"gen_ai.response.finish_reason": finish_reason}
         if usage_data:
             if "prompt_tokens" in usage_data:
-                span.set_attribute("gen_ai.usage.input_tokens", usage_data["prompt_tokens"])
+                attributes["gen_ai.usage.input_tokens"] = usage_data["prompt_tokens"]
             if "completion_tokens" in usage_data:
-                span.set_attribute("gen_ai.usage.output_tokens", usage_data["completion_tokens"])
+                attributes["gen_ai.usage.output_tokens"] = usage_data["completion_tokens"]
             if "total_tokens" in usage_data:
-                span.set_attribute("gen_ai.usage.total_tokens", usage_data["total_tokens"])
+                attributes["gen_ai.usage.total_tokens"] = usage_data["total_tokens"]
+        span.set_attributes(attributes)
+    
+    def add_cache_attributes(
+        self,
+        span: trace.Span,
+        cache_name: str,
+        hit: bool,
+        cache_key: Optional[str] = None
+    ) -> None:
+        """Record a cache lookup outcome on the span"""
+        if not span.is_recording():
+            return
+        attributes = {"autonomes.cache.name": cache_name, "autonomes.cache.hit": hit}
+        if cache_key:
+            # Short prefix only - enough to correlate, never the prompt itself
+            attributes["autonomes.cache.key"] = cache_key[:16]
+        span.set_attributes(attributes)
     
     def add_pii_protection_filter(self, span: trace.Span, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Filter out PII from trace data
         Sprint 0-B requirement: Protect PII in traces
-        """
-        
-        # List of potential PII fields to mask
-        pii_fields = ["email", "phone", "ssn", "credit_card", "password", "token", "api_key"]
-        
-        filtered_data = {}
-        for key, value in data.items():
-            if any(pii_field in key.lower() for pii_field in pii_fields):
-                filtered_data[key] = "[REDACTED]"
-                span.add_event("pii_filtered", {"field": key})
-            else:
-                filtered_data[key] = value
         
-        return filtered_data
+        Redacts sensitive keys and email/phone/card values at any nesting
+        level (see `telemetry.pii_redaction`), with one aggregated event.
+        """
+        filtered_data, counts = pii_redactor.redact(data)
+        record_redactions(span, counts)
+        # Callers own the result; never hand back the caller's own dict
+        return dict(filtered_data) if filtered_data is data else filtered_data
 
 
 # Global configuration instance
@@ -207,6 +280,48 @@ def get_meter(name: str):
     """Get configured meter instance"""
     return otel_config.get_meter(name)
 
-def create_gen_ai_span(tracer: trace.Tracer, operation_name: str, model_name: str, **kwargs) -> trace.Span:
-    """Create Gen-AI semantic convention compliant span"""
-    return otel_config.create_gen_ai_span(tracer, operation_name, model_name, **kwargs)
\ No newline at end of file
+def create_gen_ai_span(tracer: trace.Tracer, operation_name: str, model_name: str, **kwargs):
+    """Create Gen-AI semantic convention compliant span (context manager)"""
+    return otel_config.create_gen_ai_span(tracer, operation_name, model_name, **kwargs)
+
+def traced_gen_ai(operation_name: str, model_name: str, **span_kwargs) -> Callable[[Callable], Callable]:
+    """
+    Decorator running a sync or async function (client method, graph node)
+    inside a current Gen-AI span; use `trace.get_current_span()` inside.
+    """
+    def decorator(fn: Callable) -> Callable:
+        tracer = get_tracer(fn.__module__)
+        
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with otel_config.create_gen_ai_span(tracer, operation_name, model_name, **span_kwargs):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with otel_config.create_gen_ai_span(tracer, operation_name, model_name, **span_kwargs):
+                return fn(*args, **kwargs)
+        return wrapper
+    
+    return decorator
+
+async def iterate_in_span(span: trace.Span, source: AsyncIterator[T]) -> AsyncIterator[T]:
+    """
+    Iterate `source` with `span` current while each item is produced, but
+    not while the consumer holds it, so the context never leaks across a
+    `yield`. Closing this iterator closes `source`.
+    """
+    try:
+        while True:
+            with trace.use_span(span, record_exception=False, set_status_on_exception=False):
+                try:
+                    item = await source.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield item
+    finally:
+        aclose = getattr(source, "aclose", None)
+        if aclose is not None:
+            await aclose()
\ No newline at end of file
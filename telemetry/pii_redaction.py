@@ -0,0 +1,176 @@
+"""
+AutonomesAI v2.1 - PII Redaction
+Single-pass redaction of sensitive keys and values in spans and graph state
+
+Keys are matched by one precompiled pattern (decisions cached per key);
+string values are scanned once for emails, phone numbers and card numbers.
+Nested state (`messages`, `data`) is traversed up to a depth/size cap and
+only the containers that actually changed are copied.
+"""
+
+import logging
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, Tuple
+
+from opentelemetry import metrics, trace
+
+logger = logging.getLogger(__name__)
+
+# Proxy meter: binds to the real MeterProvider once metrics are set up
+meter = metrics.get_meter(__name__)
+
+redactions_counter = meter.create_counter(
+    "autonomes.pii.redactions",
+    unit="{redaction}",
+    description="Redacted keys and values, by kind (key/email/phone/card)"
+)
+
+REDACTED = "[REDACTED]"
+
+KIND_KEY = "key"
+KIND_EMAIL = "email"
+KIND_PHONE = "phone"
+KIND_CARD = "card"
+# Parts of a payload left unscanned because they exceed the depth/size cap
+UNSCANNED = "unscanned"
+
+# Whole key segments only: `access_token` is sensitive, `total_tokens` is not
+_SENSITIVE_KEY = re.compile(
+    r"(?:^|_)(?:e_?mail|phone(?:_?number)?|ssn|credit_?card|card_?number|"
+    r"password|passwd|secret|token|api_?key|auth(?:orization)?)(?:_|$)"
+)
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_KEY_SEPARATORS = re.compile(r"[\s.\-]+")
+
+# One alternation, one scan per string; cards before phones (longer digit runs).
+# A phone needs a leading `+`, a `(area)` code or separated groups: a bare
+# 10-digit run is far more often an epoch timestamp, token count or numeric ID.
+_SENSITIVE_VALUE = re.compile(
+    r"(?P<email>\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b)"
+    r"|(?P<card>\b\d(?:[ -]?\d){12,18}\b)"
+    r"|(?P<phone>(?<!\w)(?:"
+    r"\+\d{1,3}[ .-]?\(?\d{3}\)?[ .-]?\d{3}[ .-]?\d{4}"
+    r"|(?:\d{1,3}[ .-])?\(\d{3}\)[ .-]?\d{3}[ .-]?\d{4}"
+    r"|(?:\d{1,3}[ .-])?\d{3}[ .-]\d{3}[ .-]\d{4}"
+    r")\b)"
+)
+# Shortest string any value pattern can match ("a@b.cd")
+_MIN_VALUE_LENGTH = 6
+
+
+def _luhn_valid(number: str) -> bool:
+    digits = [int(c) for c in number if c.isdigit()]
+    checksum = 0
+    for i, digit in enumerate(reversed(digits)):
+        if i % 2:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        checksum += digit
+    return checksum % 10 == 0
+
+
+class PIIRedactor:
+    """
+    Redacts sensitive keys and values in (nested) dicts, lists and strings.
+
+    Traversal stops below `max_depth` levels or after `max_items` values;
+    anything past the cap is passed through unscanned and counted as such.
+    """
+
+    def __init__(self, max_depth: int = 8, max_items: int = 2000, max_cached_keys: int = 4096):
+        self.max_depth = max_depth
+        self.max_items = max_items
+        self.max_cached_keys = max_cached_keys
+        self._key_decisions: Dict[str, bool] = {}
+
+    @classmethod
+    def from_env(cls) -> "PIIRedactor":
+        return cls(
+            max_depth=int(os.getenv("AUTONOMES_PII_MAX_DEPTH", "8")),
+            max_items=int(os.getenv("AUTONOMES_PII_MAX_ITEMS", "2000"))
+        )
+
+    def is_sensitive_key(self, key: str) -> bool:
+        decision = self._key_decisions.get(key)
+        if decision is None:
+            normalized = _KEY_SEPARATORS.sub("_", _CAMEL_BOUNDARY.sub("_", key)).lower()
+            decision = _SENSITIVE_KEY.search(normalized) is not None
+            if len(self._key_decisions) >= self.max_cached_keys:
+                self._key_decisions.clear()
+            self._key_decisions[key] = decision
+        return decision
+
+    def redact_text(self, text: str, counts: Counter) -> str:
+        """`text` with emails, phone numbers and (Luhn-valid) card numbers redacted"""
+        if len(text) < _MIN_VALUE_LENGTH:
+            return text
+
+        def replace(match: "re.Match[str]") -> str:
+            kind = match.lastgroup
+            if kind == KIND_CARD and not _luhn_valid(match.group()):
+                return match.group()
+            counts[kind] += 1
+            return REDACTED
+
+        return _SENSITIVE_VALUE.sub(replace, text)
+
+    def redact(self, data: Any) -> Tuple[Any, Counter]:
+        """
+        Redacted copy of `data` plus redaction counts by kind.
+        Unchanged nested containers are shared with the input, not copied.
+        """
+        counts: Counter = Counter()
+        budget = [self.max_items]
+        return self._redact(data, 0, budget, counts), counts
+
+    def _redact(self, value: Any, depth: int, budget: list, counts: Counter) -> Any:
+        if isinstance(value, str):
+            return self.redact_text(value, counts)
+        if not isinstance(value, (dict, list, tuple)):
+            return value
+        if depth >= self.max_depth or budget[0] <= 0:
+            counts[UNSCANNED] += 1
+            return value
+
+        budget[0] -= len(value)
+        if isinstance(value, dict):
+            result = None
+            for key, item in value.items():
+                if isinstance(key, str) and self.is_sensitive_key(key):
+                    counts[KIND_KEY] += 1
+                    redacted = REDACTED
+                else:
+                    redacted = self._redact(item, depth + 1, budget, counts)
+                if redacted is not item and result is None:
+                    result = dict(value)
+                if result is not None:
+                    result[key] = redacted
+            return value if result is None else result
+
+        items = None
+        for i, item in enumerate(value):
+            redacted = self._redact(item, depth + 1, budget, counts)
+            if redacted is not item and items is None:
+                items = list(value)
+            if items is not None:
+                items[i] = redacted
+        if items is None:
+            return value
+        return tuple(items) if isinstance(value, tuple) else items
+
+
+def record_redactions(span: trace.Span, counts: Counter) -> None:
+    """One aggregated span event and metric update per redaction pass"""
+    if not counts:
+        return
+    for kind, count in counts.items():
+        redactions_counter.add(count, {"autonomes.pii.kind": kind})
+    if span.is_recording():
+        span.add_event("pii_filtered", {f"autonomes.pii.{kind}": count for kind, count in counts.items()})
+
+
+# Global redactor instance
+pii_redactor = PIIRedactor.from_env()
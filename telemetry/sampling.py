@@ -0,0 +1,269 @@
+"""
+AutonomesAI v2.1 - Trace Sampling
+Parent-based, rate-limited and tail-based sampling for gen-AI traces
+
+Head samplers bound how many traces are recorded; the tail processor
+decides after a trace finishes, always keeping errors and slow requests
+while the healthy fast path is kept at a fixed rate.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Sequence
+
+from opentelemetry import metrics
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.sampling import (
+    ALWAYS_ON,
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import Link, SpanKind, StatusCode
+from opentelemetry.util.types import Attributes
+
+logger = logging.getLogger(__name__)
+
+# Proxy meter: binds to the real MeterProvider once metrics are set up
+meter = metrics.get_meter(__name__)
+
+tail_decisions_counter = meter.create_counter(
+    "autonomes.otel.traces.tail_decisions",
+    unit="{trace}",
+    description="Tail sampling decisions, by reason (error/slow/baseline/dropped)"
+)
+
+KEEP_ERROR = "error"
+KEEP_SLOW = "slow"
+KEEP_BASELINE = "baseline"
+DROP = "dropped"
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `burst`"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+class RateLimitingSampler(Sampler):
+    """Samples at most `traces_per_second` new root traces"""
+
+    def __init__(self, traces_per_second: float):
+        self.traces_per_second = traces_per_second
+        self._bucket = TokenBucket(traces_per_second)
+
+    def should_sample(
+        self,
+        parent_context: Optional[Context],
+        trace_id: int,
+        name: str,
+        kind: Optional[SpanKind] = None,
+        attributes: Attributes = None,
+        links: Optional[Sequence[Link]] = None,
+        trace_state=None
+    ) -> SamplingResult:
+        decision = Decision.RECORD_AND_SAMPLE if self._bucket.try_acquire() else Decision.DROP
+        return SamplingResult(decision, attributes if decision.is_sampled() else None)
+
+    def get_description(self) -> str:
+        return f"RateLimitingSampler{{{self.traces_per_second}/s}}"
+
+
+def create_sampler(name: str, arg: Optional[str] = None) -> Sampler:
+    """
+    Head sampler from an OTEL_TRACES_SAMPLER-style name: always_on,
+    traceidratio, ratelimited, or any of them prefixed with `parentbased_`.
+    """
+    name = name.lower()
+    parent_based = name.startswith("parentbased_")
+    kind = name[len("parentbased_"):] if parent_based else name
+
+    if kind == "always_on":
+        root = ALWAYS_ON
+    elif kind == "traceidratio":
+        root = TraceIdRatioBased(float(arg) if arg else 1.0)
+    elif kind == "ratelimited":
+        root = RateLimitingSampler(float(arg) if arg else 10.0)
+    else:
+        raise ValueError(f"Unsupported sampler '{name}'")
+
+    return ParentBased(root) if parent_based else root
+
+
+class LatencyTracker:
+    """
+    Rolling latency percentile over the last `window` root spans.
+    The threshold is recomputed every `recompute_every` samples, not per span.
+    """
+
+    def __init__(self, percentile: float = 0.95, window: int = 1024, min_samples: int = 50, recompute_every: int = 64):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.recompute_every = recompute_every
+        self._samples: Deque[int] = deque(maxlen=window)
+        self._since_recompute = 0
+        self._threshold: Optional[int] = None
+
+    def threshold(self) -> Optional[int]:
+        """Current percentile in ns, or None until enough samples were seen"""
+        return self._threshold
+
+    def record(self, duration_ns: int) -> None:
+        self._samples.append(duration_ns)
+        self._since_recompute += 1
+        if len(self._samples) >= self.min_samples and (
+            self._threshold is None or self._since_recompute >= self.recompute_every
+        ):
+            ordered = sorted(self._samples)
+            self._threshold = ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+            self._since_recompute = 0
+
+
+def _is_error(span: ReadableSpan) -> bool:
+    if span.status.status_code == StatusCode.ERROR:
+        return True
+    # Handlers in this repo mark failures via the finish reason rather than status
+    return (span.attributes or {}).get("gen_ai.response.finish_reason") == "error"
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """
+    Buffers spans per trace and decides when the local root span ends.
+
+    Kept: any trace with an error, any trace whose root is at or above the
+    latency percentile, and up to `baseline_per_second` other traces.
+    Everything kept is forwarded to `downstream` (the export processor).
+
+    At most `max_traces` traces and `max_spans_per_trace` spans per trace
+    are buffered; overflowing traces are decided early on what was seen.
+    """
+
+    def __init__(
+        self,
+        downstream: SpanProcessor,
+        latency_percentile: float = 0.95,
+        baseline_per_second: float = 1.0,
+        max_traces: int = 10000,
+        max_spans_per_trace: int = 512
+    ):
+        self.downstream = downstream
+        self.latency = LatencyTracker(latency_percentile)
+        self.baseline = TokenBucket(baseline_per_second)
+        self.max_traces = max_traces
+        self.max_spans_per_trace = max_spans_per_trace
+
+        self._pending: "OrderedDict[int, List[ReadableSpan]]" = OrderedDict()
+        self._errors: Dict[int, bool] = {}
+        # Decisions for recently finished traces, for spans ending after their root
+        self._decided: "OrderedDict[int, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        self.downstream.on_start(span, parent_context)
+
+    def _is_local_root(self, span: ReadableSpan) -> bool:
+        return span.parent is None or span.parent.is_remote
+
+    def _decide(self, trace_id: int, root: Optional[ReadableSpan]) -> str:
+        if self._errors.pop(trace_id, False):
+            return KEEP_ERROR
+        if root is not None:
+            duration = root.end_time - root.start_time
+            threshold = self.latency.threshold()
+            self.latency.record(duration)
+            if threshold is not None and duration >= threshold:
+                return KEEP_SLOW
+        return KEEP_BASELINE if self.baseline.try_acquire() else DROP
+
+    def _remember(self, trace_id: int, keep: bool) -> None:
+        self._decided[trace_id] = keep
+        if len(self._decided) > self.max_traces:
+            self._decided.popitem(last=False)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        trace_id = span.context.trace_id
+        forward: List[ReadableSpan] = []
+
+        with self._lock:
+            decided = self._decided.get(trace_id)
+            if decided is not None:
+                forward = [span] if decided else []
+            else:
+                spans = self._pending.setdefault(trace_id, [])
+                spans.append(span)
+                if _is_error(span):
+                    self._errors[trace_id] = True
+
+                root = span if self._is_local_root(span) else None
+                evicted = None
+                if root is None and len(spans) >= self.max_spans_per_trace:
+                    evicted = trace_id
+                elif root is None and len(self._pending) > self.max_traces:
+                    evicted = next(iter(self._pending))
+
+                if root is not None or evicted is not None:
+                    decided_id = trace_id if evicted is None else evicted
+                    reason = self._decide(decided_id, root)
+                    keep = reason != DROP
+                    self._remember(decided_id, keep)
+                    pending = self._pending.pop(decided_id)
+                    forward = pending if keep else []
+                    tail_decisions_counter.add(1, {"sampling.reason": reason})
+
+        for finished in forward:
+            self.downstream.on_end(finished)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            # Traces whose root never ended (e.g. at shutdown) are kept if they failed
+            for trace_id, spans in self._pending.items():
+                if self._errors.get(trace_id):
+                    for span in spans:
+                        self.downstream.on_end(span)
+            self._pending.clear()
+        self.downstream.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.downstream.force_flush(timeout_millis)
+
+
+def tail_sampling_from_env(
+    downstream: SpanProcessor,
+    enabled_by_default: bool = False
+) -> Optional[TailSamplingSpanProcessor]:
+    """Wrap `downstream` when AUTONOMES_TAIL_SAMPLING is enabled"""
+    default = "true" if enabled_by_default else "false"
+    if os.getenv("AUTONOMES_TAIL_SAMPLING", default).lower() not in ("1", "true", "yes"):
+        return None
+    processor = TailSamplingSpanProcessor(
+        downstream,
+        latency_percentile=float(os.getenv("AUTONOMES_TAIL_LATENCY_PERCENTILE", "0.95")),
+        baseline_per_second=float(os.getenv("AUTONOMES_TAIL_BASELINE_PER_SECOND", "1")),
+        max_traces=int(os.getenv("AUTONOMES_TAIL_MAX_TRACES", "10000"))
+    )
+    logger.info(
+        f"🎯 Tail sampling: keep errors and p{processor.latency.percentile * 100:.0f}+ latency, "
+        f"{processor.baseline.rate}/s baseline"
+    )
+    return processor
@@ -0,0 +1,14 @@
+"""
+AutonomesAI v2.1 - Test Configuration
+Puts the repository root on sys.path and keeps telemetry exporters quiet
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("OTEL_TRACES_EXPORTER", "none")
+os.environ.setdefault("OTEL_METRICS_EXPORTER", "none")
+# Session checkpoints stay in memory instead of data/sessions.db
+os.environ.setdefault("SESSION_DB_PATH", ":memory:")
@@ -0,0 +1,114 @@
+"""
+AutonomesAI v2.1 - Agent Team Tests
+Planner output parsing and the planner -> parallel branches -> merge graph
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+from graph import create_agent_team_graph, parse_plan
+
+
+def test_numbered_plan_items_become_subtasks():
+    text = "Here is the plan:\n1. Design the schema\n2) Write the migration\n  3. Add tests\n\nDone."
+    assert parse_plan(text) == ["Design the schema", "Write the migration", "Add tests"]
+
+
+def test_bulleted_plan_items_become_subtasks():
+    text = "- Design the schema\n* task: \"Write the migration\"\n- 'Add tests'"
+    assert parse_plan(text) == ["Design the schema", "Write the migration", "Add tests"]
+
+
+def test_yaml_sprint_plan_tasks_take_precedence():
+    text = (
+        "Plan below.\n"
+        "```yaml\n"
+        "sprint_plan:\n"
+        "  - sprint: 1\n"
+        "    tasks:\n"
+        "      - task: Design the schema\n"
+        "      - task: Write the migration\n"
+        "  - sprint: 2\n"
+        "    tasks:\n"
+        "      - task: Add tests\n"
+        "```\n"
+        "- not a subtask\n"
+    )
+    assert parse_plan(text) == ["Design the schema", "Write the migration", "Add tests"]
+
+
+def test_empty_or_unstructured_plans_have_no_subtasks():
+    assert parse_plan("") == []
+    assert parse_plan("I would start by looking at the schema, then test it.") == []
+    assert parse_plan("```yaml\nsprint_plan: [\n```") == []
+
+
+def test_subtasks_are_capped():
+    text = "\n".join(f"{index}. step {index}" for index in range(1, 11))
+    assert parse_plan(text, max_subtasks=3) == ["step 1", "step 2", "step 3"]
+
+
+class FakeAgents:
+    """Planner answers `plan`; coders finish in reverse plan order"""
+
+    def __init__(self, plan: str):
+        self.plan = plan
+        self.calls: List[tuple] = []
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, agent: str, task: str, data: Dict[str, Any]) -> str:
+        self.calls.append((agent, task))
+        if agent == "planner_agent":
+            return self.plan
+        if agent == "reviewer_agent":
+            return "lgtm"
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        # Later subtasks finish first
+        await asyncio.sleep(0.05 / len(self.calls))
+        self.running -= 1
+        return f"done: {task}"
+
+
+def run_team(agents: FakeAgents, max_subtasks: int = 8) -> Dict[str, Any]:
+    app = create_agent_team_graph(agents, max_subtasks=max_subtasks).compile()
+    return asyncio.run(app.ainvoke({
+        "messages": [{"role": "user", "content": "build the feature"}],
+        "status": "processing",
+        "data": {"model": "stub"},
+        "results": []
+    }))
+
+
+def test_branches_run_in_parallel_and_merge_in_plan_order():
+    agents = FakeAgents("1. first\n2. second\n3. third")
+    state = run_team(agents)
+
+    assert state["subtasks"] == ["first", "second", "third"]
+    assert agents.max_running == 3
+    # Coders finished third, second, first; the merge still follows the plan
+    finished = [task for agent, task in agents.calls if agent == "reviewer_agent"]
+    assert finished[0].startswith("Task: third")
+    assert [result["subtask"] for result in sorted(state["results"], key=lambda result: result["index"])] == [
+        "first", "second", "third"
+    ]
+    assert state["summary"].index("## 1. first") < state["summary"].index("## 2. second") \
+        < state["summary"].index("## 3. third")
+    assert "done: first\n\n### Review\n\nlgtm" in state["summary"]
+    assert state["messages"][-1] == {"role": "assistant", "content": state["summary"]}
+    assert state["status"] == "completed"
+
+
+def test_graph_caps_branches_at_max_subtasks():
+    state = run_team(FakeAgents("- a\n- b\n- c\n- d"), max_subtasks=2)
+    assert state["subtasks"] == ["a", "b"]
+    assert len(state["results"]) == 2
+
+
+def test_unparseable_plan_runs_the_request_as_one_branch():
+    agents = FakeAgents("")
+    state = run_team(agents)
+    assert state["subtasks"] == ["build the feature"]
+    assert ("coder_agent", "build the feature") in agents.calls
+    assert "## 1. build the feature" in state["summary"]
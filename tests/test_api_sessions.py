@@ -0,0 +1,52 @@
+"""
+AutonomesAI v2.1 - Session API Tests
+A session turn is only checkpointed together with its reply
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from api import main
+from integrations.health_monitor import CircuitOpenError
+
+
+def test_failed_generation_leaves_no_dangling_user_turn(monkeypatch):
+    session_id = f"test-{uuid.uuid4().hex}"
+    histories = []
+
+    async def failing_generate(**kwargs):
+        raise CircuitOpenError("Ollama circuit is open")
+
+    async def echo_generate(**kwargs):
+        histories.append(kwargs["history"])
+        return {"response": f"echo {kwargs['prompt']}", "usage": {}}
+
+    def request(message: str) -> main.ChatRequest:
+        return main.ChatRequest(message=message, session_id=session_id)
+
+    async def scenario():
+        monkeypatch.setattr(main.ollama_client, "generate", failing_generate)
+        with pytest.raises(HTTPException) as failure:
+            await main.chat_completion(request("lost"), x_tenant_id=None)
+        assert failure.value.status_code == 503
+        with pytest.raises(HTTPException) as missing:
+            await main.get_session(session_id)
+        assert missing.value.status_code == 404
+
+        monkeypatch.setattr(main.ollama_client, "generate", echo_generate)
+        await main.chat_completion(request("one"), x_tenant_id=None)
+        await main.chat_completion(request("two"), x_tenant_id=None)
+        return await main.get_session(session_id)
+
+    session = asyncio.run(scenario())
+    assert session["messages"] == [
+        {"role": "user", "content": "one"},
+        {"role": "assistant", "content": "echo one"},
+        {"role": "user", "content": "two"},
+        {"role": "assistant", "content": "echo two"}
+    ]
+    # Each turn was generated against the completed earlier turns only
+    assert histories == [[], session["messages"][:2]]
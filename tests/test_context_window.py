@@ -0,0 +1,98 @@
+"""
+AutonomesAI v2.1 - Context Window Tests
+Trimming history to the model's window keeps the system prompt and the latest turn
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+from integrations.context_window import SUMMARY_PREFIX, ContextWindowManager
+from integrations.token_accounting import MESSAGE_OVERHEAD_TOKENS, TokenCounter
+
+SYSTEM = {"role": "system", "content": "you are a helpful agent"}
+
+
+class WordCounter(TokenCounter):
+    """One token per whitespace-separated word, so budgets are exact"""
+
+    def _load_tokenizer(self, model: str):
+        return lambda text: len(text.split())
+
+
+def turn(index: int, words: int = 10) -> Dict[str, Any]:
+    role = "user" if index % 2 == 0 else "assistant"
+    return {"role": role, "content": " ".join([f"t{index}"] * words)}
+
+
+def conversation(turns: int) -> List[Dict[str, Any]]:
+    return [SYSTEM] + [turn(index) for index in range(turns)]
+
+
+def make_manager(**kwargs) -> ContextWindowManager:
+    kwargs.setdefault("summary_tokens", 10)
+    return ContextWindowManager(counter=WordCounter(), context_window=4096, **kwargs)
+
+
+def test_history_within_the_window_is_unchanged():
+    messages = conversation(6)
+    fitted = make_manager().fit("m", messages)
+    assert fitted.messages == messages
+    assert (fitted.summarized, fitted.dropped) == (0, 0)
+    assert fitted.prompt_tokens == 5 + 6 * 10 + 7 * MESSAGE_OVERHEAD_TOKENS
+
+
+def test_trimming_keeps_the_system_prompt_and_latest_turns():
+    messages = conversation(6)
+    # system 9 tokens, each turn 14: 60 - 9 - summary reserve 14 leaves room for two turns
+    fitted = make_manager(model_windows={"small": 60}).fit("small", messages)
+
+    assert fitted.messages == [SYSTEM] + messages[-2:]
+    assert fitted.limit == 60
+    assert fitted.prompt_tokens <= fitted.limit
+    assert (fitted.summarized, fitted.dropped) == (0, 4)
+
+    # Other models still use the default window
+    assert make_manager(model_windows={"small": 60}).fit("large", messages).messages == messages
+
+
+def test_reserved_output_tokens_and_prompt_budget_shrink_the_window():
+    manager = make_manager(model_windows={"m": 200})
+    assert manager.prompt_limit("m", max_tokens=140) == 60
+    assert manager.prompt_limit("m", budget=60) == 60
+    assert manager.fit("m", conversation(6), max_tokens=140).messages == manager.fit(
+        "m", conversation(6), budget=60
+    ).messages == [SYSTEM] + conversation(6)[-2:]
+
+
+def test_latest_turn_is_kept_even_when_it_alone_overflows():
+    messages = conversation(3) + [turn(3, words=100)]
+    fitted = make_manager(model_windows={"m": 60}).fit("m", messages)
+    assert fitted.messages == [SYSTEM, messages[-1]]
+    assert fitted.dropped == 3
+
+
+def test_dropped_turns_are_summarized_in_the_background():
+    folded = []
+
+    async def summarizer(model: str, previous: str, turns: List[Dict[str, Any]]) -> str:
+        folded.append(len(turns))
+        return "earlier turns"
+
+    async def scenario():
+        manager = make_manager(model_windows={"m": 60}, summarizer=summarizer)
+        messages = conversation(6)
+        first = manager.fit("m", messages)
+        await asyncio.gather(*manager._tasks)
+        second = manager.fit("m", messages)
+        await manager.close()
+        return messages, first, second
+
+    messages, first, second = asyncio.run(scenario())
+    # The first turn never waits on the summary
+    assert first.messages == [SYSTEM] + messages[-2:]
+    assert folded == [4]
+    assert second.messages == [
+        SYSTEM,
+        {"role": "system", "content": SUMMARY_PREFIX + "earlier turns"},
+    ] + messages[-2:]
+    assert (second.summarized, second.dropped) == (4, 0)
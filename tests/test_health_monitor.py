@@ -0,0 +1,121 @@
+"""
+AutonomesAI v2.1 - Health Monitor Tests
+Circuit breaker transitions and fail-fast upstream requests
+"""
+
+import asyncio
+import types
+
+import pytest
+from aiohttp import ClientResponseError
+
+from integrations import health_monitor
+from integrations.health_monitor import CircuitOpenError, CircuitState, OllamaHealthMonitor
+from integrations.ollama_client import OllamaClient
+from test_ollama_client import StubOllama
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+async def never_probed() -> bool:
+    raise AssertionError("the breaker must not probe from a synchronous caller")
+
+
+def make_monitor(monkeypatch) -> "tuple[OllamaHealthMonitor, FakeClock]":
+    clock = FakeClock()
+    monkeypatch.setattr(health_monitor, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    monitor = OllamaHealthMonitor(never_probed, failure_threshold=3, reset_timeout=15)
+    monitor.record_success()
+    return monitor, clock
+
+
+def test_breaker_opens_after_consecutive_failures_and_closes_after_a_good_trial(monkeypatch):
+    monitor, clock = make_monitor(monkeypatch)
+    for _ in range(2):
+        monitor.record_failure()
+    assert monitor.state == CircuitState.CLOSED
+    assert monitor.allow_request()
+
+    monitor.record_failure()
+    assert monitor.state == CircuitState.OPEN
+    assert not monitor.allow_request()
+    assert not monitor.is_healthy()
+    assert monitor.retry_after() == 15
+
+    clock.now += 15
+    assert monitor.state == CircuitState.HALF_OPEN
+    # A single trial goes through; everyone else keeps failing fast
+    assert monitor.allow_request()
+    assert not monitor.allow_request()
+
+    monitor.record_success()
+    assert monitor.state == CircuitState.CLOSED
+    assert monitor.snapshot()["consecutive_failures"] == 0
+    assert monitor.allow_request()
+
+
+def test_failed_trial_reopens_the_breaker(monkeypatch):
+    monitor, clock = make_monitor(monkeypatch)
+    for _ in range(3):
+        monitor.record_failure()
+    clock.now += 15
+    assert monitor.allow_request()
+
+    monitor.record_failure()
+    assert monitor.state == CircuitState.OPEN
+    assert monitor.retry_after() == 15
+
+
+def test_released_trial_lets_the_next_request_try(monkeypatch):
+    monitor, clock = make_monitor(monkeypatch)
+    for _ in range(3):
+        monitor.record_failure()
+    clock.now += 15
+    assert monitor.allow_request()
+
+    # e.g. the trial request was cancelled before Ollama answered
+    monitor.release_trial()
+    assert monitor.state == CircuitState.HALF_OPEN
+    assert monitor.allow_request()
+
+
+def test_post_fails_fast_while_the_circuit_is_open(monkeypatch):
+    monkeypatch.setenv("OLLAMA_CIRCUIT_FAILURE_THRESHOLD", "2")
+    monkeypatch.setenv("OLLAMA_CIRCUIT_RESET_TIMEOUT", "0.2")
+    monkeypatch.setenv("OLLAMA_HEALTH_TTL", "3600")
+    payload = {"model": "stub", "prompt": "hello", "stream": False}
+
+    async def scenario():
+        stub = StubOllama(fail_status=503)
+        client = OllamaClient(base_url=await stub.start())
+        try:
+            assert await client.health_check()
+            for _ in range(2):
+                with pytest.raises(ClientResponseError):
+                    await client._post("/api/generate", payload)
+            assert client.health_monitor.state == CircuitState.OPEN
+
+            with pytest.raises(CircuitOpenError):
+                await client._post("/api/generate", payload)
+            rejected_upstream_calls = len(stub.generate_calls)
+
+            await asyncio.sleep(0.25)
+            assert client.health_monitor.state == CircuitState.HALF_OPEN
+            stub.fail_status = None
+            result = await client._post("/api/generate", payload)
+        finally:
+            await client.close()
+            await stub.close()
+
+        # The open circuit rejected the request without reaching Ollama
+        assert rejected_upstream_calls == 2
+        assert result["response"] == "ok: hello"
+        assert client.health_monitor.state == CircuitState.CLOSED
+
+    asyncio.run(scenario())
@@ -0,0 +1,326 @@
+"""
+AutonomesAI v2.1 - Ollama Client Tests
+Failover, single-flight coalescing and batch partial failures against stub Ollama servers
+"""
+
+import asyncio
+import json
+import socket
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from integrations.ollama_client import OllamaClient
+from integrations.response_cache import ResponseCache
+
+
+class StubOllama:
+    """
+    In-process stand-in for one Ollama node.
+    `/api/generate` answers `reply`, or `fail_status` for every prompt
+    (or only prompts containing `fail_marker`), after `delay` seconds.
+    """
+
+    def __init__(
+        self,
+        reply: str = "ok",
+        fail_status: Optional[int] = None,
+        fail_marker: Optional[str] = None,
+        delay: float = 0.0
+    ):
+        self.reply = reply
+        self.fail_status = fail_status
+        self.fail_marker = fail_marker
+        self.delay = delay
+        self.generate_calls: List[Dict[str, Any]] = []
+
+        app = web.Application()
+        app.router.add_post("/api/generate", self._generate)
+        app.router.add_get("/api/ps", self._ps)
+        app.router.add_get("/api/tags", self._tags)
+        self.server = TestServer(app)
+
+    async def start(self) -> str:
+        await self.server.start_server()
+        return str(self.server.make_url("")).rstrip("/")
+
+    async def close(self) -> None:
+        await self.server.close()
+
+    async def _generate(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        self.generate_calls.append(payload)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        failing = self.fail_status is not None and (
+            self.fail_marker is None or self.fail_marker in payload["prompt"]
+        )
+        if failing:
+            return web.json_response({"error": "stub failure"}, status=self.fail_status)
+        if payload.get("stream"):
+            return await self._generate_stream(request, payload)
+        return web.json_response({
+            "model": payload["model"],
+            "response": f"{self.reply}: {payload['prompt']}",
+            "done": True,
+            # Distinct per call, so tests can tell which turn a context came from
+            "context": [len(self.generate_calls)] * 4,
+            "prompt_eval_count": 3,
+            "eval_count": 2
+        })
+
+    async def _generate_stream(self, request: web.Request, payload: Dict[str, Any]) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        for word in f"{self.reply}: {payload['prompt']}".split(" "):
+            await response.write(json.dumps({"response": word + " ", "done": False}).encode() + b"\n")
+            await asyncio.sleep(0.02)
+        await response.write(json.dumps({
+            "response": "",
+            "done": True,
+            "prompt_eval_count": 3,
+            "eval_count": 2
+        }).encode() + b"\n")
+        await response.write_eof()
+        return response
+
+    async def _ps(self, request: web.Request) -> web.Response:
+        return web.json_response({"models": []})
+
+    async def _tags(self, request: web.Request) -> web.Response:
+        return web.json_response({"models": [{"name": "stub:latest", "digest": "sha256:stub"}]})
+
+
+def make_client(*urls: str) -> OllamaClient:
+    return OllamaClient(base_url=",".join(urls))
+
+
+def unused_url() -> str:
+    """A local URL nothing listens on (connection refused)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def test_post_fails_over_to_next_backend_on_5xx():
+    async def scenario():
+        broken, healthy = StubOllama(fail_status=503), StubOllama(reply="from-b")
+        client = make_client(await broken.start(), await healthy.start())
+        try:
+            result = await client.generate("stub", "hello", cache=False)
+        finally:
+            await client.close()
+            await broken.close()
+            await healthy.close()
+
+        assert result["response"] == "from-b: hello"
+        assert len(broken.generate_calls) == 1
+        assert len(healthy.generate_calls) == 1
+        # The failover hid the node failure from the circuit breaker
+        assert client.health_monitor.snapshot()["consecutive_failures"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_post_fails_over_when_backend_is_unreachable():
+    async def scenario():
+        healthy = StubOllama(reply="from-b")
+        client = make_client(unused_url(), await healthy.start())
+        try:
+            result = await client.generate("stub", "hello", cache=False)
+        finally:
+            await client.close()
+            await healthy.close()
+
+        assert result["response"] == "from-b: hello"
+        assert len(healthy.generate_calls) == 1
+
+    asyncio.run(scenario())
+
+
+def test_post_does_not_fail_over_on_4xx():
+    async def scenario():
+        rejecting, healthy = StubOllama(fail_status=404), StubOllama()
+        client = make_client(await rejecting.start(), await healthy.start())
+        try:
+            try:
+                await client.generate("stub", "hello", cache=False)
+                raised = None
+            except Exception as e:
+                raised = e
+        finally:
+            await client.close()
+            await rejecting.close()
+            await healthy.close()
+
+        assert getattr(raised, "status", None) == 404
+        assert healthy.generate_calls == []
+
+    asyncio.run(scenario())
+
+
+def test_identical_concurrent_requests_are_coalesced():
+    async def scenario():
+        stub = StubOllama(delay=0.2)
+        client = make_client(await stub.start())
+        try:
+            results = await asyncio.gather(*(
+                client.generate("stub", "same prompt", cache=False) for _ in range(5)
+            ))
+            distinct = await client.generate("stub", "other prompt", cache=False)
+        finally:
+            await client.close()
+            await stub.close()
+
+        assert len(stub.generate_calls) == 2
+        assert {result["response"] for result in results} == {"ok: same prompt"}
+        assert distinct["response"] == "ok: other prompt"
+
+    asyncio.run(scenario())
+
+
+def test_identical_concurrent_streams_are_coalesced():
+    async def collect(client: OllamaClient, prompt: str) -> str:
+        stream = client.generate_stream("stub", prompt)
+        try:
+            return "".join([chunk["response"] async for chunk in stream])
+        finally:
+            await stream.aclose()
+
+    async def scenario():
+        stub = StubOllama()
+        client = make_client(await stub.start())
+        try:
+            texts = await asyncio.gather(*(collect(client, "same prompt") for _ in range(3)))
+        finally:
+            await client.close()
+            await stub.close()
+
+        assert len(stub.generate_calls) == 1
+        assert texts == ["ok: same prompt "] * 3
+
+    asyncio.run(scenario())
+
+
+def test_only_deterministic_generations_are_served_from_cache():
+    async def scenario():
+        stub = StubOllama()
+        client = OllamaClient(base_url=await stub.start(), response_cache=ResponseCache())
+        try:
+            cold = await client.generate("stub", "hello", temperature=0)
+            warm = await client.generate("stub", "hello", temperature=0)
+            after_cold = len(stub.generate_calls)
+            for _ in range(2):
+                await client.generate("stub", "hello", temperature=0.7)
+            after_sampled = len(stub.generate_calls)
+            # `cache=True` opts a sampled request into the cache
+            for _ in range(2):
+                await client.generate("stub", "hello", temperature=0.7, cache=True)
+        finally:
+            await client.close()
+            await stub.close()
+
+        assert warm == cold
+        assert after_cold == 1
+        assert after_sampled == 3
+        assert len(stub.generate_calls) == 4
+        assert client.response_cache.stats()["hits"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_generate_many_reports_partial_failures_in_order():
+    async def scenario():
+        stub = StubOllama(fail_status=404, fail_marker="fail")
+        client = make_client(await stub.start())
+        prompts = ["one", "fail two", "three", "fail four", "five"]
+        try:
+            outcomes = await client.generate_many(
+                [{"model": "stub", "prompt": prompt, "cache": False} for prompt in prompts],
+                concurrency=2
+            )
+        finally:
+            await client.close()
+            await stub.close()
+
+        assert [outcome["index"] for outcome in outcomes] == list(range(len(prompts)))
+        failed = [outcome["index"] for outcome in outcomes if "error" in outcome]
+        assert failed == [1, 3]
+        assert all(outcomes[index]["error_type"] == "ClientResponseError" for index in failed)
+        assert outcomes[0]["result"]["response"] == "ok: one"
+        assert outcomes[4]["result"]["response"] == "ok: five"
+
+    asyncio.run(scenario())
+
+
+def test_session_turn_reuses_the_previous_turns_context():
+    async def scenario():
+        stub = StubOllama()
+        client = make_client(await stub.start())
+        try:
+            first = await client.generate("stub", "hello", cache=False, history=[])
+            history = [{"role": "user", "content": "hello"}, {"role": "assistant", "content": first["response"]}]
+            await client.generate("stub", "again", cache=False, history=history)
+        finally:
+            await client.close()
+            await stub.close()
+
+        assert "context" not in first
+        assert "context" not in stub.generate_calls[0]
+        assert stub.generate_calls[1]["context"] == [1] * 4
+        assert stub.generate_calls[1]["prompt"] == "again"
+
+    asyncio.run(scenario())
+
+
+def test_shared_system_prompt_is_sent_once_per_conversation():
+    async def scenario():
+        stub = StubOllama()
+        client = make_client(await stub.start())
+        try:
+            # One-shot agent calls: nothing any other call could reuse is cached
+            for task in ("task a", "task b", "task c"):
+                await client.generate("stub", task, cache=False, system_prompt="coder_agent")
+            one_shot_entries = client.prefix_cache.stats()["entries"]
+
+            # A conversation under the same system prompt reuses its first turn
+            first = await client.generate("stub", "hello", cache=False, system_prompt="coder_agent", history=[])
+            history = [{"role": "user", "content": "hello"}, {"role": "assistant", "content": first["response"]}]
+            await client.generate("stub", "again", cache=False, system_prompt="coder_agent", history=history)
+        finally:
+            await client.close()
+            await stub.close()
+
+        assert one_shot_entries == 0
+        system = stub.generate_calls[0]["system"]
+        assert all(call["system"] == system and "context" not in call for call in stub.generate_calls[:4])
+        # The hit carries the system prompt inside the context instead of re-sending it
+        assert stub.generate_calls[4]["context"] == [4] * 4
+        assert "system" not in stub.generate_calls[4]
+
+    asyncio.run(scenario())
+
+
+def test_uncached_history_is_replayed_then_reused():
+    async def scenario():
+        stub = StubOllama()
+        client = make_client(await stub.start())
+        history = [{"role": "user", "content": "hello"}, {"role": "assistant", "content": "hi there"}]
+        try:
+            # e.g. after a restart: no context for this session yet
+            second = await client.generate("stub", "again", cache=False, history=history)
+            history += [{"role": "user", "content": "again"}, {"role": "assistant", "content": second["response"]}]
+            await client.generate("stub", "third", cache=False, history=history)
+        finally:
+            await client.close()
+            await stub.close()
+
+        replay = stub.generate_calls[0]
+        assert "context" not in replay
+        assert replay["prompt"] == "user: hello\n\nassistant: hi there\n\nagain"
+        # Back on the prefix path from the next turn on
+        assert stub.generate_calls[1]["context"] == [1] * 4
+        assert stub.generate_calls[1]["prompt"] == "third"
+
+    asyncio.run(scenario())
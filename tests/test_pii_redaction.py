@@ -0,0 +1,49 @@
+"""
+AutonomesAI v2.1 - PII Redaction Tests
+Value patterns: real phone numbers are redacted, bare digit runs are not
+"""
+
+from collections import Counter
+
+import pytest
+
+from telemetry.pii_redaction import KIND_PHONE, REDACTED, PIIRedactor
+
+
+@pytest.mark.parametrize("text", [
+    "call me at 555-123-4567",
+    "call me at 555.123.4567",
+    "call me at 555 123 4567",
+    "call me at (555) 123-4567",
+    "call me at (555)123-4567",
+    "call me at +1 555 123 4567",
+    "call me at +15551234567",
+    "call me at 1-555-123-4567",
+])
+def test_phone_numbers_are_redacted(text):
+    counts = Counter()
+    assert PIIRedactor().redact_text(text, counts) == f"call me at {REDACTED}"
+    assert counts == {KIND_PHONE: 1}
+
+
+@pytest.mark.parametrize("text", [
+    "created at 1718723032",          # epoch seconds
+    "created at 1718723032123",       # epoch milliseconds
+    "used 1048576000 tokens",         # token / byte counts
+    "order 4815162342 shipped",       # numeric ID
+    "trace 00000000001234567890",     # long zero-padded ID
+    "run 2024-06-18 at 16:23:52",     # dates and times
+])
+def test_bare_digit_runs_are_not_phone_numbers(text):
+    counts = Counter()
+    assert PIIRedactor().redact_text(text, counts) == text
+    assert counts == {}
+
+
+def test_numeric_fields_in_state_pass_through():
+    state = {"data": {"created": "1718723032", "request_id": "4815162342", "contact": "555-123-4567"}}
+    redacted, counts = PIIRedactor().redact(state)
+    assert redacted["data"]["created"] == "1718723032"
+    assert redacted["data"]["request_id"] == "4815162342"
+    assert redacted["data"]["contact"] == REDACTED
+    assert counts == {KIND_PHONE: 1}
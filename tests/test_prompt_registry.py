@@ -0,0 +1,74 @@
+"""
+AutonomesAI v2.1 - Prompt Registry Tests
+In-memory lookups and background hot reload of the prompt pack
+"""
+
+import time
+
+from prompt_registry import PromptRegistry
+
+PACK = """
+version: "{pack}"
+prompts:
+  greeter:
+    version: "{version}"
+    content: "Hello {{user}}"
+"""
+
+
+def write_pack(path, pack: str, version: str) -> None:
+    path.write_text(PACK.format(pack=pack, version=version))
+
+
+def wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class ForbiddenPath:
+    """Stands in for the prompt file once loaded; any filesystem access fails the test"""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"prompt lookup hit the filesystem ({name})")
+
+
+def test_lookups_do_not_touch_the_file(tmp_path):
+    path = tmp_path / "prompts.yaml"
+    write_pack(path, "1", "1.0.0")
+    registry = PromptRegistry(path, check_interval=0)
+    registry.start()
+    registry.path = ForbiddenPath()
+
+    assert registry.render("greeter", user="Ada") == "Hello Ada"
+    assert registry.names() == ["greeter"]
+    assert registry.pack_version == "1"
+
+
+def test_watcher_reloads_edits_and_keeps_old_versions(tmp_path):
+    path = tmp_path / "prompts.yaml"
+    write_pack(path, "1", "1.0.0")
+    registry = PromptRegistry(path, check_interval=0.02)
+    registry.start()
+    try:
+        write_pack(path, "2", "2.0.0")
+        assert wait_for(lambda: registry.pack_version == "2")
+        assert registry.get("greeter").version == "2.0.0"
+        assert registry.get("greeter", "1.0.0") is not None
+    finally:
+        registry.stop()
+
+
+def test_manual_reload_without_watcher(tmp_path):
+    path = tmp_path / "prompts.yaml"
+    write_pack(path, "1", "1.0.0")
+    registry = PromptRegistry(path, check_interval=0)
+    assert registry.pack_version == "1"
+
+    write_pack(path, "2", "2.0.0")
+    assert registry.pack_version == "1"
+    registry.reload()
+    assert registry.pack_version == "2"
@@ -0,0 +1,118 @@
+"""
+AutonomesAI v2.1 - Pull Job Tests
+One job per model, throttled progress updates and failed pulls
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+from integrations.pull_jobs import JOB_COMPLETED, JOB_FAILED, JOB_RUNNING, PullJobManager
+
+
+class FakePull:
+    """Stands in for OllamaClient.pull_model; the test feeds it progress lines"""
+
+    def __init__(self):
+        self.lines: "asyncio.Queue" = asyncio.Queue()
+        self.calls: List[str] = []
+
+    async def __call__(self, model: str):
+        self.calls.append(model)
+        while True:
+            line = await self.lines.get()
+            if line is None:
+                return
+            yield line
+
+    async def send(self, *lines: Dict[str, Any]) -> None:
+        for line in lines:
+            self.lines.put_nowait(line)
+        await settle()
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_pulls_of_a_model_share_one_job():
+    async def scenario():
+        pull = FakePull()
+        manager = PullJobManager(pull)
+        job, created = manager.start("llama3")
+        same, joined = manager.start("llama3:latest")
+        other, other_created = manager.start("mistral")
+        await settle()
+        assert (created, joined, other_created) == (True, False, True)
+        assert same is job and other is not job
+        assert sorted(pull.calls) == ["llama3:latest", "mistral:latest"]
+
+        await pull.send({"status": "success"}, {"status": "success"})
+        assert job.status == other.status == JOB_COMPLETED
+        # A finished job is not joined: pulling again starts a new one
+        again, created_again = manager.start("llama3")
+        await manager.close()
+        return again is not job and created_again
+
+    assert asyncio.run(scenario())
+
+
+def test_progress_is_published_on_phase_changes_and_summed_across_layers():
+    async def scenario():
+        pull = FakePull()
+        manager = PullJobManager(pull, progress_interval=3600)
+        job, _ = manager.start("llama3")
+        updates: List[Dict[str, Any]] = []
+
+        async def follow():
+            async for state in manager.subscribe(job.id):
+                updates.append(state)
+        follower = asyncio.create_task(follow())
+        await settle()
+
+        await pull.send({"status": "pulling manifest"})
+        await pull.send({"status": "pulling a", "digest": "sha256:a", "total": 100, "completed": 0})
+        # Same phase within the interval: folded into the job, not published
+        await pull.send({"status": "pulling a", "digest": "sha256:a", "total": 100, "completed": 50})
+        assert job.completed_bytes == 50 and len(updates) == 3
+        await pull.send({"status": "pulling b", "digest": "sha256:b", "total": 300, "completed": 300})
+        await pull.send({"status": "success"})
+        await follower
+        return updates
+
+    updates = asyncio.run(scenario())
+    assert [(state["status"], state["phase"]) for state in updates] == [
+        (JOB_RUNNING, None),
+        (JOB_RUNNING, "pulling manifest"),
+        (JOB_RUNNING, "pulling a"),
+        (JOB_RUNNING, "pulling b"),
+        (JOB_COMPLETED, "success"),
+    ]
+    assert [(state["completed_bytes"], state["total_bytes"]) for state in updates[2:4]] == [(0, 100), (350, 400)]
+    assert updates[2]["progress"] == 0.0
+    assert updates[3]["progress"] == 0.875
+    assert updates[-1]["progress"] == 1.0
+    assert updates[-1]["finished_at"] is not None
+
+
+def test_pull_errors_fail_the_job():
+    async def scenario():
+        pull = FakePull()
+        manager = PullJobManager(pull)
+        failed, _ = manager.start("missing")
+        await settle()
+        await pull.send({"error": "pull model manifest: file does not exist"})
+
+        truncated, created = manager.start("missing")
+        await settle()
+        await pull.send({"status": "pulling manifest"}, None)
+        return failed, truncated, created
+
+    failed, truncated, created = asyncio.run(scenario())
+    assert failed.status == JOB_FAILED
+    assert failed.error == "pull model manifest: file does not exist"
+    assert failed.finished_at is not None
+    # The failed job released the model, so the retry got a job of its own
+    assert created and truncated is not failed
+    assert truncated.status == JOB_FAILED
+    assert "closed the pull stream" in truncated.error
@@ -0,0 +1,96 @@
+"""
+AutonomesAI v2.1 - Response Cache Tests
+Hits and misses, TTL expiry, size bounds and sqlite persistence
+"""
+
+import asyncio
+import types
+
+from integrations import response_cache
+from integrations.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+def use_clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(response_cache, "time", types.SimpleNamespace(time=clock.time))
+    return clock
+
+
+def test_hit_after_set_and_miss_for_other_keys():
+    async def scenario():
+        cache = ResponseCache()
+        key = ResponseCache.make_key(endpoint="generate", model="name:m", prompt="hi", options={"temperature": 0})
+        assert await cache.get(key) is None
+        await cache.set(key, {"response": "hello"})
+
+        hit = await cache.get(key)
+        hit["response"] = "mutated by a caller"
+        other = ResponseCache.make_key(endpoint="generate", model="name:m", prompt="bye", options={"temperature": 0})
+        return cache, await cache.get(key), await cache.get(other)
+
+    cache, again, other = asyncio.run(scenario())
+    # Every hit is a fresh copy
+    assert again == {"response": "hello"}
+    assert other is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = use_clock(monkeypatch)
+
+    async def scenario():
+        cache = ResponseCache(ttl=60)
+        await cache.set("key", {"response": "hello"})
+        clock.now += 59
+        fresh = await cache.get("key")
+        clock.now += 2
+        return cache, fresh, await cache.get("key")
+
+    cache, fresh, expired = asyncio.run(scenario())
+    assert fresh == {"response": "hello"}
+    assert expired is None
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bytes"] == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    async def scenario():
+        cache = ResponseCache(max_entries=2)
+        await cache.set("a", {"response": "a"})
+        await cache.set("b", {"response": "b"})
+        await cache.get("a")
+        await cache.set("c", {"response": "c"})
+        return [await cache.get(key) is not None for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == [True, False, True]
+
+
+def test_persisted_entries_survive_a_restart_until_they_expire(monkeypatch, tmp_path):
+    clock = use_clock(monkeypatch)
+    path = str(tmp_path / "responses.db")
+
+    async def scenario():
+        cache = ResponseCache(ttl=60, path=path)
+        await cache.set("key", {"response": "hello"})
+        cache.close()
+
+        restarted = ResponseCache(ttl=60, path=path)
+        warm = await restarted.get("key")
+        restarted.close()
+
+        clock.now += 120
+        expired = ResponseCache(ttl=60, path=path)
+        return warm, await expired.get("key")
+
+    warm, expired = asyncio.run(scenario())
+    assert warm == {"response": "hello"}
+    assert expired is None
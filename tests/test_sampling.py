@@ -0,0 +1,93 @@
+"""
+AutonomesAI v2.1 - Trace Sampling Tests
+Tail sampling keeps errors and slow traces, and healthy ones at the baseline rate
+"""
+
+import types
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import ALWAYS_ON
+from opentelemetry.trace import Status, StatusCode
+
+from telemetry import sampling
+from telemetry.sampling import TailSamplingSpanProcessor
+
+MS = 1_000_000
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def make_tracer(monkeypatch, **kwargs):
+    clock = FakeClock()
+    monkeypatch.setattr(sampling, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    exporter = InMemorySpanExporter()
+    processor = TailSamplingSpanProcessor(SimpleSpanProcessor(exporter), **kwargs)
+    provider = TracerProvider(sampler=ALWAYS_ON)
+    provider.add_span_processor(processor)
+    return provider.get_tracer(__name__), exporter, clock
+
+
+def run_trace(tracer, duration_ms: float = 1, error: bool = False, finish_reason: str = "stop") -> int:
+    """One root span with one child; returns the trace id"""
+    root = tracer.start_span("root", start_time=0)
+    child = tracer.start_span("child", context=trace.set_span_in_context(root), start_time=0)
+    child.set_attribute("gen_ai.response.finish_reason", finish_reason)
+    if error:
+        child.set_status(Status(StatusCode.ERROR, "boom"))
+    child.end(end_time=int(duration_ms * MS))
+    root.end(end_time=int(duration_ms * MS))
+    return root.get_span_context().trace_id
+
+
+def kept_traces(exporter: InMemorySpanExporter) -> set:
+    return {span.context.trace_id for span in exporter.get_finished_spans()}
+
+
+def test_error_traces_are_always_kept(monkeypatch):
+    tracer, exporter, _ = make_tracer(monkeypatch, baseline_per_second=0)
+    run_trace(tracer)  # spends the single burst token
+    healthy = {run_trace(tracer) for _ in range(5)}
+    failed = {run_trace(tracer, error=True), run_trace(tracer, finish_reason="error")}
+
+    kept = kept_traces(exporter)
+    assert failed <= kept
+    assert not healthy & kept
+    # Every span of a kept trace is exported, not just the failing one
+    assert len(exporter.get_finished_spans()) == 2 * len(kept)
+
+
+def test_slow_traces_are_kept(monkeypatch):
+    tracer, exporter, _ = make_tracer(monkeypatch, baseline_per_second=0, latency_percentile=0.95)
+    run_trace(tracer)
+    # Warm up the latency window: p95 of 10..69ms settles around 57ms
+    for duration_ms in range(10, 70):
+        run_trace(tracer, duration_ms=duration_ms)
+    exporter.clear()
+
+    fast = {run_trace(tracer, duration_ms=10) for _ in range(20)}
+    slow = run_trace(tracer, duration_ms=500)
+
+    kept = kept_traces(exporter)
+    assert slow in kept
+    assert not fast & kept
+
+
+def test_healthy_traces_are_sampled_at_the_baseline_rate(monkeypatch):
+    tracer, exporter, clock = make_tracer(monkeypatch, baseline_per_second=5)
+    first_second = [run_trace(tracer) for _ in range(20)]
+    assert len(kept_traces(exporter)) == 5
+    assert kept_traces(exporter) == set(first_second[:5])
+
+    clock.now += 1.0
+    for _ in range(20):
+        run_trace(tracer)
+    assert len(kept_traces(exporter)) == 10
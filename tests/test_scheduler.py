@@ -0,0 +1,170 @@
+"""
+AutonomesAI v2.1 - Scheduler Tests
+Priorities, tenant fairness, admission control and the scheduling context
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from integrations import scheduler
+from integrations.scheduler import (
+    Priority,
+    QueueFullError,
+    RequestScheduler,
+    iterate_scheduled,
+    scheduling,
+)
+
+
+def queue_request(
+    requests: RequestScheduler,
+    order: List[str],
+    label: str,
+    priority: Priority = Priority.INTERACTIVE,
+    tenant: str = "default"
+) -> asyncio.Future:
+    """Task that waits for a slot on model "m" and records when it got one"""
+    async def run():
+        await requests.acquire("m")
+        order.append(label)
+
+    with scheduling(priority, tenant):
+        return asyncio.ensure_future(run())
+
+
+async def settle() -> None:
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def serve_all(requests: RequestScheduler, count: int) -> None:
+    """Release the held slot `count` times, letting each granted waiter run"""
+    for _ in range(count):
+        requests.release("m")
+        await settle()
+
+
+def test_interactive_requests_are_served_before_background():
+    async def scenario():
+        requests = RequestScheduler(default_limit=1)
+        await requests.acquire("m")
+        order: List[str] = []
+        queue_request(requests, order, "background", Priority.BACKGROUND)
+        queue_request(requests, order, "interactive-1")
+        queue_request(requests, order, "interactive-2")
+        await settle()
+        await serve_all(requests, 3)
+        return order
+
+    assert asyncio.run(scenario()) == ["interactive-1", "interactive-2", "background"]
+
+
+def test_tenants_take_turns_within_a_priority():
+    async def scenario():
+        requests = RequestScheduler(default_limit=1)
+        await requests.acquire("m")
+        order: List[str] = []
+        for label in ("a1", "a2", "a3"):
+            queue_request(requests, order, label, tenant="a")
+        queue_request(requests, order, "b1", tenant="b")
+        await settle()
+        await serve_all(requests, 4)
+        return order
+
+    assert asyncio.run(scenario()) == ["a1", "b1", "a2", "a3"]
+
+
+def test_requests_beyond_max_queue_are_rejected():
+    async def scenario():
+        requests = RequestScheduler(default_limit=1, max_queue=1)
+        await requests.acquire("m")
+        queued = queue_request(requests, [], "queued")
+        await settle()
+        assert not requests.can_admit("m")
+        with pytest.raises(QueueFullError) as rejected:
+            await requests.acquire("m")
+        queued.cancel()
+        return rejected.value
+
+    error = asyncio.run(scenario())
+    assert error.model == "m"
+    assert error.retry_after >= 1
+
+
+def test_slot_granted_to_a_cancelled_waiter_is_handed_on():
+    async def scenario():
+        requests = RequestScheduler(default_limit=1)
+        await requests.acquire("m")
+        order: List[str] = []
+        cancelled = queue_request(requests, order, "cancelled")
+        queue_request(requests, order, "next")
+        await settle()
+
+        # The slot is granted to the first waiter, which is cancelled before it runs
+        requests.release("m")
+        cancelled.cancel()
+        await settle()
+        return order, cancelled.cancelled(), requests.snapshot()["m"]
+
+    order, was_cancelled, state = asyncio.run(scenario())
+    assert was_cancelled
+    assert order == ["next"]
+    assert state == {"active": 1, "waiting": 0, "limit": 1}
+
+
+def test_zero_limits_are_raised_to_one(monkeypatch):
+    monkeypatch.setenv("OLLAMA_MAX_CONCURRENCY", "0")
+    monkeypatch.setenv("OLLAMA_MODEL_CONCURRENCY", "m:0")
+    configured = RequestScheduler.from_env()
+    assert configured.default_limit == 1
+    assert configured.limits == {"m": 1}
+
+    async def scenario():
+        requests = RequestScheduler(default_limit=0, limits={"m": 0}, max_queue=0)
+        await asyncio.wait_for(requests.acquire("m"), timeout=1)
+        with pytest.raises(QueueFullError) as rejected:
+            await requests.acquire("m")
+        return rejected.value.retry_after
+
+    assert asyncio.run(scenario()) >= 1
+
+
+def test_iterate_scheduled_sets_context_only_while_producing():
+    async def source():
+        for _ in range(3):
+            yield scheduler._scheduling.get()
+
+    async def scenario():
+        seen_by_consumer = []
+        produced = []
+        async for item in iterate_scheduled(source(), Priority.BACKGROUND, "tenant-a"):
+            produced.append(item)
+            seen_by_consumer.append(scheduler._scheduling.get())
+        return produced, seen_by_consumer
+
+    produced, seen_by_consumer = asyncio.run(scenario())
+    assert produced == [(Priority.BACKGROUND, "tenant-a")] * 3
+    assert seen_by_consumer == [(Priority.INTERACTIVE, "default")] * 3
+
+
+def test_iterate_scheduled_closes_from_another_context():
+    closed = []
+
+    async def source():
+        try:
+            while True:
+                yield scheduler._scheduling.get()
+        finally:
+            closed.append(True)
+
+    async def scenario():
+        stream = iterate_scheduled(source(), Priority.BACKGROUND, "tenant-a")
+        first = await asyncio.create_task(stream.__anext__())
+        # A disconnecting client closes the stream from a different task/context
+        await asyncio.create_task(stream.aclose())
+        return first
+
+    assert asyncio.run(scenario()) == (Priority.BACKGROUND, "tenant-a")
+    assert closed == [True]
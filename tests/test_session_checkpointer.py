@@ -0,0 +1,121 @@
+"""
+AutonomesAI v2.1 - Session Checkpointer Tests
+Multi-turn round trips, append-chain rebasing and the hot tier over sqlite
+"""
+
+import operator
+from typing import Annotated, List, TypedDict
+
+from langgraph.graph import END, StateGraph
+
+from integrations.session_checkpointer import BLOB_APPEND, BLOB_FULL, SessionCheckpointer
+
+
+class ChatState(TypedDict):
+    messages: Annotated[list, operator.add]
+
+
+def reply(state: ChatState) -> ChatState:
+    return {"messages": [{"role": "assistant", "content": f"echo {state['messages'][-1]['content']}"}]}
+
+
+def compile_chat(checkpointer: SessionCheckpointer):
+    graph = StateGraph(ChatState)
+    graph.add_node("reply", reply)
+    graph.set_entry_point("reply")
+    graph.add_edge("reply", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def thread(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def run_turns(checkpointer: SessionCheckpointer, thread_id: str, turns: int, start: int = 0) -> List[dict]:
+    app = compile_chat(checkpointer)
+    state = None
+    for turn in range(start, start + turns):
+        state = app.invoke({"messages": [{"role": "user", "content": f"turn {turn}"}]}, thread(thread_id))
+    return state["messages"]
+
+
+def expected_messages(turns: int) -> List[dict]:
+    messages = []
+    for turn in range(turns):
+        messages.append({"role": "user", "content": f"turn {turn}"})
+        messages.append({"role": "assistant", "content": f"echo turn {turn}"})
+    return messages
+
+
+def message_blobs(checkpointer: SessionCheckpointer, thread_id: str) -> List[tuple]:
+    return checkpointer._db.execute(
+        "SELECT version, kind, base_version FROM blobs WHERE thread_id = ? AND channel = 'messages' "
+        "ORDER BY version",
+        (thread_id,)
+    ).fetchall()
+
+
+def test_multi_turn_round_trip_across_instances(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    checkpointer = SessionCheckpointer(path)
+    messages = run_turns(checkpointer, "s1", 4)
+    assert messages == expected_messages(4)
+    # Later turns are stored as append-only deltas
+    assert BLOB_APPEND in {kind for _, kind, _ in message_blobs(checkpointer, "s1")}
+    checkpointer.close()
+
+    reopened = SessionCheckpointer(path)
+    restored = reopened.get_tuple(thread("s1"))
+    assert restored.checkpoint["channel_values"]["messages"] == expected_messages(4)
+
+    # The next turn continues from the restored history
+    state = compile_chat(reopened).invoke({"messages": [{"role": "user", "content": "again"}]}, thread("s1"))
+    assert state["messages"] == expected_messages(4) + [
+        {"role": "user", "content": "again"},
+        {"role": "assistant", "content": "echo again"}
+    ]
+    reopened.close()
+
+
+def test_prune_rebases_append_chains_without_changing_messages(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    checkpointer = SessionCheckpointer(path, max_checkpoints=2)
+    run_turns(checkpointer, "s1", 1)
+    first_version, first_kind, _ = message_blobs(checkpointer, "s1")[0]
+    assert first_kind == BLOB_FULL
+    run_turns(checkpointer, "s1", 11, start=1)
+
+    blobs = message_blobs(checkpointer, "s1")
+    versions = {version for version, _, _ in blobs}
+    # The original full blob is gone: a later version was rebased as the new base
+    assert first_version not in versions
+    assert any(kind == BLOB_FULL for _, kind, _ in blobs)
+    # Every remaining delta still rests on a stored base
+    assert all(base is None or base in versions for _, _, base in blobs)
+    assert len(blobs) <= 2 * checkpointer.max_checkpoints + 2
+    checkpointer.close()
+
+    reopened = SessionCheckpointer(path, max_checkpoints=2)
+    restored = reopened.get_tuple(thread("s1"))
+    assert restored.checkpoint["channel_values"]["messages"] == expected_messages(12)
+    # Thread accounting matches what is actually stored after pruning
+    stored = reopened._db.execute(
+        "SELECT (SELECT SUM(LENGTH(checkpoint) + LENGTH(metadata)) FROM checkpoints WHERE thread_id = 's1')"
+        " + (SELECT SUM(LENGTH(data)) FROM blobs WHERE thread_id = 's1')"
+    ).fetchone()[0]
+    assert reopened._db.execute("SELECT bytes FROM threads WHERE thread_id = 's1'").fetchone()[0] == stored
+    reopened.close()
+
+
+def test_evicted_hot_thread_reads_back_from_sqlite(tmp_path):
+    checkpointer = SessionCheckpointer(str(tmp_path / "sessions.db"), hot_threads=1)
+    run_turns(checkpointer, "s1", 2)
+    run_turns(checkpointer, "s2", 1)
+
+    assert ("s1", "") not in checkpointer._hot
+    restored = checkpointer.get_tuple(thread("s1"))
+    assert restored.checkpoint["channel_values"]["messages"] == expected_messages(2)
+    # The cold read promoted s1 back into the hot tier, pushing s2 out
+    assert list(checkpointer._hot) == [("s1", "")]
+    assert checkpointer.get_tuple(thread("s2")).checkpoint["channel_values"]["messages"] == expected_messages(1)
+    checkpointer.close()
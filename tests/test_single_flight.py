@@ -0,0 +1,65 @@
+"""
+AutonomesAI v2.1 - Single-Flight Tests
+Result ownership of coalesced calls and the lifecycle of shared streams
+"""
+
+import asyncio
+
+from integrations.single_flight import SingleFlight
+
+
+def test_shared_result_is_copied_for_every_caller():
+    async def work():
+        await asyncio.sleep(0.01)
+        return {"response": "ok", "context": [1, 2, 3]}
+
+    async def leader(flight: SingleFlight):
+        result = await flight.do("key", work)
+        # e.g. generate() moving `context` into the prefix cache
+        result.pop("context")
+        return result
+
+    async def scenario():
+        flight = SingleFlight()
+        return await asyncio.gather(leader(flight), flight.do("key", work))
+
+    led, followed = asyncio.run(scenario())
+    assert led == {"response": "ok"}
+    assert followed == {"response": "ok", "context": [1, 2, 3]}
+
+
+def test_uncontended_result_is_not_copied():
+    result = {"response": "ok"}
+
+    async def work():
+        return result
+
+    async def scenario():
+        return await SingleFlight().do("key", work)
+
+    assert asyncio.run(scenario()) is result
+
+
+def test_subscriber_never_joins_a_cancelled_stream():
+    started = []
+
+    def source():
+        started.append(True)
+
+        async def chunks():
+            for index in range(3):
+                await asyncio.sleep(0.01)
+                yield index
+        return chunks()
+
+    async def scenario():
+        flight = SingleFlight()
+        first = flight.stream("key", source)
+        assert await first.__anext__() == 0
+        # The last subscriber leaves: the pump is cancelled but not yet finished
+        await first.aclose()
+        assert not flight.in_flight("key")
+        return [chunk async for chunk in flight.stream("key", source)]
+
+    assert asyncio.run(scenario()) == [0, 1, 2]
+    assert len(started) == 2
@@ -0,0 +1,112 @@
+"""
+AutonomesAI v2.1 - Status Snapshot Tests
+ETags must only change when the state a client acts on changes
+"""
+
+import itertools
+
+from starlette.requests import Request
+
+from api.main import _snapshot_response
+from api.status_snapshot import StatusSnapshotService
+
+
+class FakeHealthMonitor:
+    def __init__(self):
+        self.circuit_state = "closed"
+        self._ticks = itertools.count()
+
+    def snapshot(self):
+        tick = next(self._ticks)
+        return {
+            "healthy": self.circuit_state == "closed",
+            "circuit_state": self.circuit_state,
+            "consecutive_failures": 0,
+            "last_check_age_seconds": 0.5 + tick,
+            "stale": False,
+            "retry_after_seconds": 1.0 + tick
+        }
+
+
+class FakeScheduler:
+    def __init__(self):
+        self._ticks = itertools.count()
+
+    def snapshot(self):
+        tick = next(self._ticks)
+        return {"llama3.3:8b": {"active": tick % 3, "waiting": tick, "limit": 4}}
+
+
+class FakeBackends:
+    def __init__(self):
+        self.healthy = True
+        self._ticks = itertools.count()
+
+    def snapshot(self):
+        return [{
+            "url": "http://ollama:11434",
+            "healthy": self.healthy,
+            "in_flight": next(self._ticks),
+            "ewma_latency_ms": 12.5,
+            "models": ["llama3.3:8b"],
+            "loaded": []
+        }]
+
+
+class FakeResidency:
+    def snapshot(self):
+        return {"preload": [], "hot": [], "request_mix": {}, "resident": {}}
+
+
+class FakeClient:
+    def __init__(self):
+        self.health_monitor = FakeHealthMonitor()
+        self.scheduler = FakeScheduler()
+        self.backends = FakeBackends()
+        self.residency = FakeResidency()
+        self.response_cache = None
+        self.prefix_cache = None
+
+    def is_healthy(self):
+        return self.health_monitor.circuit_state == "closed"
+
+
+def make_service():
+    service = StatusSnapshotService(FakeClient())
+    service._models = [{"name": "llama3.3:8b", "digest": "sha256:abc"}]
+    service._models_fetched_at = 1.0
+    return service
+
+
+def conditional_request(etag):
+    return Request({"type": "http", "method": "GET", "headers": [(b"if-none-match", etag.encode())]})
+
+
+def test_rebuild_without_state_change_keeps_etag():
+    service = make_service()
+    first = service.rebuild_status()
+    second = service.rebuild_status()
+
+    assert first.payload["ollama"]["last_check_age_seconds"] != second.payload["ollama"]["last_check_age_seconds"]
+    assert first.etag == second.etag
+    assert _snapshot_response(conditional_request(first.etag), second).status_code == 304
+
+
+def test_etag_changes_with_identifying_state():
+    service = make_service()
+    baseline = service.rebuild_status().etag
+
+    service.client.health_monitor.circuit_state = "open"
+    assert service.rebuild_status().etag != baseline
+
+    service.client.health_monitor.circuit_state = "closed"
+    assert service.rebuild_status().etag == baseline
+
+    service._models = [{"name": "llama3.3:8b", "digest": "sha256:def"}]
+    assert service.rebuild_status().etag != baseline
+
+
+def test_stale_etag_gets_full_response():
+    service = make_service()
+    snapshot = service.rebuild_status()
+    assert _snapshot_response(conditional_request('W/"stale"'), snapshot).status_code == 200
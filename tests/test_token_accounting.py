@@ -0,0 +1,111 @@
+"""
+AutonomesAI v2.1 - Token Accounting Tests
+Per-model tokenizer encodings and the usage numbers reported for responses
+"""
+
+import types
+
+import pytest
+
+from integrations import token_accounting
+from integrations.token_accounting import (
+    MESSAGE_OVERHEAD_TOKENS,
+    SOURCE_ESTIMATE,
+    SOURCE_MIXED,
+    SOURCE_SERVER,
+    TokenCounter,
+    usage_from_response,
+)
+
+
+class FakeEncoding:
+    """`tokens_per_word` tokens for every whitespace-separated word"""
+
+    def __init__(self, tokens_per_word: int):
+        self.tokens_per_word = tokens_per_word
+
+    def encode(self, text: str, disallowed_special=()) -> list:
+        return [0] * (len(text.split()) * self.tokens_per_word)
+
+
+ENCODINGS = {"one_per_word": FakeEncoding(1), "two_per_word": FakeEncoding(2)}
+
+
+def get_encoding(name: str) -> FakeEncoding:
+    if name not in ENCODINGS:
+        raise ValueError(f"Unknown encoding {name}")
+    return ENCODINGS[name]
+
+
+@pytest.fixture
+def fake_tiktoken(monkeypatch):
+    monkeypatch.setattr(token_accounting, "tiktoken", types.SimpleNamespace(get_encoding=get_encoding))
+
+
+@pytest.fixture
+def regex_counter(monkeypatch) -> TokenCounter:
+    """Module-level counter that estimates with the word/punctuation regex"""
+    monkeypatch.setattr(token_accounting, "tiktoken", None)
+    counter = TokenCounter()
+    monkeypatch.setattr(token_accounting, "token_counter", counter)
+    return counter
+
+
+def test_models_count_with_their_mapped_encoding(fake_tiktoken):
+    counter = TokenCounter(encoding="one_per_word", model_encodings={"qwen:7b": "two_per_word", "odd:1b": "missing"})
+    text = "count these four words"
+    assert counter.encoding_for("llama3:latest") == "one_per_word"
+    assert counter.encoding_for("qwen:7b") == "two_per_word"
+    assert counter.count("llama3:latest", text) == 4
+    assert counter.count("qwen:7b", text) == 8
+    # An encoding tiktoken cannot load falls back to the regex estimate
+    assert counter.count("odd:1b", "count these, please!") == 5
+
+
+def test_model_encodings_are_read_from_the_environment(monkeypatch):
+    monkeypatch.setenv("OLLAMA_TOKENIZER_ENCODING", "o200k_base")
+    monkeypatch.setenv("OLLAMA_TOKENIZER_ENCODINGS", "qwen:7b=two_per_word, llama3:latest = one_per_word")
+    counter = TokenCounter()
+    assert counter.model_encodings == {"qwen:7b": "two_per_word", "llama3:latest": "one_per_word"}
+    assert counter.encoding_for("mistral:latest") == "o200k_base"
+
+
+def test_server_counts_are_reported_as_is(regex_counter):
+    usage = usage_from_response("m", {
+        "response": "ignored when eval_count is present",
+        "prompt_eval_count": 12,
+        "eval_count": 30,
+        "eval_duration": 1_500_000_000
+    }, prompt="hello there")
+    assert usage.as_dict() == {
+        "prompt_tokens": 12,
+        "completion_tokens": 30,
+        "total_tokens": 42,
+        "source": SOURCE_SERVER
+    }
+    assert usage.tokens_per_second == 20.0
+
+
+def test_prompt_count_is_estimated_when_ollama_skips_it(regex_counter):
+    # Ollama omits prompt_eval_count when the whole prompt was in its KV cache
+    usage = usage_from_response("m", {"response": "hi", "eval_count": 2, "eval_duration": 10**9}, prompt="hello, world")
+    assert (usage.prompt_tokens, usage.completion_tokens, usage.source) == (3, 2, SOURCE_MIXED)
+    assert usage.tokens_per_second == 2.0
+
+    messages = [{"role": "system", "content": "be brief"}, {"role": "user", "content": "hello, world"}]
+    chat = usage_from_response("m", {"message": {"content": "hi"}, "eval_count": 2}, messages=messages)
+    assert chat.prompt_tokens == 2 + 3 + 2 * MESSAGE_OVERHEAD_TOKENS
+
+
+def test_fully_estimated_usage_has_no_throughput(regex_counter):
+    usage = usage_from_response("m", {"message": {"content": "fine, thanks"}, "eval_duration": 10**9}, prompt="how are you?")
+    assert usage.as_dict() == {
+        "prompt_tokens": 4,
+        "completion_tokens": 3,
+        "total_tokens": 7,
+        "source": SOURCE_ESTIMATE
+    }
+    assert usage.tokens_per_second is None
+
+    streamed = usage_from_response("m", {}, prompt="", completion="one two three")
+    assert (streamed.prompt_tokens, streamed.completion_tokens) == (0, 3)